@@ -17,17 +17,20 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+from collections.abc import Iterable
 from typing import Literal, TypedDict
 from uuid import UUID
 
+from asgiref.sync import sync_to_async
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Model
 from ninja import UploadedFile
 
 from attachments.models import Attachment
-from base.utils.files import get_size
+from base.db.utils import raw_delete
 from commons.storage import repositories as storage_repositories
 from commons.storage.models import StoragedObject
+from commons.utils import transaction_atomic_async
 from users.models import User
 
 ##########################################################
@@ -39,6 +42,7 @@ class AttachmentFilters(TypedDict, total=False):
     id: UUID
     object_content_type: ContentType
     object_id: UUID
+    object_id__in: list[UUID]
 
 
 AttachmentSelectRelated = list[Literal["storaged_object",] | None]
@@ -68,7 +72,7 @@ async def create_attachment(
     return await Attachment.objects.acreate(
         storaged_object=storaged_object,
         name=file.name or "unknown",
-        size=get_size(file.file),
+        size=file.size,
         content_type=file.content_type or "application/octet-stream",
         content_object=content_object,
         created_by=created_by,
@@ -78,9 +82,13 @@ async def create_attachment(
 async def bulk_create_attachments(
     attachments: list[Attachment],
 ) -> list[Attachment]:
-    storaged_objects = [attachment.storaged_object for attachment in attachments]
     # done first in order to populate ids of storaged_objects, only work on compatible database like postgres
-    await storage_repositories.bulk_create_storaged_objects(storaged_objects)
+    storaged_objects = await storage_repositories.bulk_create_storaged_objects(
+        [attachment.storaged_object for attachment in attachments]
+    )
+    # the files with the same content share the same storaged object
+    for attachment, storaged_object in zip(attachments, storaged_objects):
+        attachment.storaged_object = storaged_object
     return await Attachment.objects.abulk_create(attachments)
 
 
@@ -137,3 +145,47 @@ async def delete_attachments(filters: AttachmentFilters) -> int:
     qs = Attachment.objects.all().filter(**filters)
     count, _ = await qs.adelete()
     return count
+
+
+@transaction_atomic_async()
+async def bulk_delete_attachments(filters: AttachmentFilters) -> int:
+    """
+    Delete the attachments with a single statement, without loading them nor sending their `post_delete` signal:
+    their storaged objects no longer used by another attachment are marked as deleted in bulk instead.
+    """
+    qs = Attachment.objects.all().filter(**filters)
+    storaged_object_ids = {
+        storaged_object_id
+        async for storaged_object_id in qs.values_list("storaged_object_id", flat=True)
+    }
+    deleted = await sync_to_async(raw_delete)(qs)
+    # see `attachments.signals.mark_attachment_file_to_delete`
+    await sync_to_async(storage_repositories.lock_storaged_objects)(storaged_object_ids)
+    await storage_repositories.mark_storaged_objects_as_deleted(
+        filters={
+            "id__in": list(
+                storaged_object_ids
+                - await list_used_storaged_object_ids(storaged_object_ids)
+            )
+        }
+    )
+    return deleted
+
+
+##########################################################
+# misc
+##########################################################
+
+
+async def list_used_storaged_object_ids(
+    storaged_object_ids: Iterable[UUID],
+) -> set[UUID]:
+    """
+    Return the ids of the storaged objects (among the given ones) still used by an attachment.
+    """
+    return {
+        storaged_object_id
+        async for storaged_object_id in Attachment.objects.filter(
+            storaged_object_id__in=storaged_object_ids
+        ).values_list("storaged_object_id", flat=True)
+    }
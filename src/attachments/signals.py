@@ -36,8 +36,17 @@ def mark_attachment_file_to_delete(
     sender: Model, instance: Attachment, **kwargs: Any
 ) -> None:
     """
-    Mark the store object (with the file) of the attachment as deleted.
+    Mark the store object (with the file) of the attachment as deleted, unless it is shared with another attachment
+    (with the same content).
     """
+    # the attachment is deleted in a transaction: lock the storaged object before looking for the other attachments,
+    # so a concurrent deletion of the last ones waits for this one to commit (and then marks it as deleted)
+    storage_repositories.lock_storaged_objects([instance.storaged_object_id])
+    if Attachment.objects.filter(
+        storaged_object_id=instance.storaged_object_id
+    ).exists():
+        return
+
     storage_repositories.mark_storaged_object_as_deleted(
         storaged_object=instance.storaged_object
     )
@@ -17,4 +17,14 @@
 #
 # You can contact BIRU at ask@biru.sh
 
-from .pagination import Pagination, PaginationQuery, set_pagination  # noqa
+from .files import file_response, parse_range_header, zip_response  # noqa
+from .pagination import (  # noqa
+    Cursor,
+    CursorPagination,
+    CursorPaginationQuery,
+    Pagination,
+    PaginationQuery,
+    encode_cursor,
+    set_cursor_pagination,
+    set_pagination,
+)
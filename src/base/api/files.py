@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+import io
+import zipfile
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import PurePath
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files import File
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.utils.http import content_disposition_header, parse_etags, quote_etag
+
+from configurations.conf.storage import DownloadModes, StorageBackends
+
+# more ranges than this in a `Range` header are ignored (the whole file is sent)
+MAX_RANGES = 16
+
+ByteRange = tuple[int, int]
+# the name, file and modification datetime of an entry of a zip archive
+ZipEntry = tuple[str, File, datetime]
+
+
+async def file_response(
+    request: HttpRequest,
+    file: File,
+    content_type: str | None = None,
+    filename: str | None = None,
+    as_attachment: bool = True,
+    etag: str | None = None,
+) -> HttpResponse:
+    """
+    Return a response streaming a file by chunks of `STORAGE.DOWNLOAD_CHUNK_SIZE` bytes, that supports:
+
+    - conditional requests, when a (strong) `etag` is given: a `304 Not Modified` response to a request with a
+      matching `If-None-Match` header, and the `If-Range` header;
+    - range requests, with one range (`206 Partial Content`) or several ones (a `multipart/byteranges` body), and
+      `416 Range Not Satisfiable` when none of them can be satisfied.
+
+    With the S3 backend and the `redirect` download mode, a stored file is not streamed but redirected to a
+    short-lived presigned url of the file, with the same content type and disposition (S3 handling the ranges and the
+    conditional requests).
+    """
+    content_type = content_type or "application/octet-stream"
+    quoted_etag = quote_etag(etag) if etag is not None else None
+    headers = {"Accept-Ranges": "bytes"}
+    if quoted_etag is not None:
+        headers["ETag"] = quoted_etag
+
+    if quoted_etag is not None and _etag_matches(
+        request.headers.get("If-None-Match"), quoted_etag, weak=True
+    ):
+        return HttpResponse(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    if disposition := content_disposition_header(as_attachment, filename):
+        headers["Content-Disposition"] = disposition
+
+    if _use_presigned_url(file):
+        return await _presigned_url_response(file, content_type, disposition, headers)
+
+    size = await sync_to_async(lambda: file.size)()
+    ranges = None
+    if (range_header := request.headers.get("Range")) is not None and (
+        (if_range := request.headers.get("If-Range")) is None
+        or (quoted_etag is not None and _etag_matches(if_range, quoted_etag))
+    ):
+        ranges = parse_range_header(range_header, size)
+
+    if ranges is None:
+        headers["Content-Length"] = str(size)
+        return StreamingHttpResponse(
+            _aiter_file_ranges(file, [(0, size - 1)]),
+            content_type=content_type,
+            headers=headers,
+        )
+
+    if not ranges:
+        headers["Content-Range"] = f"bytes */{size}"
+        return HttpResponse(
+            status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers
+        )
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingHttpResponse(
+            _aiter_file_ranges(file, ranges),
+            status=HTTPStatus.PARTIAL_CONTENT,
+            content_type=content_type,
+            headers=headers,
+        )
+
+    boundary = uuid4().hex
+    part_headers = [
+        (
+            f"--{boundary}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode()
+        for start, end in ranges
+    ]
+    closing = f"\r\n--{boundary}--\r\n".encode()
+    headers["Content-Length"] = str(
+        sum(len(part_header) + 2 for part_header in part_headers)
+        - 2
+        + sum(end - start + 1 for start, end in ranges)
+        + len(closing)
+    )
+    return StreamingHttpResponse(
+        _aiter_file_ranges(file, ranges, part_headers, closing),
+        status=HTTPStatus.PARTIAL_CONTENT,
+        content_type=f"multipart/byteranges; boundary={boundary}",
+        headers=headers,
+    )
+
+
+def zip_response(entries: Iterable[ZipEntry], filename: str) -> StreamingHttpResponse:
+    """
+    Return a response streaming a zip archive of some files, built on the fly while the files are read by chunks of
+    `STORAGE.DOWNLOAD_CHUNK_SIZE` bytes: its entries are stored (not compressed), with their CRC and sizes written
+    after their content (in data descriptors), so the memory used doesn't depend on the size of the files.
+
+    The entries with the same name are renamed (`name (1).ext`, `name (2).ext`...).
+    """
+    return StreamingHttpResponse(
+        _aiter_zip(entries),
+        content_type="application/zip",
+        headers={"Content-Disposition": content_disposition_header(True, filename)},
+    )
+
+
+def parse_range_header(header: str, size: int) -> list[ByteRange] | None:
+    """
+    Return the byte ranges (first and last positions, both included) of a `Range` header for a file of `size` bytes:
+    `None` if the header is not valid (so it must be ignored), and an empty list if none of its ranges can be
+    satisfied. The overlapping or adjacent ranges are merged (and the ranges sorted), so no byte is sent twice.
+    """
+    unit, _, specs = header.partition("=")
+    if unit.strip().lower() != "bytes":
+        return None
+
+    ranges = []
+    for spec in specs.split(","):
+        first, separator, last = spec.strip().partition("-")
+        if not separator or not (first or last):
+            return None
+        try:
+            if not first:
+                # the last `last` bytes
+                length = int(last)
+                if length > 0 and size > 0:
+                    ranges.append((max(size - length, 0), size - 1))
+                continue
+
+            start = int(first)
+            end = int(last) if last else None
+        except ValueError:
+            return None
+        if end is None:
+            end = size - 1
+        elif end < start:
+            return None
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged: list[ByteRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _use_presigned_url(file: File) -> bool:
+    return (
+        settings.STORAGE.DOWNLOAD_MODE == DownloadModes.REDIRECT
+        and settings.STORAGE.BACKEND_CLASS == StorageBackends.S3Storage
+        # a file from a storage (e.g. not an uploaded one)
+        and getattr(file, "storage", None) is not None
+    )
+
+
+async def _presigned_url_response(
+    file: File, content_type: str, disposition: str | None, headers: dict[str, str]
+) -> HttpResponse:
+    expiration = settings.STORAGE.PRESIGNED_URL_EXPIRATION_SECONDS
+    parameters = {"ResponseContentType": content_type}
+    if disposition:
+        parameters["ResponseContentDisposition"] = disposition
+    url = await sync_to_async(file.storage.url)(
+        file.name, parameters=parameters, expire=expiration
+    )
+
+    del headers["Accept-Ranges"]
+    headers.pop("Content-Disposition", None)
+    # the redirection must not be cached longer than the url is valid
+    headers["Cache-Control"] = f"private, max-age={expiration}"
+    return HttpResponseRedirect(url, headers=headers)
+
+
+def _etag_matches(header: str | None, quoted_etag: str, weak: bool = False) -> bool:
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if weak:
+        # the weak comparison (for `If-None-Match`) ignores the `W/` prefix
+        return "*" in etags or quoted_etag in (
+            etag.removeprefix("W/") for etag in etags
+        )
+    return quoted_etag in etags
+
+
+async def _aiter_file_ranges(
+    file: File,
+    ranges: list[ByteRange],
+    part_headers: list[bytes] | None = None,
+    closing: bytes = b"",
+) -> AsyncIterator[bytes]:
+    chunk_size = settings.STORAGE.DOWNLOAD_CHUNK_SIZE
+    await sync_to_async(file.open)("rb")
+    try:
+        for index, (start, end) in enumerate(ranges):
+            if part_headers is not None:
+                yield (b"\r\n" if index else b"") + part_headers[index]
+            await sync_to_async(file.seek)(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await sync_to_async(file.read)(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        if closing:
+            yield closing
+    finally:
+        await sync_to_async(file.close)()
+
+
+class _ZipStream(io.RawIOBase):
+    """
+    A non seekable stream to write a zip archive, keeping the written bytes until they are taken.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _aiter_zip(entries: Iterable[ZipEntry]) -> AsyncIterator[bytes]:
+    stream = _ZipStream()
+    archive = zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_STORED)
+    names: set[str] = set()
+    for name, file, modified_at in entries:
+        info = zipfile.ZipInfo(
+            _unique_zip_entry_name(name, names), date_time=modified_at.timetuple()[:6]
+        )
+        info.file_size = size = await sync_to_async(lambda: file.size)()
+        with archive.open(info, mode="w") as entry:
+            async for chunk in _aiter_file_ranges(file, [(0, size - 1)]):
+                entry.write(chunk)
+                yield stream.take()
+
+    archive.close()
+    yield stream.take()
+
+
+def _unique_zip_entry_name(name: str, names: set[str]) -> str:
+    # the names are flattened, so the files can't be extracted outside the target folder
+    path = PurePath(name.replace("\\", "/").replace("/", "_") or "unknown")
+    unique_name, index = path.name, 0
+    while unique_name.lower() in names:
+        index += 1
+        unique_name = f"{path.stem} ({index}){path.suffix}"
+    names.add(unique_name.lower())
+    return unique_name
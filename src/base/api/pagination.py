@@ -17,11 +17,17 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Any
+from uuid import UUID
 
 from django.conf import settings
 from django.http import HttpResponse
-from pydantic import Field
+from pydantic import BeforeValidator, Field
+from pydantic.json_schema import WithJsonSchema
+from pydantic_core import PydanticCustomError
 
 from base.serializers import BaseSchema
 
@@ -42,6 +48,61 @@ class PaginationQuery(BaseSchema):
     )
 
 
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """
+    Encode the `(created_at, id)` key of the last item of a page as an opaque cursor.
+    """
+    value = f"{created_at.isoformat()}|{id.hex}"
+    return urlsafe_b64encode(value.encode("utf8")).decode("utf8").rstrip("=")
+
+
+def _decode_cursor(value: Any) -> tuple[datetime, UUID]:
+    if not isinstance(value, str):
+        raise PydanticCustomError("string_type", "Input should be a valid string")
+    try:
+        created_at, id = urlsafe_b64decode(f"{value}==").decode("utf8").split("|")
+        return datetime.fromisoformat(created_at), UUID(id)
+    except ValueError:
+        raise PydanticCustomError("cursor", "Input should be a valid cursor")
+
+
+Cursor = Annotated[
+    tuple[datetime, UUID],
+    BeforeValidator(_decode_cursor),
+    WithJsonSchema(
+        {
+            "type": "string",
+            "example": "MjAyNi0wMS0wMVQwMDowMDowMCswMDowMHxlODk4MmM2YzZjYTgxMWVkOTUxMzE4NTY4MDA2YWM4ZA",
+        }
+    ),
+]
+
+
+@dataclass
+class CursorPagination:
+    limit: int
+    next: str | None = None
+
+
+class CursorPaginationQuery(BaseSchema):
+    after: Cursor | None = Field(
+        default=None,
+        description="Cursor of the last item of the previous page (`Pagination-Next` header)",
+    )
+    limit: int = Field(
+        default=settings.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=settings.MAX_PAGE_SIZE,
+        description=f"Page size (max. {settings.MAX_PAGE_SIZE})",
+    )
+
+
 def set_pagination(response: HttpResponse, pagination: Pagination) -> None:
     response.headers["Pagination-Offset"] = str(pagination.offset)
     response.headers["Pagination-Limit"] = str(pagination.limit)
+
+
+def set_cursor_pagination(response: HttpResponse, pagination: CursorPagination) -> None:
+    response.headers["Pagination-Limit"] = str(pagination.limit)
+    if pagination.next is not None:
+        response.headers["Pagination-Next"] = pagination.next
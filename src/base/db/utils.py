@@ -16,7 +16,10 @@
 #
 # You can contact BIRU at ask@biru.sh
 
-from django.db.models import Q
+from contextlib import closing
+
+from django.db import connections
+from django.db.models import Q, QuerySet
 
 
 def Q_for_related(q: Q, related_field: str) -> Q:
@@ -42,3 +45,22 @@ def Q_for_related(q: Q, related_field: str) -> Q:
             sub_q = (f"{related_field}__{lookup_field}", lookup_value)
         new_q.children.append(sub_q)
     return new_q
+
+
+def raw_delete(qs: QuerySet) -> int:
+    """
+    Delete the rows of the queryset with a single DELETE statement and return their number. Unlike `qs.delete()`, the
+    objects are not loaded, and neither the cascades nor the delete signals are run.
+    """
+    connection = connections[qs.db]
+    pk = qs.model._meta.pk
+    subquery, params = qs.values(pk.attname).query.sql_with_params()
+    sql = "DELETE FROM {} WHERE {} IN ({})".format(
+        connection.ops.quote_name(qs.model._meta.db_table),
+        connection.ops.quote_name(pk.column),
+        subquery,
+    )
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
@@ -43,7 +43,7 @@ from projects.projects import services as projects_services
 from projects.projects.models import Project
 from projects.projects.services import _get_default_template
 from projects.references import (
-    get_multiple_new_project_reference_ids,
+    aget_multiple_new_project_reference_ids,
 )
 from stories.assignments.models import StoryAssignment
 from stories.stories.models import Story
@@ -389,7 +389,7 @@ async def create_stories(
 
     # Create stories
     stories = []
-    refs = await sync_to_async(get_multiple_new_project_reference_ids)(
+    refs = await aget_multiple_new_project_reference_ids(
         project.id, num_stories_to_create * len(workflows)
     )
     for workflow in workflows:
@@ -18,49 +18,64 @@
 # You can contact BIRU at ask@biru.sh
 
 import hashlib
-import io
 from os import path, urandom
-from typing import IO, Any, Generator
+from typing import Any
 
+from django.core.files import File
 from django.db.models.fields.files import FieldFile  # noqa
-from easy_thumbnails.files import ThumbnailFile
 
 from base.utils.iterators import split_by_n
 from base.utils.slug import slugify
 from ninja_jwt.utils import aware_utcnow
 
 
-def iterfile(
-    file: FieldFile | ThumbnailFile, mode: str | None = "rb"
-) -> Generator[bytes, None, None]:
+def get_sha256(file: File) -> str:
     """
-    Function to iterate over the content of a Django File object.
-    This function is useful to iterate over the content of a file so you can stream it.
+    Calculate the SHA-256 hash of the content of a file, reading it by chunks.
 
     :param file: a Django File object
     :type file: File
-    :param mode: the mode to open the file
-    :type mode: str | None
-    :return a generator
-    :rtype Generator[bytes, None, None]
+    :return the hex digest of the hash
+    :rtype str
     """
-    with file.open(mode) as f:
-        yield from f
-
-
-def get_size(file: IO[Any]) -> int:
+    hs = hashlib.sha256()
+    for chunk in file.chunks():
+        hs.update(chunk)
+    file.seek(0)
+    return hs.hexdigest()
+
+
+# (offset, signature, content type) of some common formats
+_SIGNATURES: list[tuple[int, bytes, str]] = [
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (8, b"WEBP", "image/webp"),
+    (0, b"%PDF-", "application/pdf"),
+    (0, b"PK\x03\x04", "application/zip"),
+    (0, b"\x1f\x8b", "application/gzip"),
+    (0, b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (4, b"ftyp", "video/mp4"),
+    (0, b"\x1a\x45\xdf\xa3", "video/webm"),
+    (0, b"OggS", "audio/ogg"),
+    (0, b"ID3", "audio/mpeg"),
+]
+
+
+def sniff_content_type(head: bytes) -> str | None:
     """
-    Calculate the current size of a file in bytes.
+    Guess the content type of a file from its first bytes (its "magic number"), for some common formats.
 
-    :param file: any object that satisfy the typing.IO interface
-    :type file: typing.IO
-    :return the size in bytes
-    :rtype int
+    :param head: the first bytes of the file (at least 16)
+    :type head: bytes
+    :return the content type, or None if the format is not recognized
+    :rtype str | None
     """
-    current = file.tell()
-    size = file.seek(0, io.SEEK_END)
-    file.seek(current)
-    return size
+    for offset, signature, content_type in _SIGNATURES:
+        if head[offset : offset + len(signature)] == signature:
+            return content_type
+    return None
 
 
 def normalize_filename(filename: str) -> str:
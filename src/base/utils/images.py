@@ -22,6 +22,7 @@ from typing import Literal
 from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.db.models.fields.files import FieldFile
+from easy_thumbnails.alias import aliases  # type: ignore
 from easy_thumbnails.exceptions import InvalidImageFormatError  # type: ignore
 from easy_thumbnails.files import ThumbnailFile, get_thumbnailer  # type: ignore
 from easy_thumbnails.source_generators import pil_image  # type: ignore
@@ -39,19 +40,43 @@ def _patched_thumbnail_open(self, mode=None, *args, **kwargs):
 
 @sync_to_async
 def get_thumbnail(file: FieldFile, thumbnailer_size: str) -> ThumbnailFile | None:
+    """
+    Return the thumbnail of a file, or None if it hasn't been generated yet: thumbnails are never generated here (on
+    the request path), but by `generate_thumbnails`. Their existence is checked with the easy_thumbnails cache tables
+    (or the modification times of the files, for a filesystem storage).
+    """
     try:
         thumbnailer = get_thumbnailer(file)
-        file = thumbnailer[thumbnailer_size]
+        options = aliases.get(thumbnailer_size, target=thumbnailer.alias_target)
+        if not options:
+            raise KeyError(thumbnailer_size)
+        options["ALIAS"] = thumbnailer_size
+        file = thumbnailer.get_thumbnail(options, generate=False)
     except (InvalidImageFormatError, OSError) as e:
         logger.error(
             f"Image error for file {file} with format {thumbnailer_size}: '{e}'"
         )
         return None
-    else:
-        # TODO monkeypatch needed because of https://github.com/SmileyChris/easy-thumbnails/issues/669
-        #  remove once fixed
-        file.open = _patched_thumbnail_open.__get__(file)
-        return file
+    if file is None:
+        return None
+
+    # TODO monkeypatch needed because of https://github.com/SmileyChris/easy-thumbnails/issues/669
+    #  remove once fixed
+    file.open = _patched_thumbnail_open.__get__(file)
+    return file
+
+
+@sync_to_async
+def generate_thumbnails(file: FieldFile) -> None:
+    """
+    Generate (if needed) the thumbnails of a file for all the aliases of `settings.IMAGES.THUMBNAIL_ALIASES`.
+    """
+    thumbnailer = get_thumbnailer(file)
+    for alias in aliases.all(target=thumbnailer.alias_target):
+        try:
+            thumbnailer[alias]
+        except (InvalidImageFormatError, OSError) as e:
+            logger.error(f"Image error for file {file} with format {alias}: '{e}'")
 
 
 def valid_image_content_type(uploaded_img: UploadedFile) -> bool:
@@ -30,9 +30,10 @@ class StoragedObjectAdmin(admin.ModelAdmin):
         "deleted_at",
     )
     readonly_fields = (
+        "sha256",
         "created_at",
         "deleted_at",
     )
-    search_fields = ("file",)
+    search_fields = ("file", "sha256")
     list_filter = ("created_at", "deleted_at")
     ordering = ("-created_at",)
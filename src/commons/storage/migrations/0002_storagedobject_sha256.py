@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+# Generated by Django 6.0.6 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("storage", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="storagedobject",
+            name="sha256",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=64,
+                null=True,
+                unique=True,
+                verbose_name="sha256",
+            ),
+        ),
+    ]
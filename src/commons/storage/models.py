@@ -30,6 +30,12 @@ def get_storaged_object_file_patch(instance: "StoragedObject", filename: str) ->
 
 
 class StoragedObject(BaseDBModel, CreatedAtMetaInfoMixin, DeletedAtMetaInfoMixin):
+    """
+    A stored file. Files are deduplicated by the SHA-256 hash of their content: a storaged object is shared by all the
+    attachments with the same content, and is only marked as deleted when the last of them is deleted (the objects
+    stored before the hash was recorded have none, and are not shared).
+    """
+
     file = models.FileField(
         upload_to=get_storaged_object_file_patch,
         max_length=500,
@@ -37,6 +43,14 @@ class StoragedObject(BaseDBModel, CreatedAtMetaInfoMixin, DeletedAtMetaInfoMixin
         blank=False,
         verbose_name="file",
     )
+    sha256 = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        unique=True,
+        editable=False,
+        verbose_name="sha256",
+    )
 
     class Meta:
         verbose_name = "storaged_objects"
@@ -17,18 +17,33 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import partial
+from itertools import batched
 from typing import TypedDict
 from uuid import UUID
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.core.files import File
+from django.core.files.storage import Storage
 from django.db import transaction
-from django.db.models.deletion import RestrictedError
 
+from base.db.utils import raw_delete
+from base.utils.files import get_sha256
 from commons.storage.models import StoragedObject
+from commons.storage.uploadhandler import StoredUploadedFile
+from configurations.conf.storage import StorageBackends
 from ninja_jwt.utils import aware_utcnow
 
+logger = logging.getLogger(__name__)
+
+# maximum number of keys of an S3 `DeleteObjects` request
+S3_DELETE_OBJECTS_MAX_KEYS = 1000
+
 ##########################################################
 # filters and querysets
 ##########################################################
@@ -37,6 +52,7 @@ from ninja_jwt.utils import aware_utcnow
 class StoragedObjectFilters(TypedDict, total=False):
     id: UUID
     deleted_at__lt: datetime
+    id__in: list[UUID]
 
 
 ##########################################################
@@ -47,25 +63,66 @@ class StoragedObjectFilters(TypedDict, total=False):
 async def create_storaged_object(
     file: File,
 ) -> StoragedObject:
-    return await StoragedObject.objects.acreate(file=file)
+    """
+    Store a file, or reuse the storaged object with the same content (see `bulk_create_storaged_objects`).
+    """
+    if isinstance(file, StoredUploadedFile):
+        # already written to the storage while it was uploaded
+        storaged_object = StoragedObject(file=file.storage_name, sha256=file.sha256)
+    else:
+        storaged_object = StoragedObject(file=file)
+    storaged_objects = await bulk_create_storaged_objects([storaged_object])
+    return storaged_objects[0]
 
 
 async def bulk_create_storaged_objects(
     storaged_objects: list[StoragedObject],
 ) -> list[StoragedObject]:
-    return await StoragedObject.objects.abulk_create(storaged_objects)
-
-
-##########################################################
-# list storaged object
-##########################################################
-
-
-def list_storaged_objects(
-    filters: StoragedObjectFilters = {},
-) -> list[StoragedObject]:
-    qs = StoragedObject.objects.all().filter(**filters)
-    return list(qs)
+    """
+    Store the files of the storaged objects, deduplicated by the SHA-256 hash of their content: a file with the same
+    content as an existing storaged object (or as a previous one of the list) is not stored again, the existing
+    storaged object is reused (and restored if it was marked as deleted).
+
+    Return the storaged object to use for each one of the list, in the same order.
+    """
+    for storaged_object in storaged_objects:
+        if storaged_object.sha256 is None:
+            storaged_object.sha256 = await sync_to_async(get_sha256)(
+                storaged_object.file
+            )
+
+    stored = await _restore_storaged_objects(
+        sha256s={storaged_object.sha256 for storaged_object in storaged_objects}
+    )
+    to_create: dict[str, StoragedObject] = {}
+    for storaged_object in storaged_objects:
+        if storaged_object.sha256 not in stored:
+            to_create.setdefault(storaged_object.sha256, storaged_object)
+
+    if to_create:
+        await StoragedObject.objects.abulk_create(
+            to_create.values(), ignore_conflicts=True
+        )
+        created = await StoragedObject.objects.ain_bulk(
+            to_create.keys(), field_name="sha256"
+        )
+        for sha256, storaged_object in to_create.items():
+            if created[sha256].id != storaged_object.id:
+                # the same content has been stored meanwhile by a concurrent upload
+                await sync_to_async(storaged_object.file.delete)(save=False)
+        stored.update(created)
+
+    return [stored[storaged_object.sha256] for storaged_object in storaged_objects]
+
+
+async def _restore_storaged_objects(
+    sha256s: Iterable[str],
+) -> dict[str, StoragedObject]:
+    # restoring them locks the rows, so they can't be deleted by `delete_storaged_objects_by_chunks` at the same time
+    await StoragedObject.objects.filter(
+        sha256__in=sha256s, deleted_at__isnull=False
+    ).aupdate(deleted_at=None)
+    return await StoragedObject.objects.ain_bulk(sha256s, field_name="sha256")
 
 
 ##########################################################
@@ -73,21 +130,112 @@ def list_storaged_objects(
 ########################################################
 
 
-@transaction.atomic
-def delete_storaged_object(
-    storaged_object: StoragedObject,
-) -> bool:
-    try:
+def delete_storaged_objects_by_chunks(
+    before: datetime, chunk_size: int
+) -> Iterator[list[str]]:
+    """
+    Delete the storaged objects marked as deleted before some date, `chunk_size` rows per statement (each chunk in its
+    own transaction), and yield the names of the files of each deleted chunk, once committed, so they can be deleted
+    from the storage (see `delete_storaged_objects_files`).
+
+    The rows locked by a concurrent transaction (e.g. being restored) are skipped, and the storaged objects used again
+    meanwhile are restored instead of deleted.
+    """
+    while True:
         with transaction.atomic():
-            storaged_object.delete()
-    except RestrictedError:
-        # This happens when you try to delete a StoragedObject that is being used by someone
-        # (using ForeignKey with on_delete=PROTECT).
-        # TODO: log this
-        return False
+            candidates = dict(
+                StoragedObject.objects.select_for_update(skip_locked=True)
+                .filter(deleted_at__lt=before)
+                .order_by("deleted_at")
+                .values_list("id", "file")[:chunk_size]
+            )
+            used_ids = _list_used_storaged_object_ids(candidates.keys())
+            if used_ids:
+                StoragedObject.objects.filter(id__in=used_ids).update(deleted_at=None)
+
+            qs = StoragedObject.objects.filter(id__in=candidates.keys() - used_ids)
+            raw_delete(qs)
+
+        yield [
+            name
+            for storaged_object_id, name in candidates.items()
+            if storaged_object_id not in used_ids
+        ]
+        if len(candidates) < chunk_size:
+            return
+
+
+def delete_storaged_objects_files(names: list[str]) -> None:
+    """
+    Delete files from the storage of the storaged objects: with `DeleteObjects` requests (of up to 1000 keys) for S3,
+    or with a pool of threads for the other storages. The files that can't be deleted are logged and skipped.
+    """
+    storage = StoragedObject._meta.get_field("file").storage
+    if settings.STORAGE.BACKEND_CLASS == StorageBackends.S3Storage:
+        from storages.utils import clean_name  # type: ignore
+
+        client = storage.connection.meta.client  # type: ignore[attr-defined]
+        for batch in batched(names, S3_DELETE_OBJECTS_MAX_KEYS):
+            response = client.delete_objects(
+                Bucket=storage.bucket_name,  # type: ignore[attr-defined]
+                Delete={
+                    "Objects": [
+                        {"Key": storage._normalize_name(clean_name(name))}  # type: ignore[attr-defined]
+                        for name in batch
+                    ],
+                    "Quiet": True,
+                },
+            )
+            for error in response.get("Errors", []):
+                logger.error(
+                    "error deleting storaged object file %s: %s",
+                    error.get("Key"),
+                    error.get("Message"),
+                    extra={"key": error.get("Key"), "code": error.get("Code")},
+                )
     else:
-        transaction.on_commit(partial(storaged_object.file.delete, save=False))
-        return True
+        with ThreadPoolExecutor(
+            max_workers=settings.STORAGE.CLEAN_DELETED_STORAGED_OBJECTS_WORKERS
+        ) as executor:
+            # consumed to wait for the deletions
+            list(executor.map(partial(_delete_storaged_object_file, storage), names))
+
+
+def _delete_storaged_object_file(storage: Storage, name: str) -> None:
+    try:
+        storage.delete(name)
+    except Exception as e:
+        logger.error(
+            "error deleting storaged object file %s: %s",
+            name,
+            e,
+            extra={"key": name},
+        )
+
+
+def _list_used_storaged_object_ids(storaged_object_ids: Iterable[UUID]) -> set[UUID]:
+    # the storaged objects referenced by any model (e.g. an attachment), which can't be deleted
+    used_ids: set[UUID] = set()
+    for relation in StoragedObject._meta.related_objects:
+        used_ids.update(
+            relation.related_model._base_manager.filter(
+                **{f"{relation.field.name}__in": storaged_object_ids}
+            ).values_list(relation.field.attname, flat=True)
+        )
+    return used_ids
+
+
+def lock_storaged_objects(storaged_object_ids: Iterable[UUID]) -> None:
+    """
+    Lock the rows of the storaged objects until the end of the current transaction (in a consistent order, to avoid
+    deadlocks).
+    """
+    list(
+        StoragedObject.objects.select_for_update()
+        .filter(id__in=storaged_object_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
 
 
 def mark_storaged_object_as_deleted(
@@ -95,3 +243,13 @@ def mark_storaged_object_as_deleted(
 ) -> None:
     storaged_object.deleted_at = aware_utcnow()
     storaged_object.save(update_fields=["deleted_at"])
+
+
+async def mark_storaged_objects_as_deleted(
+    filters: StoragedObjectFilters = {},
+) -> int:
+    return await (
+        StoragedObject.objects.all()
+        .filter(deleted_at__isnull=True, **filters)
+        .aupdate(deleted_at=aware_utcnow())
+    )
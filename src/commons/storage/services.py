@@ -17,18 +17,37 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+import logging
+import time
 from datetime import datetime
 
+from django.conf import settings
+
 from commons.storage import repositories as storage_repositories
 
+logger = logging.getLogger(__name__)
+
 
 def clean_deleted_storaged_objects(before: datetime) -> int:
-    storaged_objects = storage_repositories.list_storaged_objects(
-        filters={"deleted_at__lt": before}
-    )
+    """
+    Delete the storaged objects marked as deleted before some date, by chunks: the rows of a chunk are deleted with a
+    single statement, then their files in bulk.
+    """
+    started_at = time.monotonic()
     deleted = 0
-    for storaged_object in storaged_objects:
-        if storage_repositories.delete_storaged_object(storaged_object=storaged_object):
-            deleted += 1
+    for names in storage_repositories.delete_storaged_objects_by_chunks(
+        before=before,
+        chunk_size=settings.STORAGE.CLEAN_DELETED_STORAGED_OBJECTS_CHUNK_SIZE,
+    ):
+        storage_repositories.delete_storaged_objects_files(names)
+        deleted += len(names)
+
+        elapsed = time.monotonic() - started_at
+        logger.info(
+            "deleted storaged objects: %s (%.1f/s)",
+            deleted,
+            deleted / elapsed if elapsed else 0,
+            extra={"deleted": deleted, "elapsed": elapsed},
+        )
 
     return deleted
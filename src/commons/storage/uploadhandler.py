@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+"""
+Upload of files straight into the storage of the storaged objects, without temporary files: the uploaded content is
+written to the storage (with a multipart upload for S3) while it's received, and its size, SHA-256 hash and content
+type are computed on the fly.
+"""
+
+import hashlib
+import mimetypes
+import os
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, Protocol
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, Storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http import HttpRequest
+from django.utils.datastructures import MultiValueDict
+
+from base.utils.files import sniff_content_type
+from commons.exceptions import api as ex
+from commons.storage.models import StoragedObject
+from configurations.conf.storage import StorageBackends
+
+# bytes of the beginning of a file kept to sniff its content type
+SNIFF_SIZE = 512
+GENERIC_CONTENT_TYPES = {"", "application/octet-stream"}
+
+
+##########################################################
+# storage writers
+##########################################################
+
+
+class StorageWriter(Protocol):
+    def write(self, data: bytes) -> None: ...
+
+    def close(self) -> None: ...
+
+    def abort(self) -> None: ...
+
+
+class FileSystemWriter:
+    def __init__(self, storage: FileSystemStorage, name: str) -> None:
+        self._path = storage.path(name)
+        self._permissions = storage.file_permissions_mode
+        os.makedirs(
+            os.path.dirname(self._path),
+            mode=storage.directory_permissions_mode or 0o777,
+            exist_ok=True,
+        )
+        self._file = open(self._path, "xb")
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    def close(self) -> None:
+        self._file.close()
+        if self._permissions is not None:
+            os.chmod(self._path, self._permissions)
+
+    def abort(self) -> None:
+        self._file.close()
+        os.remove(self._path)
+
+
+class S3MultipartWriter:
+    """
+    Write to S3 with a multipart upload, by parts of `STORAGE.UPLOAD_PART_SIZE` bytes (at least 5 MiB).
+    """
+
+    def __init__(self, storage: Storage, name: str, content_type: str) -> None:
+        from storages.utils import clean_name  # type: ignore
+
+        self._client = storage.connection.meta.client  # type: ignore[attr-defined]
+        self._bucket = storage.bucket_name  # type: ignore[attr-defined]
+        self._key = storage._normalize_name(clean_name(name))  # type: ignore[attr-defined]
+        self._upload_id = self._client.create_multipart_upload(
+            Bucket=self._bucket,
+            Key=self._key,
+            ContentType=content_type,
+            **storage.get_object_parameters(name),  # type: ignore[attr-defined]
+        )["UploadId"]
+        self._parts: list[dict[str, Any]] = []
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        if len(self._buffer) >= settings.STORAGE.UPLOAD_PART_SIZE:
+            self._upload_part()
+
+    def close(self) -> None:
+        # the last part (may be smaller, or empty for an empty file)
+        if self._buffer or not self._parts:
+            self._upload_part()
+        self._client.complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts},
+        )
+
+    def abort(self) -> None:
+        self._client.abort_multipart_upload(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id
+        )
+
+    def _upload_part(self) -> None:
+        part_number = len(self._parts) + 1
+        response = self._client.upload_part(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=bytes(self._buffer),
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self._buffer.clear()
+
+
+class SpooledWriter:
+    """
+    Fallback for the other storages: the file is spooled (in memory up to `FILE_UPLOAD_MAX_MEMORY_SIZE`), and saved to
+    the storage once complete.
+    """
+
+    def __init__(self, storage: Storage, name: str) -> None:
+        self._storage = storage
+        self._name = name
+        self._file: IO[bytes] = SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        )
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    def close(self) -> None:
+        self._file.seek(0)
+        self._storage.save(self._name, self._file)
+        self._file.close()
+
+    def abort(self) -> None:
+        self._file.close()
+
+
+def open_storage_writer(
+    storage: Storage, name: str, content_type: str
+) -> StorageWriter:
+    if isinstance(storage, FileSystemStorage):
+        return FileSystemWriter(storage, name)
+    if settings.STORAGE.BACKEND_CLASS == StorageBackends.S3Storage:
+        return S3MultipartWriter(storage, name, content_type)
+    return SpooledWriter(storage, name)
+
+
+##########################################################
+# uploaded file and upload handler
+##########################################################
+
+
+class StoredUploadedFile(UploadedFile):
+    """
+    A file uploaded straight into the storage, as `storage_name`. Its content is read from the storage (when needed).
+
+    Unless a storaged object has been created for it, the file is deleted from the storage when it is closed (Django
+    closes the uploaded files at the end of the request), e.g. if the request fails or if the content was already
+    stored.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        storage_name: str,
+        name: str,
+        content_type: str,
+        size: int,
+        sha256: str,
+        charset: str | None = None,
+        content_type_extra: dict[str, str] | None = None,
+    ) -> None:
+        self._file: IO[bytes] | None = None
+        super().__init__(
+            file=None,
+            name=name,
+            content_type=content_type,
+            size=size,
+            charset=charset,
+            content_type_extra=content_type_extra,
+        )
+        self.storage = storage
+        self.storage_name = storage_name
+        self.sha256 = sha256
+        self._closed = False
+
+    @property
+    def file(self) -> IO[bytes]:  # type: ignore[override]
+        if self._file is None:
+            self._file = self.storage.open(self.storage_name, "rb")
+        return self._file
+
+    @file.setter
+    def file(self, value: IO[bytes] | None) -> None:
+        self._file = value
+
+    def open(self, mode: str | None = None) -> "StoredUploadedFile":
+        if self._file is not None:
+            self._file.seek(0)
+        return self
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._file is not None:
+            self._file.close()
+        # looked up by the (unique, indexed) hash: the file is kept only if a (committed) storaged object uses it
+        if not StoragedObject.objects.filter(
+            sha256=self.sha256, file=self.storage_name
+        ).exists():
+            self.storage.delete(self.storage_name)
+
+
+class StorageUploadHandler(FileUploadHandler):
+    """
+    Upload handler writing the uploaded files straight into the storage of the storaged objects (see the module
+    docstring). A file larger than `max_size` is rejected (with a 422 error) as soon as it exceeds it.
+    """
+
+    def __init__(
+        self, request: HttpRequest | None = None, max_size: int | None = None
+    ) -> None:
+        super().__init__(request)
+        self.max_size = max_size
+        self.writer: StorageWriter | None = None
+        self.uploaded_files: list[StoredUploadedFile] = []
+
+    def new_file(self, *args: Any, **kwargs: Any) -> None:
+        super().new_file(*args, **kwargs)
+        self.storage = StoragedObject._meta.get_field("file").storage
+        self.storage_name = self.storage.get_available_name(
+            StoragedObject._meta.get_field("file").generate_filename(
+                None, self.file_name
+            ),
+            max_length=StoragedObject._meta.get_field("file").max_length,
+        )
+        self.size = 0
+        self.hasher = hashlib.sha256()
+        self.head = b""
+        self.writer = open_storage_writer(
+            self.storage,
+            self.storage_name,
+            self.content_type or "application/octet-stream",
+        )
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        assert self.writer is not None
+        self.size += len(raw_data)
+        if self.max_size is not None and self.size > self.max_size:
+            self.upload_interrupted()
+            # the request fails, so the files already uploaded won't be closed by Django
+            for uploaded_file in self.uploaded_files:
+                uploaded_file.close()
+            raise ex.ValidationError(
+                f"The file is too large (maximum {self.max_size} bytes)"
+            )
+
+        self.hasher.update(raw_data)
+        if len(self.head) < SNIFF_SIZE:
+            self.head += raw_data[: SNIFF_SIZE - len(self.head)]
+        self.writer.write(raw_data)
+        return None
+
+    def file_complete(self, file_size: int) -> StoredUploadedFile:
+        assert self.writer is not None
+        self.writer.close()
+        self.writer = None
+        uploaded_file = StoredUploadedFile(
+            storage=self.storage,
+            storage_name=self.storage_name,
+            name=self.file_name,
+            content_type=self._get_content_type(),
+            size=self.size,
+            sha256=self.hasher.hexdigest(),
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+        )
+        self.uploaded_files.append(uploaded_file)
+        return uploaded_file
+
+    def upload_interrupted(self) -> None:
+        if self.writer is not None:
+            self.writer.abort()
+            self.writer = None
+
+    def _get_content_type(self) -> str:
+        # the declared content type, unless it's a generic one
+        if (self.content_type or "") not in GENERIC_CONTENT_TYPES:
+            return self.content_type
+        return (
+            sniff_content_type(self.head)
+            or mimetypes.guess_file_type(self.file_name or "")[0]
+            or "application/octet-stream"
+        )
+
+
+async def receive_uploaded_files(
+    request: HttpRequest, max_size: int | None = None
+) -> MultiValueDict:
+    """
+    Receive the files uploaded to the request straight into the storage of the storaged objects, instead of a
+    temporary file (see `StorageUploadHandler`), and return them.
+
+    To be called by the view before any other access to `request.FILES`, once the request is authorized: nothing is
+    written to the storage for a rejected request. The body is parsed in a thread, as it's blocking I/O.
+    """
+    request.upload_handlers = [StorageUploadHandler(request, max_size)]
+    return await sync_to_async(lambda: request.FILES)()
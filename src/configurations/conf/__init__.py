@@ -36,6 +36,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from commons.validators import LanguageCode
 from configurations.conf.auth import AccountSettings, LDAPSettings, TokensSettings
+from configurations.conf.cache import CacheSettings
 from configurations.conf.emails import EmailSettings
 from configurations.conf.events import EventsSettings
 from configurations.conf.images import ImageSettings
@@ -109,6 +110,12 @@ class Settings(BaseSettings):
 
     # Projects
     DEFAULT_PROJECT_TEMPLATE: str = "kanban"
+    # number of stories (with their comments and attachments) removed per transaction when deleting a project
+    DELETE_PROJECT_STORIES_CHUNK_SIZE: PositiveInt = 500
+    # number of projects (or workspaces) removed per transaction by the deletion job of a user
+    DELETE_USER_CHUNK_SIZE: PositiveInt = 100
+    # number of references (story refs) reserved at once by each process
+    PROJECT_REFERENCES_BLOCK_SIZE: PositiveInt = 20
 
     # Invitations
     GENERAL_INVITATION_LIFETIME: timedelta = timedelta(days=4)
@@ -117,6 +124,8 @@ class Settings(BaseSettings):
 
     # Workflows
     MAX_NUM_WORKFLOWS: int = 8
+    # number of stories moved per statement when deleting a workflow in favour of another one
+    DELETE_WORKFLOW_STORIES_CHUNK_SIZE: PositiveInt = 1000
 
     # Story tags
     MAX_STORY_TAGS_PER_PROJECT: int = 200
@@ -131,6 +140,7 @@ class Settings(BaseSettings):
     REQUIRED_TERMS: bool = False
 
     # Sub settings modules
+    CACHE: CacheSettings = CacheSettings()
     EMAIL: EmailSettings = EmailSettings()
     EVENTS: EventsSettings = EventsSettings()
     IMAGES: ImageSettings = ImageSettings()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+from enum import Enum
+
+from pydantic import BaseModel, Field, PositiveInt
+
+
+class CacheBackendChoices(Enum):
+    MEMORY = "django.core.cache.backends.locmem.LocMemCache"
+    REDIS = "django.core.cache.backends.redis.RedisCache"
+
+
+class CacheSettings(BaseModel):
+    # /!\ MEMORY is local to each process (including the worker): the payloads that must stay consistent across
+    # processes (users, roles, workflows, token blacklist...) aren't cached with it
+    BACKEND: CacheBackendChoices = CacheBackendChoices.REDIS
+    KEY_PREFIX: str = "tenzu"
+    DEFAULT_TIMEOUT: PositiveInt = 5 * 60  # 5 minutes
+
+    # Settings for CacheBackendChoices.MEMORY
+    # -- none --
+
+    # Settings for CacheBackendChoices.REDIS (host, port and password default to the ones of the events)
+    REDIS_HOST: str | None = None
+    REDIS_PORT: int | None = None
+    REDIS_PASSWORD: str | None = None
+    REDIS_DATABASE: int = 1
+    REDIS_OPTIONS: dict[str, str | int] = Field(default_factory=dict)
+
+    # Timeouts (in seconds) of specific payloads
+    WORKFLOWS_TIMEOUT: PositiveInt = 60 * 60  # 1 hour
+    ROLES_TIMEOUT: PositiveInt = 10 * 60  # 10 minutes
+    WORKSPACES_OVERVIEW_TIMEOUT: PositiveInt = 60 * 60  # 1 hour
+    # Users are looked up on each authenticated request; keep it short since some updates (e.g. from the admin)
+    # don't invalidate it
+    USERS_TIMEOUT: PositiveInt = 60  # 1 minute
+
+    # In-process cache of the roles of the users on projects and workspaces (in front of the shared cache).
+    # Entries are dropped by the invalidation messages (pub/sub channel when using REDIS); the timeout bounds the
+    # staleness if a message is lost.
+    ROLES_LOCAL_MAXSIZE: PositiveInt = 10_000
+    ROLES_LOCAL_TIMEOUT: PositiveInt = 30  # 30 seconds
+    ROLES_INVALIDATION_CHANNEL: str = "tenzu:roles:invalidation"
+    ROLES_STATS_LOG_INTERVAL: PositiveInt = (
+        10_000  # log hit/miss counters every n lookups
+    )
+
+    # In-process cache of the active feed items, kept until the next start or end of an active period and dropped
+    # when an item is saved or deleted; the timeout bounds the staleness of the changes that send no signal
+    FEEDS_LOCAL_TIMEOUT: PositiveInt = 5 * 60  # 5 minutes
+
+    @property
+    def is_shared(self) -> bool:
+        return self.BACKEND != CacheBackendChoices.MEMORY
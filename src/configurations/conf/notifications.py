@@ -24,3 +24,12 @@ class NotificationsSettings(BaseModel):
         "30 * * * *"  # default: every hour at minute 30.
     )
     MINUTES_TO_STORE_READ_NOTIFICATIONS: int = 2 * 60  # 120 minutes
+    DELETE_READ_NOTIFICATIONS_CHUNK_SIZE: int = 1000
+    # the notifications table is partitioned by month: the partitions of the next months are created ahead, and the
+    # ones older than the retention period are dropped with all their notifications (read or not)
+    MANAGE_PARTITIONS_CRON: str = "15 3 * * *"  # default: every day at 03:15
+    PARTITIONS_MONTHS_AHEAD: int = 3
+    MONTHS_TO_STORE_NOTIFICATIONS: int = 12
+    # notifications about stories of the same type, owner and project are merged in a digest (the last one with the
+    # refs of all the stories) while it is unread and younger than this window (0 to disable the digests)
+    DIGEST_WINDOW_SECONDS: int = 5 * 60  # 5 minutes
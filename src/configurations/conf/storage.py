@@ -38,6 +38,15 @@ class StaticStorageBackends(StrEnum):
     CompressedWhitenoiseStorage = "whitenoise.storage.CompressedStaticFilesStorage"
 
 
+class DownloadModes(StrEnum):
+    # the files are streamed by the api
+    STREAM = "stream"
+    # the api redirects to a short-lived presigned url of the file (only with the S3 backend, the files are streamed
+    # with the others). The url is signed for `AWS_S3_ENDPOINT_URL`, which must then be reachable by the browsers
+    # (not an internal hostname, as usual with a self-hosted MinIO or Garage)
+    REDIRECT = "redirect"
+
+
 class StorageSettings(BaseModel):
     AWS_ACCESS_KEY_ID: str | None = None
     AWS_S3_SECRET_ACCESS_KEY: str | None = None
@@ -49,6 +58,17 @@ class StorageSettings(BaseModel):
         "0 4 * * *"  # default: once a day, at 4:00 AM
     )
     DAYS_TO_STORE_DELETED_STORAGED_OBJECTS: int = 90  # 90 day
+    CLEAN_DELETED_STORAGED_OBJECTS_CHUNK_SIZE: int = 1000
+    # threads deleting the files of a chunk from a filesystem storage
+    CLEAN_DELETED_STORAGED_OBJECTS_WORKERS: int = 8
+    # size of the chunks of the streamed downloads
+    DOWNLOAD_CHUNK_SIZE: int = 64 * 1024  # 64 KiB
+    # size of the parts of the S3 multipart uploads (S3 requires at least 5 MiB)
+    UPLOAD_PART_SIZE: int = 8 * 1024 * 1024  # 8 MiB
+    # how the stored files are downloaded, see `DownloadModes` (redirect is opt-in: only enable it when the S3 endpoint
+    # is public)
+    DOWNLOAD_MODE: DownloadModes = DownloadModes.STREAM
+    PRESIGNED_URL_EXPIRATION_SECONDS: int = 60  # 1 minute
     BACKEND_CLASS: StorageBackends = StorageBackends.FileSystemStorage
     STATIC_BACKEND_CLASS: StaticStorageBackends = (
         StaticStorageBackends.CompressedManifestWhitenoiseStorage
@@ -29,5 +29,6 @@ class TaskQueueSettings(BaseModel):
             "projects.projects.tasks",
             "tokens.tasks",
             "users.tasks",
+            "workflows.tasks",
         }
     )
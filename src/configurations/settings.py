@@ -39,6 +39,7 @@ from commons.i18n import TRANSLATION_DIRECTORY
 
 from .conf import settings
 from .conf.auth import LDAPActivation
+from .conf.cache import CacheBackendChoices
 from .conf.events import PubSubBackendChoices
 from .utils import BASE_DIR, remove_ending_slash
 
@@ -102,6 +103,7 @@ INSTALLED_APPS = [
     "projects.invitations",
     "projects.memberships",
     "projects.projects",
+    "projects.references",
     "stories.assignments",
     "stories.stories",
     "stories.tags",
@@ -146,6 +148,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "ninja.compatibility.files.fix_request_files_middleware",
+    "memberships.middlewares.AsyncRolesCacheMiddleware",
 ]
 for extra_dep in settings.EXTRA_DEPS:
     middleware, index = extra_dep.middleware
@@ -246,6 +249,11 @@ NINJA_JWT = {
     "JSON_ENCODER": DjangoJSONEncoder,
 }
 
+if not settings.CACHE.is_shared:
+    # the blacklist snapshots are refreshed through a version stored in the cache, which the other processes
+    # wouldn't see: check the blacklisted tokens in the database each time instead
+    NINJA_JWT["BLACKLIST_SNAPSHOT_TIMEOUT"] = 0
+
 AUTHENTICATION_BACKENDS = (
     [
         "auth.backends.EmailOrUsernameModelBackend",
@@ -348,6 +356,29 @@ if settings.EVENTS.PUBSUB_BACKEND == PubSubBackendChoices.REDIS:
         **settings.EVENTS.REDIS_CHANNEL_OPTIONS,
     }
 
+# cache
+
+CACHES = {
+    "default": {
+        "BACKEND": f"{settings.CACHE.BACKEND.value}",
+        "KEY_PREFIX": settings.CACHE.KEY_PREFIX,
+        "TIMEOUT": settings.CACHE.DEFAULT_TIMEOUT,
+    },
+}
+
+if settings.CACHE.BACKEND == CacheBackendChoices.REDIS:
+    _cache_redis_password = (
+        settings.EVENTS.REDIS_PASSWORD
+        if settings.CACHE.REDIS_PASSWORD is None
+        else settings.CACHE.REDIS_PASSWORD
+    )
+    _cache_redis_host = settings.CACHE.REDIS_HOST or settings.EVENTS.REDIS_HOST
+    _cache_redis_port = settings.CACHE.REDIS_PORT or settings.EVENTS.REDIS_PORT
+    CACHES["default"]["LOCATION"] = (
+        f"redis://default:{_cache_redis_password}@{_cache_redis_host}:{_cache_redis_port}/{settings.CACHE.REDIS_DATABASE}"
+    )
+    CACHES["default"]["OPTIONS"] = settings.CACHE.REDIS_OPTIONS
+
 LOG_LEVELS = settings.LOGS.LOG_LEVELS
 LOG_FORMAT_STREAM = settings.LOGS.LOG_FORMAT_STREAM
 LOG_FORMAT_RICH = settings.LOGS.LOG_FORMAT_RICH
@@ -32,6 +32,7 @@ from pydantic import ValidationError
 from base.utils.uuid import decode_b64str_to_uuid
 from commons.exceptions.api import ForbiddenError
 from events.actions import Action, ActionResponse, SystemResponse, channel_login
+from memberships.context import roles_cache_scope
 from ninja_jwt.exceptions import AuthenticationFailed, InvalidToken
 from permissions import check_permissions
 from stories.stories.models import Story
@@ -58,7 +59,9 @@ class EventConsumer(AsyncJsonWebsocketConsumer):
             action = Action(action=content)
 
             event_logger.debug(f"Received action {content['command']}")
-            await action.action.run(self)
+            # roles are cached per action, so changes of membership are seen by the next one
+            with roles_cache_scope():
+                await action.action.run(self)
         except ValidationError as e:
             await self.emit_event(
                 {
@@ -110,6 +113,10 @@ class EventConsumer(AsyncJsonWebsocketConsumer):
     async def emit_event(self, event):
         await self.send_json(event["event"])
 
+    async def emit_events(self, events):
+        for event in events["events"]:
+            await self.send_json(event)
+
 
 class CollaborationConsumer(YjsConsumer):
     """
@@ -206,23 +213,24 @@ class CollaborationConsumer(YjsConsumer):
         return f"{self.project_uuid}-{self.story_ref}"
 
     async def check_permissions(self):
-        try:
-            await check_permissions(
-                permissions=StoryPermissionsCheck.VIEW.value,
-                user=self.scope["user"],
-                obj=self.story,
-            )
-        except ForbiddenError as e:
-            raise e
-        try:
-            await check_permissions(
-                permissions=StoryPermissionsCheck.MODIFY.value,
-                user=self.scope["user"],
-                obj=self.story,
-            )
-            self._can_write_story = True
-        except ForbiddenError as e:
-            self._can_write_story = False
+        with roles_cache_scope():
+            try:
+                await check_permissions(
+                    permissions=StoryPermissionsCheck.VIEW.value,
+                    user=self.scope["user"],
+                    obj=self.story,
+                )
+            except ForbiddenError as e:
+                raise e
+            try:
+                await check_permissions(
+                    permissions=StoryPermissionsCheck.MODIFY.value,
+                    user=self.scope["user"],
+                    obj=self.story,
+                )
+                self._can_write_story = True
+            except ForbiddenError as e:
+                self._can_write_story = False
 
     async def make_ydoc(self) -> Doc:
         """
@@ -18,9 +18,18 @@
 # You can contact BIRU at ask@biru.sh
 
 from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from events.events import Event
 
 correlation_id: ContextVar[str | None] = ContextVar("correlation_id", default=None)
 
+# events published while a batch is open (see `EventsManager.batch`), as (channel, event) pairs
+batched_events: ContextVar[list[tuple[str, "Event"]] | None] = ContextVar(
+    "batched_events", default=None
+)
+
 
 def get_current_correlation_id() -> str | None:
     return correlation_id.get()
@@ -15,6 +15,10 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 # You can contact BIRU at ask@biru.sh
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 from uuid import UUID
 
@@ -24,6 +28,7 @@ from sentry_sdk import capture_exception
 
 from events import channels
 from events.actions import EventResponse
+from events.context import batched_events
 from events.events import Event, EventContent
 from projects.projects.models import Project
 from workspaces.workspaces.models import Workspace
@@ -37,6 +42,11 @@ class EventsManager:
         self.channel_layer = get_channel_layer()
 
     async def publish(self, channel: str, event: Event) -> None:
+        batch = batched_events.get()
+        if batch is not None:
+            batch.append((channel, event))
+            return
+
         event = EventResponse(channel=channel, event=event)
         try:
             await self.channel_layer.group_send(
@@ -49,6 +59,54 @@ class EventsManager:
         except (AuthenticationError, ConnectionError) as e:
             capture_exception(e)
 
+    async def publish_many(self, events: Iterable[tuple[str, Event]]) -> None:
+        """
+        Publish some (channel, event) pairs with a single message per channel, the events of a channel being
+        received in order.
+        """
+        events_by_channel: defaultdict[str, list[dict]] = defaultdict(list)
+        for channel, event in events:
+            events_by_channel[channel].append(
+                EventResponse(channel=channel, event=event).model_dump(
+                    by_alias=True, mode="json"
+                )
+            )
+
+        results = await asyncio.gather(
+            *[
+                self.channel_layer.group_send(
+                    channel, {"type": "emit.events", "events": channel_events}
+                )
+                for channel, channel_events in events_by_channel.items()
+            ],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, (AuthenticationError, ConnectionError)):
+                capture_exception(result)
+            elif isinstance(result, BaseException):
+                raise result
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """
+        Collect the events published inside the block (including the ones of the `on_commit` callbacks run by a
+        transaction closed inside it) and publish them with `publish_many` when it exits. Nothing is published if
+        the block raises. Nested batches are merged into the outer one.
+        """
+        if batched_events.get() is not None:
+            yield
+            return
+
+        token = batched_events.set([])
+        try:
+            yield
+            events = batched_events.get() or []
+        finally:
+            batched_events.reset(token)
+
+        await self.publish_many(events)
+
     def _generate_event(self, type: str, content: EventContent = None) -> Event:
         return Event(
             type=type,
@@ -16,16 +16,20 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+import copy
+import time
 from collections.abc import Iterable
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import UUID
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import (
     Case,
     IntegerField,
-    OuterRef,
+    Min,
     Q,
-    Subquery,
+    QuerySet,
     Value,
     When,
 )
@@ -38,23 +42,9 @@ def _active_filter(at: datetime) -> Q:
     return Q(active_period__contains=at)
 
 
-def _read_at_subquery(user: User) -> Subquery:
-    return Subquery(
-        FeedItemReadStatus.objects.filter(feed_item=OuterRef("pk"), user=user).values(
-            "read_at"
-        )[:1]
-    )
-
-
-##########################################################
-# list feed items
-##########################################################
-
-
-async def list_active_feed_items(user: User, at: datetime) -> list[FeedItem]:
-    qs = (
+def _active_feed_items_qs(at: datetime) -> QuerySet[FeedItem]:
+    return (
         FeedItem.objects.filter(_active_filter(at))
-        .annotate(read_at=_read_at_subquery(user))
         # Active maintenance (at most one) first, then most recent. Ordering on
         # the lower bound of the period (= publication date).
         .order_by(
@@ -66,7 +56,115 @@ async def list_active_feed_items(user: User, at: datetime) -> list[FeedItem]:
             "-active_period__startswith",
         )
     )
-    return [item async for item in qs]
+
+
+##########################################################
+# list feed items
+##########################################################
+
+
+async def list_active_feed_items(user: User, at: datetime) -> list[FeedItem]:
+    """
+    Return the active feed items, annotated with their read date for the user (`read_at`). The items are shared by all
+    the users (see `_get_active_feed_items`), so the annotated ones are copies.
+    """
+    items = await _get_active_feed_items(at=at)
+    read_ats = await list_feed_items_read_at(
+        user=user, feed_item_ids=[item.id for item in items]
+    )
+
+    user_items = []
+    for item in items:
+        user_item = copy.copy(item)
+        user_item.read_at = read_ats.get(item.id)
+        user_items.append(user_item)
+    return user_items
+
+
+async def list_feed_items_read_at(
+    user: User, feed_item_ids: list[UUID]
+) -> dict[UUID, datetime]:
+    if not feed_item_ids:
+        return {}
+
+    qs = FeedItemReadStatus.objects.filter(
+        user=user, feed_item_id__in=feed_item_ids
+    ).values_list("feed_item_id", "read_at")
+    return {feed_item_id: read_at async for feed_item_id, read_at in qs}
+
+
+async def get_next_active_period_boundary(at: datetime) -> datetime | None:
+    """
+    Return the next time (after `at`) when a feed item becomes active or expires.
+    """
+    bounds = await FeedItem.objects.aaggregate(
+        next_start=Min(
+            "active_period__startswith",
+            filter=Q(active_period__startswith__gt=at),
+        ),
+        next_end=Min(
+            "active_period__endswith",
+            filter=Q(active_period__endswith__gt=at),
+        ),
+    )
+    return min((bound for bound in bounds.values() if bound is not None), default=None)
+
+
+##########################################################
+# list feed items - cache
+##########################################################
+
+# The active feed items are the same for all the users, and only change when an item is saved or deleted (by an admin
+# or a release) or when the active period of an item starts or ends. So each process keeps them in memory until the
+# next of these boundaries (at most `CACHE.FEEDS_LOCAL_TIMEOUT`), tagged with the generation of the feed items: a time
+# stored in the shared cache and changed on every save or delete of an item, so a change made by another process is
+# seen at the next read. Without a shared cache, the items are read from the database each time.
+
+_ACTIVE_FEED_ITEMS_GENERATION_KEY = "feeds.active_items.generation"
+
+# (generation, computed at, valid until, items)
+_active_feed_items: tuple[int, datetime, datetime, list[FeedItem]] | None = None
+
+
+async def _get_active_feed_items(at: datetime) -> list[FeedItem]:
+    global _active_feed_items
+
+    if not settings.CACHE.is_shared:
+        return [item async for item in _active_feed_items_qs(at)]
+
+    generation = await cache.aget(_ACTIVE_FEED_ITEMS_GENERATION_KEY, 0)
+    cached = _active_feed_items
+    if cached is not None:
+        cached_generation, computed_at, valid_until, items = cached
+        if cached_generation == generation and computed_at <= at and at < valid_until:
+            return items
+
+    # the generation is read before the items, so a change made meanwhile invalidates them at the next read
+    items = [item async for item in _active_feed_items_qs(at)]
+    next_boundary = await get_next_active_period_boundary(at)
+    valid_until = at + timedelta(seconds=settings.CACHE.FEEDS_LOCAL_TIMEOUT)
+    if next_boundary is not None:
+        valid_until = min(valid_until, next_boundary)
+    _active_feed_items = (generation, at, valid_until, items)
+    return items
+
+
+def invalidate_active_feed_items() -> None:
+    """
+    Drop the active feed items cached by all the processes (sync, to be called from the signals of the feed items).
+    """
+    # the generation must outlive the items cached by the processes, which have no timeout
+    cache.set(_ACTIVE_FEED_ITEMS_GENERATION_KEY, time.time_ns(), timeout=None)
+    clear_local_active_feed_items()
+
+
+def clear_local_active_feed_items() -> None:
+    """
+    Drop the active feed items cached by this process only.
+    """
+    global _active_feed_items
+
+    _active_feed_items = None
 
 
 ##########################################################
@@ -0,0 +1,48 @@
+# Copyright (C) 2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from feeds import repositories as feeds_repositories
+from feeds.models import FeedItem
+
+
+@receiver(
+    post_save,
+    sender=FeedItem,
+    dispatch_uid="invalidate_active_feed_items_on_save",
+)
+@receiver(
+    post_delete,
+    sender=FeedItem,
+    dispatch_uid="invalidate_active_feed_items_on_delete",
+)
+def invalidate_active_feed_items(
+    sender: Model, instance: FeedItem, using: str, **kwargs: Any
+) -> None:
+    """
+    Drop the cached active feed items right away (so this process sees its own change), and again once the change is
+    committed (so the items read by another process meanwhile are not kept).
+    """
+    feeds_repositories.invalidate_active_feed_items()
+    transaction.on_commit(feeds_repositories.invalidate_active_feed_items, using=using)
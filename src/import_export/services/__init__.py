@@ -43,6 +43,7 @@ from memberships.serializers import InvitationBaseSerializer
 from projects.projects import events as projects_events
 from projects.projects import services as projects_services
 from users.models import User
+from workspaces.workspaces import repositories as workspaces_repositories
 from workspaces.workspaces.models import Workspace
 
 logger = logging.getLogger(__name__)
@@ -83,6 +84,9 @@ async def import_project(
             ]
         ) from e
 
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_users_workspaces_overview
+    )(user_ids=[user.id])
     # Emit event
     await transaction_on_commit_async(
         import_export_events.emit_event_when_project_importation_is_created
@@ -126,6 +130,9 @@ async def update_project_importation(
             project_importation=project_importation, values=values
         )
     )
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_users_workspaces_overview
+    )(user_ids=[project_importation.created_by_id])
     # Emit event
     await transaction_on_commit_async(
         import_export_events.emit_event_when_project_importation_is_updated
@@ -197,6 +204,9 @@ async def delete_project_importation(project_importation: ProjectImportation) ->
         )
 
     if deleted:
+        await transaction_on_commit_async(
+            workspaces_repositories.delete_cached_users_workspaces_overview
+        )(user_ids=[project_importation.created_by_id])
         # Emit event
         await transaction_on_commit_async(
             import_export_events.emit_event_when_project_importation_is_deleted
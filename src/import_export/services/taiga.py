@@ -71,6 +71,7 @@ from stories.stories.services.blocknote import (
     BlockNoteConverter,
     BlockNoteEmptyOutputError,
 )
+from workflows import repositories as workflows_repositories
 from workflows import services as workflows_services
 from workflows.models import Workflow
 
@@ -317,6 +318,10 @@ async def do_import_taiga_project(project_importation: ProjectImportation):
 async def close_importation(
     project_importation: ProjectImportation, taiga_project: FullTaigaProjectImport
 ):
+    # stories are bulk created without events, drop any workflows payload cached in the meantime
+    await workflows_repositories.delete_cached_project_workflows(
+        project_importation.project_id
+    )
     if project_importation.pending_invites:
         await update_project_importation(
             project_importation,
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+"""
+Two-tier cache of the membership data used by the permission components (the role of a user on a project or a
+workspace, and whether they have a pending invitation):
+
+- an in-process LRU, dropped by the invalidation messages received on a pub/sub channel;
+- the shared Django cache, where entries are tagged with the generation of their reference object, so invalidating
+  an object is a single write.
+
+Nothing is cached with the MEMORY cache backend, since the invalidations couldn't reach the other processes.
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from configurations.conf.cache import CacheBackendChoices
+from memberships.context import MISSING
+
+logger = logging.getLogger(__name__)
+
+LocalKey = tuple[str, str, str, str]
+
+_lock = threading.Lock()
+_local: OrderedDict[LocalKey, tuple[float, Any]] = OrderedDict()
+_invalidations = 0
+_stats: Counter[str] = Counter()
+_listener: Any = None
+
+
+def _use_pubsub() -> bool:
+    return settings.CACHES["default"]["BACKEND"] == CacheBackendChoices.REDIS.value
+
+
+@functools.cache
+def _get_redis_client():
+    import redis
+
+    return redis.Redis.from_url(settings.CACHES["default"]["LOCATION"])
+
+
+def _shared_key(kind: str, model_name: str, obj_id: str, user_id: str) -> str:
+    return f"memberships:{kind}:{model_name}:{obj_id}:{user_id}"
+
+
+def _generation_key(model_name: str, obj_id: str) -> str:
+    return f"memberships:generation:{model_name}:{obj_id}"
+
+
+##########################################################
+# in-process LRU
+##########################################################
+
+
+def _get_local(key: LocalKey) -> Any:
+    with _lock:
+        entry = _local.get(key)
+        if entry is None:
+            return MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _local[key]
+            return MISSING
+        _local.move_to_end(key)
+        return value
+
+
+def _set_local(key: LocalKey, value: Any, invalidations: int) -> None:
+    with _lock:
+        # the object may have been invalidated while the value was computed
+        if invalidations != _invalidations:
+            return
+        _local[key] = (time.monotonic() + settings.CACHE.ROLES_LOCAL_TIMEOUT, value)
+        _local.move_to_end(key)
+        while len(_local) > settings.CACHE.ROLES_LOCAL_MAXSIZE:
+            _local.popitem(last=False)
+
+
+def _invalidate_local(model_name: str, obj_id: str) -> None:
+    global _invalidations
+
+    with _lock:
+        _invalidations += 1
+        for key in [k for k in _local if k[1] == model_name and k[2] == obj_id]:
+            del _local[key]
+
+
+def clear_local() -> None:
+    global _invalidations
+
+    with _lock:
+        _invalidations += 1
+        _local.clear()
+
+
+##########################################################
+# invalidation channel
+##########################################################
+
+
+def _on_invalidation_message(message: dict[str, Any]) -> None:
+    model_name, _, obj_id = message["data"].decode().partition(":")
+    _invalidate_local(model_name, obj_id)
+
+
+def _on_listener_error(error: Exception, pubsub: Any, thread: Any) -> None:
+    # entries of this process may be stale until ROLES_LOCAL_TIMEOUT while the connection is down
+    logger.warning(f"Roles cache invalidation channel failed: {error}")
+    time.sleep(1)
+
+
+def _ensure_listener() -> None:
+    global _listener
+
+    if _listener is not None or not _use_pubsub():
+        return
+    with _lock:
+        if _listener is not None:
+            return
+        pubsub = _get_redis_client().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(
+            **{settings.CACHE.ROLES_INVALIDATION_CHANNEL: _on_invalidation_message}
+        )
+        _listener = pubsub.run_in_thread(
+            sleep_time=1, daemon=True, exception_handler=_on_listener_error
+        )
+
+
+def _publish_invalidation(model_name: str, obj_id: str) -> None:
+    _get_redis_client().publish(
+        settings.CACHE.ROLES_INVALIDATION_CHANNEL, f"{model_name}:{obj_id}"
+    )
+
+
+##########################################################
+# stats
+##########################################################
+
+
+def _count(stat: str) -> None:
+    with _lock:
+        _stats[stat] += 1
+        total = _stats["local_hits"] + _stats["shared_hits"] + _stats["misses"]
+        if total % settings.CACHE.ROLES_STATS_LOG_INTERVAL:
+            return
+        stats = dict(_stats)
+    logger.info(
+        f"Roles cache: {stats.get('local_hits', 0)} local hits, {stats.get('shared_hits', 0)} shared hits, "
+        f"{stats.get('misses', 0)} misses (hit ratio {get_hit_ratio():.2%})"
+    )
+
+
+def get_stats() -> dict[str, int]:
+    """
+    Hit and miss counters of this process: `local_hits`, `shared_hits` and `misses`.
+    """
+    with _lock:
+        return {
+            "local_hits": _stats["local_hits"],
+            "shared_hits": _stats["shared_hits"],
+            "misses": _stats["misses"],
+        }
+
+
+def get_hit_ratio() -> float:
+    stats = get_stats()
+    total = sum(stats.values())
+    return (stats["local_hits"] + stats["shared_hits"]) / total if total else 0.0
+
+
+def reset_stats() -> None:
+    with _lock:
+        _stats.clear()
+
+
+##########################################################
+# public api
+##########################################################
+
+
+async def aget_or_compute(
+    kind: str,
+    model_name: str,
+    obj_id: UUID | str,
+    user_id: UUID | str,
+    compute: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Return the cached `kind` value of the user on the object, calling `compute` to get it (and cache it) on a miss.
+    """
+    if not settings.CACHE.is_shared:
+        return await compute()
+
+    _ensure_listener()
+    obj_id, user_id = str(obj_id), str(user_id)
+    local_key = (kind, model_name, obj_id, user_id)
+
+    value = _get_local(local_key)
+    if value is not MISSING:
+        _count("local_hits")
+        return value
+
+    invalidations = _invalidations
+    generation_key = _generation_key(model_name, obj_id)
+    shared_key = _shared_key(kind, model_name, obj_id, user_id)
+    values = await cache.aget_many([generation_key, shared_key])
+    generation = values.get(generation_key, 0)
+    entry = values.get(shared_key)
+    if entry is not None and entry[0] == generation:
+        _count("shared_hits")
+        value = entry[1]
+    else:
+        _count("misses")
+        value = await compute()
+        await cache.aset(
+            shared_key, (generation, value), timeout=settings.CACHE.ROLES_TIMEOUT
+        )
+
+    _set_local(local_key, value, invalidations)
+    return value
+
+
+async def invalidate(model_name: str, obj_id: UUID | str) -> None:
+    """
+    Drop every cached value related to the object, in the shared cache and in the in-process cache of every
+    process. Should be called once the changes on memberships, roles or invitations are committed.
+    """
+    obj_id = str(obj_id)
+    # entries live up to ROLES_TIMEOUT, so the generation doesn't need to outlive them
+    await cache.aset(
+        _generation_key(model_name, obj_id),
+        time.time_ns(),
+        timeout=settings.CACHE.ROLES_TIMEOUT,
+    )
+    _invalidate_local(model_name, obj_id)
+    if _use_pubsub():
+        await sync_to_async(_publish_invalidation)(model_name, obj_id)
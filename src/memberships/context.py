@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Hashable, Iterator
+
+MISSING: Any = object()
+
+roles_cache: ContextVar[dict[Hashable, Any] | None] = ContextVar(
+    "roles_cache", default=None
+)
+
+
+@contextmanager
+def roles_cache_scope() -> Iterator[None]:
+    """
+    Open a scope where the results of the membership permission checks are cached, so the same role is not
+    queried twice for the same user and object (e.g. VIEW and then MODIFY checks in a single request).
+
+    Nested scopes reuse the outer cache.
+    """
+    if roles_cache.get() is not None:
+        yield
+        return
+
+    token = roles_cache.set({})
+    try:
+        yield
+    finally:
+        roles_cache.reset(token)
+
+
+def get_cached(key: Hashable) -> Any:
+    """
+    Return the cached value for the key or `MISSING` if it is not cached (or there is no open scope).
+    """
+    cache = roles_cache.get()
+    if cache is None:
+        return MISSING
+    return cache.get(key, MISSING)
+
+
+def set_cached(key: Hashable, value: Any) -> None:
+    cache = roles_cache.get()
+    if cache is not None:
+        cache[key] = value
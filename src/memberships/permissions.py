@@ -16,8 +16,11 @@
 #
 # You can contact BIRU at ask@biru.sh
 import logging
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
+from memberships import cache as memberships_cache
+from memberships.context import MISSING, get_cached, set_cached
 from memberships.models import Invitation, Membership, Role
 from permissions import PermissionComponent
 from permissions.choices import PermissionsBase
@@ -30,6 +33,34 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+async def _get_user_role(
+    user: AnyUser, role_model: type[Role], model_name: str, obj_id: Any
+) -> Role | None:
+    """
+    Return the role of the user on the object, consulting the roles cache of the current scope first, then the
+    shared roles cache.
+    """
+    from memberships import repositories as memberships_repositories
+
+    async def _fetch_role() -> Role | None:
+        try:
+            return await memberships_repositories.get_role(
+                role_model,
+                filters={"memberships__user_id": user.id, f"{model_name}_id": obj_id},
+            )
+        except role_model.DoesNotExist:
+            return None
+
+    key = (user.id, model_name, obj_id)
+    role = get_cached(key)
+    if role is MISSING:
+        role = await memberships_cache.aget_or_compute(
+            "role", model_name, obj_id, user.id, _fetch_role
+        )
+        set_cached(key, role)
+    return role
+
+
 class IsMember(PermissionComponent):
     """
     This permission is used to check if the user is a member of the object
@@ -44,21 +75,17 @@ class IsMember(PermissionComponent):
         *components: "PermissionComponent",
     ) -> None:
         self.model_name = model_name
-        self.access_fields = access_fields
-        self.role: Role | None = None
+        if isinstance(access_fields, str):
+            access_fields = (access_fields,)
+        self.access_fields: tuple[str, ...] | None = access_fields
         super().__init__(*components)
 
-    async def is_authorized(self, user: AnyUser, obj: Any = None) -> bool:
-        from memberships import repositories as memberships_repositories
-
+    async def get_role(self, user: AnyUser, obj: Any = None) -> Role | None:
         if not obj:
-            return False
+            return None
 
-        if self.access_fields is not None:
-            if isinstance(self.access_fields, str):
-                self.access_fields: tuple[str, ...] = (self.access_fields,)
-            for field in self.access_fields:
-                obj = getattr(obj, field)
+        for field in self.access_fields or ():
+            obj = getattr(obj, field)
 
         obj: Workspace | Project
 
@@ -67,15 +94,14 @@ class IsMember(PermissionComponent):
             msg = f"Expecting to check permission on {self.model_name}, received {model_name}"
             logger.error(msg)
             raise ValueError(msg)
-        try:
-            self.role = await memberships_repositories.get_role(
-                obj.roles.model,
-                filters={"memberships__user_id": user.id, f"{model_name}_id": obj.id},
-            )
-        except obj.roles.model.DoesNotExist:
-            return False
-        setattr(user, f"{model_name}_role", self.role)
-        return True
+
+        role = await _get_user_role(user, obj.roles.model, model_name, obj.id)
+        if role is not None:
+            setattr(user, f"{model_name}_role", role)
+        return role
+
+    async def is_authorized(self, user: AnyUser, obj: Any = None) -> bool:
+        return await self.get_role(user, obj) is not None
 
 
 class HasPermission(IsMember):
@@ -96,9 +122,10 @@ class HasPermission(IsMember):
         super().__init__(model_name, access_fields, *components)
 
     async def is_authorized(self, user: AnyUser, obj: Any = None) -> bool:
-        if not await super().is_authorized(user, obj):
+        role = await self.get_role(user, obj)
+        if role is None:
             return False
-        return self.required_permission in self.role.permissions
+        return self.required_permission in role.permissions
 
 
 class CanModifyAssociatedRole(PermissionComponent):
@@ -113,8 +140,17 @@ class CanModifyAssociatedRole(PermissionComponent):
     async def is_authorized(
         self, user: AnyUser, obj: Invitation | Membership = None
     ) -> bool:
-        # must always be called after a related IsMember or HasPermission to fill this attribute
-        user_role: Role = getattr(user, f"{self.model_name}_role")
+        # usually called after a related IsMember or HasPermission, so the role is already known
+        user_role: Role | None = getattr(user, f"{self.model_name}_role", None)
+        if user_role is None:
+            user_role = await _get_user_role(
+                user,
+                type(obj.role),
+                self.model_name,
+                getattr(obj, f"{self.model_name}_id"),
+            )
+        if user_role is None:
+            return False
         # user can only modify invitation of owner if they are owner themselves
         return user_role.is_owner or (not obj.role.is_owner)
 
@@ -146,8 +182,20 @@ class HasPendingInvitation(PermissionComponent):
         if not obj:
             return False
 
-        has_pending_invitation = await invitations_services.has_pending_invitation(
-            user=user, reference_object=obj
-        )
+        key = (user.id, "invitation", obj._meta.model_name, obj.id)
+        has_pending_invitation = get_cached(key)
+        if has_pending_invitation is MISSING:
+            has_pending_invitation = await memberships_cache.aget_or_compute(
+                "invitation",
+                obj._meta.model_name,
+                obj.id,
+                user.id,
+                partial(
+                    invitations_services.has_pending_invitation,
+                    user=user,
+                    reference_object=obj,
+                ),
+            )
+            set_cached(key, has_pending_invitation)
         user.is_invited = has_pending_invitation
         return has_pending_invitation
@@ -23,9 +23,10 @@ from uuid import UUID
 from django.conf import settings
 
 from base.utils import emails
-from commons.utils import transaction_atomic_async
+from commons.utils import transaction_atomic_async, transaction_on_commit_async
 from import_export import services as import_export_services
 from import_export.models import ProjectImportation
+from memberships import cache as memberships_cache
 from memberships import repositories as memberships_repositories
 from memberships.choices import InvitationStatus
 from memberships.models import Invitation, Membership, Role
@@ -34,6 +35,7 @@ from ninja_jwt.utils import aware_utcnow
 from projects.projects.models import Project
 from users import services as users_services
 from users.models import AnyUser, User
+from workspaces.workspaces import repositories as workspaces_repositories
 from workspaces.workspaces.models import Workspace
 
 logger = logging.getLogger(__name__)
@@ -41,6 +43,27 @@ logger = logging.getLogger(__name__)
 TM = TypeVar("TM", bound=Membership)
 TI = TypeVar("TI", bound=Invitation)
 
+##########################################################
+# roles cache
+##########################################################
+
+
+async def invalidate_roles_cache(
+    obj: Project | Workspace | Membership | Invitation | Role,
+) -> None:
+    """
+    Drop the cached roles and pending invitations of the project or workspace (the object itself or the one the
+    membership, invitation or role belongs to). Inside a transaction, it must be called once it is committed.
+    """
+    if isinstance(obj, (Project, Workspace)):
+        model_name, obj_id = obj._meta.model_name, obj.id
+    else:
+        ((id_field, obj_id),) = obj.reference_model_filter.items()
+        model_name = id_field.removesuffix("_id")
+
+    await memberships_cache.invalidate(model_name, obj_id)
+
+
 ##########################################################
 # update membership
 ##########################################################
@@ -290,6 +313,10 @@ async def create_invitations(
         invitations_to_publish = list(
             (invitations_to_create | invitations_to_update).values()
         )
+        await transaction_on_commit_async(invalidate_roles_cache)(reference_object)
+        await transaction_on_commit_async(
+            workspaces_repositories.delete_cached_users_workspaces_overview
+        )(user_ids=[invitation.user_id for invitation in invitations_to_publish])
 
     if project_importation is not None:
         await import_export_services.update_project_importation(
@@ -366,6 +393,10 @@ async def accept_invitation(invitation: TI) -> TI:
         invitation=invitation,
         values={"status": InvitationStatus.ACCEPTED},
     )
+    await transaction_on_commit_async(invalidate_roles_cache)(invitation)
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_users_workspaces_overview
+    )(user_ids=[invitation.user_id])
 
     return accepted_invitation
 
@@ -423,6 +454,10 @@ async def deny_invitation(invitation: TI) -> TI:
             "status": InvitationStatus.DENIED,
         },
     )
+    await invalidate_roles_cache(invitation)
+    await workspaces_repositories.delete_cached_users_workspaces_overview(
+        user_ids=[invitation.user_id]
+    )
 
     return denied_invitation
 
@@ -450,6 +485,10 @@ async def revoke_invitation(invitation: TI, revoked_by: User) -> TI:
             "revoked_by": revoked_by,
         },
     )
+    await invalidate_roles_cache(invitation)
+    await workspaces_repositories.delete_cached_users_workspaces_overview(
+        user_ids=[invitation.user_id]
+    )
 
     return revoked_invitation
 
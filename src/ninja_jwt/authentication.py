@@ -36,20 +36,26 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Any, Type
 
 from asgiref.sync import sync_to_async
 from django.contrib.auth.models import AbstractUser, AnonymousUser
 from django.http import HttpRequest
+from django.test.signals import setting_changed
 from django.utils.translation import gettext_lazy as _
 from ninja.security.http import HttpBearer
 
 from ninja_jwt.ninja_extra.security import AsyncHttpBearer
+from users import repositories as users_repositories
 from users.models import User
 
 from .exceptions import AuthenticationFailed, InvalidToken, TokenError
 from .settings import api_settings
-from .tokens import Token
+from .tokens import BlacklistMixin, Token
+from .utils import aware_utcnow
 
 
 class JWTBaseAuthentication:
@@ -152,15 +158,119 @@ def default_user_authentication_rule(user) -> bool:
     return user is not None and user.is_active
 
 
+class VerifiedTokensCache:
+    """
+    A bounded LRU of already verified tokens, keyed by a hash of the raw token.
+
+    Entries are only served until the token "exp" claim is reached, so an
+    expired token is always validated (and rejected) again.
+    """
+
+    def __init__(self) -> None:
+        self._tokens: OrderedDict[str, Token] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(raw_token: str | bytes) -> str:
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        return hashlib.sha256(raw_token).hexdigest()
+
+    def get(self, raw_token: str | bytes) -> Token | None:
+        key = self._key(raw_token)
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None:
+                return None
+            try:
+                token.check_exp(current_time=aware_utcnow())
+            except TokenError:
+                del self._tokens[key]
+                return None
+            self._tokens.move_to_end(key)
+            return token
+
+    def set(self, raw_token: str | bytes, token: Token) -> None:
+        maxsize = api_settings.VERIFIED_TOKENS_CACHE_SIZE
+        if maxsize <= 0:
+            return
+        key = self._key(raw_token)
+        with self._lock:
+            self._tokens[key] = token
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > maxsize:
+                self._tokens.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+
+verified_tokens_cache = VerifiedTokensCache()
+
+
+def clear_verified_tokens_cache(*args: Any, **kwargs: Any) -> None:
+    if kwargs["setting"] in ["SIMPLE_JWT", "NINJA_JWT"]:
+        verified_tokens_cache.clear()
+
+
+setting_changed.connect(clear_verified_tokens_cache)
+
+
 class AsyncJWTBaseAuthentication(JWTBaseAuthentication):
+    @classmethod
+    async def aget_validated_token(cls, raw_token) -> Type[Token]:
+        """
+        Async version of `get_validated_token`. Verified tokens are kept in
+        memory until they expire.
+        """
+        if any(
+            issubclass(AuthToken, BlacklistMixin)
+            for AuthToken in api_settings.AUTH_TOKEN_CLASSES
+        ):
+            # the blacklist is checked against the database on each validation
+            return await sync_to_async(cls.get_validated_token)(raw_token)
+
+        if (validated_token := verified_tokens_cache.get(raw_token)) is not None:
+            return validated_token
+
+        # decoding and verifying the token doesn't do any I/O
+        validated_token = cls.get_validated_token(raw_token)
+        verified_tokens_cache.set(raw_token, validated_token)
+        return validated_token
+
+    async def aget_user(self, validated_token) -> AbstractUser:
+        """
+        Async version of `get_user`. Users are cached for a short time.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        user = await users_repositories.get_cached_user(user_id)
+        if user is None:
+            try:
+                user = await User.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found")) from e
+
+            if user.is_active:
+                await users_repositories.set_cached_user(user)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"))
+
+        return user
+
     async def async_jwt_authenticate(
         self, request: HttpRequest, token: str
     ) -> Type[AbstractUser]:
         request.user = AnonymousUser()
-        get_validated_token = sync_to_async(self.get_validated_token)
-        validated_token = await get_validated_token(token)
-        get_user = sync_to_async(self.get_user)
-        user = await get_user(validated_token)
+        validated_token = await self.aget_validated_token(token)
+        user = await self.aget_user(validated_token)
         request.user = user
         return user
 
@@ -175,3 +285,7 @@ class AsyncJWTTokenUserAuth(
 ):
     async def authenticate(self, request: HttpRequest, token: str) -> Any:
         return await self.async_jwt_authenticate(request, token)
+
+    async def aget_user(self, validated_token: Any) -> Type[AbstractUser]:
+        # stateless user, built from the token without any lookup
+        return self.get_user(validated_token)
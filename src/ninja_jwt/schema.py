@@ -56,7 +56,7 @@ from .settings import api_settings
 from .tokens import RefreshToken, SlidingToken, UntypedToken
 
 if api_settings.BLACKLIST_AFTER_ROTATION:
-    from .token_blacklist.models import BlacklistedToken
+    from .token_blacklist.snapshot import is_blacklisted
 
 user_name_field = User.USERNAME_FIELD  # type: ignore
 
@@ -326,7 +326,7 @@ class TokenVerifyInputSchema(Schema, InputSchemaMixin):
                 and "ninja_jwt.token_blacklist" in settings.INSTALLED_APPS
             ):
                 jti = token.get(api_settings.JTI_CLAIM)
-                if BlacklistedToken.objects.filter(token__jti=jti).exists():
+                if is_blacklisted(jti):
                     raise exceptions.ValidationError("Token is blacklisted")
 
         return data
@@ -92,6 +92,16 @@ class NinjaJWTSettings(BaseModel):
     JSON_ENCODER: Optional[Any] = Field(None)
     TOKEN_TYPE_CLAIM: Optional[str] = Field("token_type")
     JTI_CLAIM: Optional[str] = Field("jti")
+    # Number of verified access tokens kept in memory by the async authentication
+    # classes, to skip decoding and signature verification of already seen tokens
+    # (0 disables the cache)
+    VERIFIED_TOKENS_CACHE_SIZE: int = Field(1024)
+    # Seconds between two full reloads of the in-memory snapshot of blacklisted
+    # tokens (0 disables the snapshot), and how far back a partial refresh looks
+    BLACKLIST_SNAPSHOT_TIMEOUT: int = Field(5 * 60)
+    BLACKLIST_SNAPSHOT_OVERLAP: int = Field(60)
+    # Number of expired outstanding tokens deleted at once by `flushexpiredtokens`
+    FLUSH_EXPIRED_TOKENS_CHUNK_SIZE: int = Field(1000)
     SLIDING_TOKEN_REFRESH_EXP_CLAIM: str = Field("refresh_exp")
     SLIDING_TOKEN_LIFETIME: timedelta = Field(timedelta(minutes=5))
     SLIDING_TOKEN_REFRESH_LIFETIME: timedelta = Field(timedelta(days=1))
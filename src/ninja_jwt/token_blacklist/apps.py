@@ -44,3 +44,6 @@ class TokenBlacklistConfig(AppConfig):
     name = "ninja_jwt.token_blacklist"
     verbose_name = _("Token Blacklist")
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self) -> None:
+        from . import signals  # noqa
@@ -38,6 +38,7 @@
 
 from django.core.management.base import BaseCommand
 
+from ninja_jwt.settings import api_settings
 from ninja_jwt.utils import aware_utcnow
 
 from ...models import OutstandingToken
@@ -47,4 +48,8 @@ class Command(BaseCommand):
     help = "Flushes any expired tokens in the outstanding token list"
 
     def handle(self, *args, **kwargs):
-        OutstandingToken.objects.filter(expires_at__lte=aware_utcnow()).delete()
+        # delete by chunks (each one in its own transaction) to keep locks and memory bounded
+        expired_qs = OutstandingToken.objects.filter(expires_at__lte=aware_utcnow())
+        chunk_size = api_settings.FLUSH_EXPIRED_TOKENS_CHUNK_SIZE
+        while ids := list(expired_qs.values_list("id", flat=True)[:chunk_size]):
+            OutstandingToken.objects.filter(id__in=ids).delete()
@@ -50,7 +50,7 @@ class OutstandingToken(models.Model):
     token = models.TextField()
 
     created_at = models.DateTimeField(null=True, blank=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
 
     class Meta:
         # Work around for a bug in Django:
@@ -72,7 +72,7 @@ class BlacklistedToken(models.Model):
     id = models.BigAutoField(primary_key=True, serialize=False)
     token = models.OneToOneField(OutstandingToken, on_delete=models.CASCADE)
 
-    blacklisted_at = models.DateTimeField(auto_now_add=True)
+    blacklisted_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         # Work around for a bug in Django:
@@ -0,0 +1,45 @@
+# Copyright (C) 2024 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+# Copyright 2021 Ezeudoh Tochukwu
+
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import BlacklistedToken
+from .snapshot import bump_version
+
+
+@receiver(
+    post_save,
+    sender=BlacklistedToken,
+    dispatch_uid="bump_blacklist_snapshot_version",
+)
+def bump_blacklist_snapshot_version(
+    sender: Model, instance: BlacklistedToken, created: bool, **kwargs: Any
+) -> None:
+    """
+    Make the processes refresh their blacklist snapshot, now and again once the token is visible to them.
+    """
+    if created:
+        bump_version()
+        transaction.on_commit(bump_version)
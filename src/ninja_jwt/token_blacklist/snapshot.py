@@ -0,0 +1,122 @@
+# Copyright (C) 2024 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+# Copyright 2021 Ezeudoh Tochukwu
+
+"""
+Per-process snapshot of the blacklisted tokens.
+
+Checking whether a token is blacklisted used to hit the database each time, even though the answer is almost
+always "no". Each process now keeps the set of blacklisted jtis in memory, so the common case doesn't touch the
+database; a match is still confirmed against the database.
+
+The snapshot has to be up to date for a miss to be trusted. Each time a token is blacklisted, a version number is
+bumped in the shared cache. A process whose snapshot is older than that version first loads the tokens blacklisted
+since its last refresh (`BLACKLIST_SNAPSHOT_OVERLAP` seconds back, to also catch transactions committed late).
+The whole snapshot is reloaded every `BLACKLIST_SNAPSHOT_TIMEOUT` seconds, which also forgets the flushed tokens.
+
+The version is only seen by all the processes with a cache shared by them: disable the snapshot
+(`BLACKLIST_SNAPSHOT_TIMEOUT = 0`) with a per-process cache such as the local memory one.
+"""
+
+import threading
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+
+from ninja_jwt.settings import api_settings
+from ninja_jwt.utils import aware_utcnow
+
+from .models import BlacklistedToken
+
+_VERSION_KEY = "ninja_jwt.blacklist.version"
+
+
+def bump_version() -> int:
+    version = time.time_ns()
+    cache.set(_VERSION_KEY, version, timeout=None)
+    return version
+
+
+class BlacklistSnapshot:
+    def __init__(self) -> None:
+        self._jtis: set[str] = set()
+        self._version: int | None = None
+        self._loaded_at: float = 0.0
+        self._refreshed_at = aware_utcnow()
+        self._lock = threading.Lock()
+
+    def _refresh(self, version: int) -> None:
+        now = aware_utcnow()
+        qs = BlacklistedToken.objects.all()
+        full_reload = (
+            self._version is None
+            or time.monotonic() - self._loaded_at
+            >= api_settings.BLACKLIST_SNAPSHOT_TIMEOUT
+        )
+        if not full_reload:
+            qs = qs.filter(
+                blacklisted_at__gte=self._refreshed_at
+                - timedelta(seconds=api_settings.BLACKLIST_SNAPSHOT_OVERLAP)
+            )
+
+        jtis = set(qs.values_list("token__jti", flat=True))
+        if full_reload:
+            self._jtis = jtis
+            self._loaded_at = time.monotonic()
+        else:
+            self._jtis |= jtis
+        self._version = version
+        self._refreshed_at = now
+
+    def might_contain(self, jti: str) -> bool:
+        """
+        Returns False when the token is known not to be blacklisted.
+        """
+        version = cache.get(_VERSION_KEY)
+        if version is None:
+            # first use or evicted from the cache: from now on, any blacklisting will bump this version
+            version = bump_version()
+
+        with self._lock:
+            if (
+                version != self._version
+                or time.monotonic() - self._loaded_at
+                >= api_settings.BLACKLIST_SNAPSHOT_TIMEOUT
+            ):
+                self._refresh(version)
+            return jti in self._jtis
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jtis = set()
+            self._version = None
+            self._loaded_at = 0.0
+
+
+blacklist_snapshot = BlacklistSnapshot()
+
+
+def is_blacklisted(jti: str) -> bool:
+    if (
+        api_settings.BLACKLIST_SNAPSHOT_TIMEOUT > 0
+        and not blacklist_snapshot.might_contain(jti)
+    ):
+        return False
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
@@ -48,6 +48,7 @@ from django.utils.translation import gettext_lazy as _
 from .exceptions import TokenBackendError, TokenError
 from .settings import api_settings
 from .token_blacklist.models import BlacklistedToken, OutstandingToken
+from .token_blacklist.snapshot import is_blacklisted
 from .utils import aware_utcnow, datetime_from_epoch, datetime_to_epoch, format_lazy
 
 
@@ -268,7 +269,7 @@ class BlacklistMixin:
             """
             jti = self.payload[api_settings.JTI_CLAIM]
 
-            if BlacklistedToken.objects.filter(token__jti=jti).exists():
+            if is_blacklisted(jti):
                 raise TokenError(_("Token is blacklisted"))
 
         def blacklist(self) -> BlacklistedToken:
@@ -19,8 +19,15 @@
 
 from uuid import UUID
 
-from ninja import Path, Router
-
+from django.http import HttpResponse
+from ninja import Path, Query, Router
+
+from base.api import (
+    CursorPagination,
+    CursorPaginationQuery,
+    encode_cursor,
+    set_cursor_pagination,
+)
 from base.serializers import BaseDataSchema
 from commons.exceptions import api as ex
 from commons.exceptions.api.errors import (
@@ -56,20 +63,35 @@ notifications_router = Router()
     by_alias=True,
 )
 async def list_my_notifications(
-    request, read: bool | None = None
+    request,
+    pagination_params: Query[CursorPaginationQuery],
+    response: HttpResponse,
+    read: bool | None = None,
 ) -> list[Notification]:
     """
-    List the notifications of the logged user.
+    List the notifications of the logged user, from the newest. The next page (if any) is requested with the
+    `Pagination-Next` header of the response as `after` parameter.
     """
     await check_permissions(
         permissions=NotificationPermissionsCheck.ACCESS_SELF.value,
         user=request.user,
         obj=None,
     )
-    return await notifications_services.list_user_notifications(
-        user=request.user, is_read=read
+    notifications = await notifications_services.list_user_notifications(
+        user=request.user,
+        is_read=read,
+        after=pagination_params.after,
+        limit=pagination_params.limit,
     )
 
+    pagination = CursorPagination(limit=pagination_params.limit)
+    if len(notifications) == pagination_params.limit:
+        pagination.next = encode_cursor(
+            notifications[-1].created_at, notifications[-1].id
+        )
+    set_cursor_pagination(response=response, pagination=pagination)
+    return notifications
+
 
 ##########################################################
 # count notifications
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Hashable
+
+if TYPE_CHECKING:
+    from notifications.repositories import PendingNotification
+
+# notifications waiting to be created by the current batch (see `notifications.services.notifications_batch`),
+# by coalescing key
+batched_notifications: ContextVar[dict[Hashable, "PendingNotification"] | None] = (
+    ContextVar("batched_notifications", default=None)
+)
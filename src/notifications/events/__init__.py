@@ -21,25 +21,44 @@ from events import events_manager
 from notifications.events.content import (
     CreateNotificationContent,
     ReadNotificationsContent,
+    UpdateNotificationContent,
 )
 from notifications.models import Notification
 from users.models import User
 
 CREATE_NOTIFICATION = "notifications.create"
+UPDATE_NOTIFICATION = "notifications.update"
 READ_NOTIFICATIONS = "notifications.read"
 
 
 async def emit_event_when_notifications_are_created(
     notifications: list[Notification],
 ) -> None:
-    for notification in notifications:
-        await events_manager.publish_on_user_channel(
-            user=notification.owner_id,
-            type=CREATE_NOTIFICATION,
-            content=CreateNotificationContent(
-                notification=notification,
-            ),
-        )
+    # a single message per user
+    async with events_manager.batch():
+        for notification in notifications:
+            await events_manager.publish_on_user_channel(
+                user=notification.owner_id,
+                type=CREATE_NOTIFICATION,
+                content=CreateNotificationContent(
+                    notification=notification,
+                ),
+            )
+
+
+async def emit_event_when_notifications_are_updated(
+    notifications: list[Notification],
+) -> None:
+    # a single message per user
+    async with events_manager.batch():
+        for notification in notifications:
+            await events_manager.publish_on_user_channel(
+                user=notification.owner_id,
+                type=UPDATE_NOTIFICATION,
+                content=UpdateNotificationContent(
+                    notification=notification,
+                ),
+            )
 
 
 async def emit_event_when_notifications_are_read(
@@ -25,5 +25,9 @@ class CreateNotificationContent(BaseSchema):
     notification: NotificationSerializer
 
 
+class UpdateNotificationContent(BaseSchema):
+    notification: NotificationSerializer
+
+
 class ReadNotificationsContent(BaseSchema):
     notifications_ids: list[UUIDB64]
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+# Generated by Django 6.0.6 on 2026-10-19 00:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# The counters are updated by statement-level triggers, from the transition tables of the statement (so a bulk
+# insert, update or delete updates each counter once). Counters are only decremented by deletes: the row of a user
+# may already be deleted (in cascade with the user), and must not be recreated.
+CREATE_COUNTERS_TRIGGERS = """
+    CREATE FUNCTION notifications_counters_after_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO notifications_notificationcounters AS counters (owner_id, unread, read)
+        SELECT owner_id,
+               count(*) FILTER (WHERE read_at IS NULL),
+               count(*) FILTER (WHERE read_at IS NOT NULL)
+        FROM new_rows
+        GROUP BY owner_id
+        ORDER BY owner_id
+        ON CONFLICT (owner_id) DO UPDATE
+            SET unread = counters.unread + EXCLUDED.unread,
+                read = counters.read + EXCLUDED.read;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    CREATE FUNCTION notifications_counters_after_update() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO notifications_notificationcounters AS counters (owner_id, unread, read)
+        SELECT owner_id, sum(unread), sum(read)
+        FROM (
+            SELECT owner_id,
+                   count(*) FILTER (WHERE read_at IS NULL) AS unread,
+                   count(*) FILTER (WHERE read_at IS NOT NULL) AS read
+            FROM new_rows
+            GROUP BY owner_id
+            UNION ALL
+            SELECT owner_id,
+                   -count(*) FILTER (WHERE read_at IS NULL),
+                   -count(*) FILTER (WHERE read_at IS NOT NULL)
+            FROM old_rows
+            GROUP BY owner_id
+        ) AS deltas
+        GROUP BY owner_id
+        HAVING sum(unread) <> 0 OR sum(read) <> 0
+        ORDER BY owner_id
+        ON CONFLICT (owner_id) DO UPDATE
+            SET unread = counters.unread + EXCLUDED.unread,
+                read = counters.read + EXCLUDED.read;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    CREATE FUNCTION notifications_counters_after_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE notifications_notificationcounters AS counters
+        SET unread = counters.unread - deltas.unread,
+            read = counters.read - deltas.read
+        FROM (
+            SELECT owner_id,
+                   count(*) FILTER (WHERE read_at IS NULL) AS unread,
+                   count(*) FILTER (WHERE read_at IS NOT NULL) AS read
+            FROM old_rows
+            GROUP BY owner_id
+        ) AS deltas
+        WHERE counters.owner_id = deltas.owner_id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER notifications_counters_insert_trigger
+        AFTER INSERT ON notifications_notification
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_counters_after_insert();
+
+    CREATE TRIGGER notifications_counters_update_trigger
+        AFTER UPDATE ON notifications_notification
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_counters_after_update();
+
+    CREATE TRIGGER notifications_counters_delete_trigger
+        AFTER DELETE ON notifications_notification
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_counters_after_delete();
+
+    INSERT INTO notifications_notificationcounters (owner_id, unread, read)
+    SELECT owner_id,
+           count(*) FILTER (WHERE read_at IS NULL),
+           count(*) FILTER (WHERE read_at IS NOT NULL)
+    FROM notifications_notification
+    GROUP BY owner_id;
+"""
+
+DROP_COUNTERS_TRIGGERS = """
+    DROP TRIGGER IF EXISTS notifications_counters_insert_trigger ON notifications_notification;
+    DROP TRIGGER IF EXISTS notifications_counters_update_trigger ON notifications_notification;
+    DROP TRIGGER IF EXISTS notifications_counters_delete_trigger ON notifications_notification;
+    DROP FUNCTION IF EXISTS notifications_counters_after_insert();
+    DROP FUNCTION IF EXISTS notifications_counters_after_update();
+    DROP FUNCTION IF EXISTS notifications_counters_after_delete();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0003_alter_notification_to_generic_jsonfield"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationCounters",
+            fields=[
+                (
+                    "owner",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="notification_counters",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="owner",
+                    ),
+                ),
+                ("unread", models.IntegerField(default=0, verbose_name="unread")),
+                ("read", models.IntegerField(default=0, verbose_name="read")),
+            ],
+            options={
+                "verbose_name": "notification counters",
+                "verbose_name_plural": "notification counters",
+            },
+        ),
+        migrations.RunSQL(
+            sql=CREATE_COUNTERS_TRIGGERS,
+            reverse_sql=DROP_COUNTERS_TRIGGERS,
+        ),
+    ]
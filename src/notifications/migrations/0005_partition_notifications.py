@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+from django.db import migrations, models
+
+# The notifications table is converted into a table partitioned by range of `created_at`, with a partition per month
+# (`notifications_notification_pYYYYMM`, created ahead of time by the `manage_notifications_partitions` task) and a
+# default partition for the rows outside of them. Old notifications are removed by dropping whole partitions instead of
+# deleting their rows. The primary key of a partitioned table must include the partition key, so the primary key in
+# database is `(id, created_at)` (the model still declares `id` as its primary key, the ids being unique anyway).
+#
+# The indexes and foreign keys of the table are recreated from their definitions (the same names for the same
+# definitions) and the triggers of the counters (see the `0004_notificationcounters` migration) after the rows are
+# copied, so they are not counted again.
+PARTITION_NOTIFICATIONS = """
+    DO $$
+    DECLARE
+        index_defs text[];
+        fk_defs text[];
+        def text;
+        month_start date;
+        last_month_start date := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months';
+    BEGIN
+        SELECT coalesce(array_agg(pg_get_indexdef(indexrelid)), '{}') INTO index_defs
+        FROM pg_index
+        WHERE indrelid = 'notifications_notification'::regclass AND NOT indisprimary;
+
+        SELECT coalesce(array_agg(format('ADD CONSTRAINT %I %s', conname, pg_get_constraintdef(oid))), '{}')
+        INTO fk_defs
+        FROM pg_constraint
+        WHERE conrelid = 'notifications_notification'::regclass AND contype = 'f';
+
+        DROP TRIGGER notifications_counters_insert_trigger ON notifications_notification;
+        DROP TRIGGER notifications_counters_update_trigger ON notifications_notification;
+        DROP TRIGGER notifications_counters_delete_trigger ON notifications_notification;
+
+        ALTER TABLE notifications_notification RENAME TO notifications_notification_old;
+        FOR def IN
+            SELECT relname FROM pg_class
+            WHERE oid IN (SELECT indexrelid FROM pg_index WHERE indrelid = 'notifications_notification_old'::regclass)
+        LOOP
+            EXECUTE format('ALTER INDEX %I RENAME TO %I', def, left(def, 59) || '_old');
+        END LOOP;
+
+        CREATE TABLE notifications_notification (
+            LIKE notifications_notification_old INCLUDING DEFAULTS INCLUDING STORAGE
+        ) PARTITION BY RANGE (created_at);
+        ALTER TABLE notifications_notification
+            ADD CONSTRAINT notifications_notification_pkey PRIMARY KEY (id, created_at);
+
+        CREATE TABLE notifications_notification_default PARTITION OF notifications_notification DEFAULT;
+        SELECT date_trunc('month', coalesce(min(created_at), now()) AT TIME ZONE 'UTC') INTO month_start
+        FROM notifications_notification_old;
+        WHILE month_start <= last_month_start LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF notifications_notification FOR VALUES FROM (%L) TO (%L)',
+                'notifications_notification_p' || to_char(month_start, 'YYYYMM'),
+                month_start::timestamp AT TIME ZONE 'UTC',
+                (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            month_start := month_start + interval '1 month';
+        END LOOP;
+
+        INSERT INTO notifications_notification SELECT * FROM notifications_notification_old;
+        DROP TABLE notifications_notification_old;
+
+        FOREACH def IN ARRAY index_defs LOOP
+            EXECUTE def;
+        END LOOP;
+        FOREACH def IN ARRAY fk_defs LOOP
+            EXECUTE 'ALTER TABLE notifications_notification ' || def;
+        END LOOP;
+    END
+    $$;
+
+    CREATE TRIGGER notifications_counters_insert_trigger
+        AFTER INSERT ON notifications_notification
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_counters_after_insert();
+
+    CREATE TRIGGER notifications_counters_update_trigger
+        AFTER UPDATE ON notifications_notification
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_counters_after_update();
+
+    CREATE TRIGGER notifications_counters_delete_trigger
+        AFTER DELETE ON notifications_notification
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_counters_after_delete();
+"""
+
+# Back to a regular table, with `id` as primary key (the indexes on the partitioned table are created with `ON ONLY`
+# in their definitions, which is not valid for a regular table).
+UNPARTITION_NOTIFICATIONS = """
+    DO $$
+    DECLARE
+        index_defs text[];
+        fk_defs text[];
+        def text;
+    BEGIN
+        SELECT coalesce(array_agg(replace(pg_get_indexdef(indexrelid), ' ON ONLY ', ' ON ')), '{}') INTO index_defs
+        FROM pg_index
+        WHERE indrelid = 'notifications_notification'::regclass AND NOT indisprimary;
+
+        SELECT coalesce(array_agg(format('ADD CONSTRAINT %I %s', conname, pg_get_constraintdef(oid))), '{}')
+        INTO fk_defs
+        FROM pg_constraint
+        WHERE conrelid = 'notifications_notification'::regclass AND contype = 'f';
+
+        DROP TRIGGER notifications_counters_insert_trigger ON notifications_notification;
+        DROP TRIGGER notifications_counters_update_trigger ON notifications_notification;
+        DROP TRIGGER notifications_counters_delete_trigger ON notifications_notification;
+
+        ALTER TABLE notifications_notification RENAME TO notifications_notification_old;
+        FOR def IN
+            SELECT relname FROM pg_class
+            WHERE oid IN (SELECT indexrelid FROM pg_index WHERE indrelid = 'notifications_notification_old'::regclass)
+        LOOP
+            EXECUTE format('ALTER INDEX %I RENAME TO %I', def, left(def, 59) || '_old');
+        END LOOP;
+
+        CREATE TABLE notifications_notification (
+            LIKE notifications_notification_old INCLUDING DEFAULTS INCLUDING STORAGE
+        );
+        ALTER TABLE notifications_notification ADD CONSTRAINT notifications_notification_pkey PRIMARY KEY (id);
+
+        INSERT INTO notifications_notification SELECT * FROM notifications_notification_old;
+        DROP TABLE notifications_notification_old;
+
+        FOREACH def IN ARRAY index_defs LOOP
+            EXECUTE def;
+        END LOOP;
+        FOREACH def IN ARRAY fk_defs LOOP
+            EXECUTE 'ALTER TABLE notifications_notification ' || def;
+        END LOOP;
+    END
+    $$;
+
+    CREATE TRIGGER notifications_counters_insert_trigger
+        AFTER INSERT ON notifications_notification
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_counters_after_insert();
+
+    CREATE TRIGGER notifications_counters_update_trigger
+        AFTER UPDATE ON notifications_notification
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_counters_after_update();
+
+    CREATE TRIGGER notifications_counters_delete_trigger
+        AFTER DELETE ON notifications_notification
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_counters_after_delete();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0004_notificationcounters"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=PARTITION_NOTIFICATIONS,
+            reverse_sql=UNPARTITION_NOTIFICATIONS,
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("read_at__isnull", False)),
+                fields=["read_at"],
+                name="notifications_read_at_idx",
+            ),
+        ),
+    ]
@@ -28,6 +28,11 @@ from base.db.models.mixins import CreatedMetaInfoMixin
 
 
 class Notification(BaseDBModel, CreatedMetaInfoMixin):
+    """
+    The notifications table is partitioned by month of `created_at` (see the `0005_partition_notifications`
+    migration), so its primary key in database is `(id, created_at)`.
+    """
+
     type = models.CharField(
         max_length=500,
         null=False,
@@ -66,4 +71,40 @@ class Notification(BaseDBModel, CreatedMetaInfoMixin):
                 ]
             ),
             models.Index(fields=["owner", "read_at"]),
+            models.Index(
+                fields=["read_at"],
+                condition=models.Q(read_at__isnull=False),
+                name="notifications_read_at_idx",
+            ),
         ]
+
+
+class NotificationCounters(models.Model):
+    """
+    Number of unread and read notifications of a user. The counters are kept in sync by database triggers on the
+    notifications table (see the `0004_notificationcounters` migration), whatever the query changing it.
+    """
+
+    owner = models.OneToOneField(
+        "users.User",
+        primary_key=True,
+        null=False,
+        blank=False,
+        on_delete=models.CASCADE,
+        related_name="notification_counters",
+        verbose_name="owner",
+    )
+    unread = models.IntegerField(
+        null=False, blank=False, default=0, verbose_name="unread"
+    )
+    read = models.IntegerField(null=False, blank=False, default=0, verbose_name="read")
+
+    class Meta:
+        verbose_name = "notification counters"
+        verbose_name_plural = "notification counters"
+
+    def __str__(self) -> str:
+        return f"{self.owner_id}: {self.unread}/{self.read}"
+
+    def __repr__(self) -> str:
+        return f"<NotificationCounters {self.owner_id} {self.unread} {self.read}>"
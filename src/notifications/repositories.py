@@ -17,15 +17,16 @@
 #
 # You can contact BIRU at ask@biru.sh
 
-from collections.abc import Iterable
-from datetime import datetime
+from contextlib import closing
+from datetime import date, datetime, timedelta
 from typing import Any, Literal, TypedDict
 from uuid import UUID
 
-from django.db.models import Count, Q
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
 
 from ninja_jwt.utils import aware_utcnow
-from notifications.models import Notification
+from notifications.models import Notification, NotificationCounters
 from users.models import User
 
 ##########################################################
@@ -36,6 +37,10 @@ from users.models import User
 class NotificationFilters(TypedDict, total=False):
     id: UUID
     owner: User
+    owner_id__in: list[UUID]
+    type__in: list[str]
+    content__project__id__in: list[str]
+    created_at__gte: datetime
     read_at__isnull: bool
     read_at__lt: datetime
 
@@ -43,28 +48,45 @@ class NotificationFilters(TypedDict, total=False):
 NotificationSelectRelated = list[Literal["owner", "created_by"]]
 
 
+class PendingNotification(TypedDict):
+    """
+    A notification waiting to be created, in a JSON-serializable form (to be passed to a task).
+    """
+
+    owner_id: str
+    created_by_id: str | None
+    type: str
+    content: dict[str, Any]
+
+
 ##########################################################
 # create notifications
 ##########################################################
 
 
-async def create_notifications(
-    owner_ids: Iterable[UUID],
-    created_by: User | None,
-    notification_type: str,
-    content_list: list[dict[str, Any]],
+async def bulk_create_notifications(
+    pending_notifications: list[PendingNotification],
 ) -> list[Notification]:
+    created_by_ids = {
+        UUID(pending["created_by_id"])
+        for pending in pending_notifications
+        if pending["created_by_id"]
+    }
+    created_by = await User.objects.ain_bulk(created_by_ids) if created_by_ids else {}
+
     notifications = [
         Notification(
-            owner_id=owner_id,
-            created_by=created_by,
-            type=notification_type,
-            content=content,
+            owner_id=UUID(pending["owner_id"]),
+            created_by=created_by.get(UUID(pending["created_by_id"]))
+            if pending["created_by_id"]
+            else None,
+            type=pending["type"],
+            content=pending["content"],
         )
-        for owner_id in owner_ids
-        for content in content_list
+        for pending in pending_notifications
     ]
 
+    # a single multi-row insert
     return await Notification.objects.abulk_create(notifications)
 
 
@@ -78,8 +100,24 @@ async def list_notifications(
     offset: int | None = None,
     limit: int | None = None,
     select_related: NotificationSelectRelated = ["created_by"],
+    after: tuple[datetime, UUID] | None = None,
 ) -> list[Notification]:
-    qs = Notification.objects.all().filter(**filters).select_related(*select_related)
+    """
+    Notifications are listed from the newest. `after` is the `(created_at, id)` of the last notification of the
+    previous page (keyset pagination), so the next page is still listed if this notification is deleted meanwhile.
+    """
+    qs = (
+        Notification.objects.all()
+        .filter(**filters)
+        .select_related(*select_related)
+        .order_by("-created_at", "-id")
+    )
+    if after is not None:
+        after_created_at, after_id = after
+        qs = qs.filter(
+            Q(created_at__lt=after_created_at)
+            | Q(created_at=after_created_at, id__lt=after_id)
+        )
 
     if limit is not None and offset is not None:
         limit += offset
@@ -87,6 +125,21 @@ async def list_notifications(
     return [a async for a in qs[offset:limit]]
 
 
+def list_notifications_for_update_qs(
+    filters: NotificationFilters = {},
+    select_related: NotificationSelectRelated = ["created_by"],
+) -> QuerySet[Notification]:
+    """
+    To be iterated in a transaction: the notifications are locked until it ends.
+    """
+    return (
+        Notification.objects.all()
+        .filter(**filters)
+        .select_related(*select_related)
+        .select_for_update(of=("self",))
+    )
+
+
 ##########################################################
 # get notifications
 ##########################################################
@@ -104,6 +157,17 @@ async def get_notification(
         return None
 
 
+##########################################################
+# update notifications
+##########################################################
+
+
+async def bulk_update_notifications(
+    objs_to_update: list[Notification], fields_to_update: list[str]
+) -> None:
+    await Notification.objects.abulk_update(objs_to_update, fields_to_update)
+
+
 ##########################################################
 # mark notificatiosn as read
 ##########################################################
@@ -123,10 +187,111 @@ async def mark_notifications_as_read(
 ##########################################################
 
 
-def delete_notifications(filters: NotificationFilters = {}) -> int:
-    qs = Notification.objects.all().filter(**filters)
-    count, _ = qs.delete()
-    return count
+def delete_read_notifications_by_chunks(before: datetime, chunk_size: int) -> int:
+    """
+    Delete the notifications read before some date, `chunk_size` rows per statement (each one in its own
+    transaction), so the locks are held for a short time and the triggers of the counters handle small batches.
+    """
+    sql = """
+    DELETE FROM notifications_notification
+    WHERE (id, created_at) IN (
+        SELECT id, created_at FROM notifications_notification
+        WHERE read_at IS NOT NULL AND read_at < %s
+        LIMIT %s
+    );
+    """
+
+    total_deleted = 0
+    while True:
+        with transaction.atomic(), closing(connection.cursor()) as cursor:
+            cursor.execute(sql, [before, chunk_size])
+            deleted = cursor.rowcount
+        total_deleted += deleted
+        if deleted < chunk_size:
+            return total_deleted
+
+
+##########################################################
+# partitions
+##########################################################
+
+PARTITION_PREFIX = "notifications_notification_p"
+
+
+def list_notifications_partitions() -> list[date]:
+    """
+    Return the first day of the months with a partition of the notifications table (the default partition excluded).
+    """
+    sql = """
+    SELECT child.relname FROM pg_inherits
+    JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = 'notifications_notification'::regclass AND child.relname LIKE %s
+    ORDER BY child.relname;
+    """
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, [f"{PARTITION_PREFIX}%"])
+        return [
+            datetime.strptime(name.removeprefix(PARTITION_PREFIX), "%Y%m").date()
+            for (name,) in cursor.fetchall()
+        ]
+
+
+@transaction.atomic
+def create_notifications_partition(month: date) -> None:
+    """
+    Create the partition of the notifications table for the month of `month` (UTC), if it does not exist yet.
+    """
+    # DDL statements can't have bound parameters, the bounds are dates so they are safe to be formatted
+    start = month.replace(day=1)
+    sql = """
+    CREATE TABLE IF NOT EXISTS {} PARTITION OF notifications_notification
+    FOR VALUES FROM ('{} 00:00:00+00') TO ('{} 00:00:00+00');
+    """.format(
+        _partition_name(start), start.isoformat(), _next_month(start).isoformat()
+    )
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql)
+
+
+@transaction.atomic
+def drop_notifications_partition(month: date) -> None:
+    """
+    Detach and drop the partition of the notifications table for the month of `month`. The statement-level triggers
+    of the counters are not fired by a drop, so the counters are decremented from the rows of the detached partition.
+    """
+    partition_name = _partition_name(month)
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(
+            "ALTER TABLE notifications_notification DETACH PARTITION {};".format(
+                partition_name
+            )
+        )
+        cursor.execute(
+            """
+            UPDATE notifications_notificationcounters AS counters
+            SET unread = counters.unread - deltas.unread,
+                read = counters.read - deltas.read
+            FROM (
+                SELECT owner_id,
+                       count(*) FILTER (WHERE read_at IS NULL) AS unread,
+                       count(*) FILTER (WHERE read_at IS NOT NULL) AS read
+                FROM {}
+                GROUP BY owner_id
+            ) AS deltas
+            WHERE counters.owner_id = deltas.owner_id;
+            """.format(partition_name)
+        )
+        cursor.execute("DROP TABLE {};".format(partition_name))
+
+
+def _partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def _next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
 
 
 ##########################################################
@@ -134,10 +299,10 @@ def delete_notifications(filters: NotificationFilters = {}) -> int:
 ##########################################################
 
 
-async def count_notifications(
-    filters: NotificationFilters = {},
-) -> dict[str, int]:
-    return await Notification.objects.filter(**filters).aaggregate(
-        read=Count("pk", filter=Q(read_at__isnull=False)),
-        unread=Count("pk", filter=Q(read_at__isnull=True)),
+async def get_notification_counters(owner: User) -> dict[str, int]:
+    counters = (
+        await NotificationCounters.objects.filter(owner=owner)
+        .values("read", "unread")
+        .afirst()
     )
+    return counters or {"read": 0, "unread": 0}
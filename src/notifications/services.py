@@ -17,15 +17,25 @@
 #
 # You can contact BIRU at ask@biru.sh
 
-from collections.abc import Iterable
-from datetime import datetime
+import json
+from collections.abc import AsyncIterator, Hashable, Iterable
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from typing import Any
 from uuid import UUID
 
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
 from base.serializers import BaseSchema
+from commons.utils import transaction_atomic_async, transaction_on_commit_async
+from ninja_jwt.utils import aware_utcnow
 from notifications import events as notifications_events
 from notifications import repositories as notifications_repositories
+from notifications import tasks as notifications_tasks
+from notifications.context import batched_notifications
 from notifications.models import Notification
-from notifications.repositories import NotificationFilters
+from notifications.repositories import NotificationFilters, PendingNotification
 from users.models import User
 
 
@@ -35,26 +45,221 @@ async def notify_users(
     notified_user_ids: Iterable[UUID],
     content_list: list[BaseSchema],
 ) -> None:
-    notifications = await notifications_repositories.create_notifications(
-        owner_ids=notified_user_ids,
-        created_by=emitted_by,
-        notification_type=notification_type,
-        content_list=[content.dict() for content in content_list],
+    """
+    The notifications are not created here, but added to the current batch (see `notifications_batch`), or to a
+    batch of their own if there is none.
+    """
+    contents = [_to_json(content.dict()) for content in content_list]
+    async with notifications_batch():
+        batch = batched_notifications.get()
+        assert batch is not None
+        for owner_id in notified_user_ids:
+            for content in contents:
+                pending = PendingNotification(
+                    owner_id=str(owner_id),
+                    created_by_id=str(emitted_by.id) if emitted_by else None,
+                    type=notification_type,
+                    content=content,
+                )
+                key = _coalescing_key(pending)
+                # the last notification about a story replaces the previous one (and its place)
+                batch.pop(key, None)
+                batch[key] = pending
+
+
+@asynccontextmanager
+async def notifications_batch() -> AsyncIterator[None]:
+    """
+    Collect the notifications of `notify_users` calls made inside the block, so they are created when it exits by a
+    single task (a single insert and a single websocket message per user), deferred once the current transaction is
+    committed. Notifications of the same type about the
+    same story for the same user are coalesced, only the last one being kept. Nothing is created if the block raises.
+    Nested batches are merged into the outer one.
+    """
+    if batched_notifications.get() is not None:
+        yield
+        return
+
+    token = batched_notifications.set({})
+    try:
+        yield
+        batch = list((batched_notifications.get() or {}).values())
+    finally:
+        batched_notifications.reset(token)
+
+    if batch:
+        await transaction_on_commit_async(
+            notifications_tasks.create_notifications.defer_async
+        )(pending_notifications=batch)
+
+
+async def create_notifications(
+    pending_notifications: list[PendingNotification],
+) -> list[Notification]:
+    """
+    Run by the task deferred by `notifications_batch`. Unless they are disabled, the notifications about stories are
+    first digested (see `NOTIFICATIONS.DIGEST_WINDOW_SECONDS`): merged together by owner, type and project, and then
+    into the unread notification of the same owner, type and project created within the window, if any. The digest
+    keeps the content of the last notification, with the refs of all its stories in `digest_refs`.
+    """
+    digest_window = settings.NOTIFICATIONS.DIGEST_WINDOW_SECONDS
+    digests: list[Notification] = []
+    if digest_window:
+        pending_notifications = _digest_pending_notifications(pending_notifications)
+
+    async with transaction_atomic_async():
+        if digest_window:
+            (
+                pending_notifications,
+                digests,
+            ) = await _digest_pending_notifications_into_unread_ones(
+                pending_notifications,
+                created_after=aware_utcnow() - timedelta(seconds=digest_window),
+            )
+        notifications = (
+            await notifications_repositories.bulk_create_notifications(
+                pending_notifications=pending_notifications
+            )
+            if pending_notifications
+            else []
+        )
+
+    if notifications:
+        await notifications_events.emit_event_when_notifications_are_created(
+            notifications=notifications
+        )
+    if digests:
+        await notifications_events.emit_event_when_notifications_are_updated(
+            notifications=digests
+        )
+    return notifications
+
+
+def _digest_key(
+    owner_id: str | UUID, type: str, content: dict[str, Any]
+) -> tuple[str, str, str] | None:
+    project = content.get("project")
+    story = content.get("story")
+    if not (
+        isinstance(project, dict)
+        and "id" in project
+        and isinstance(story, dict)
+        and "ref" in story
+    ):
+        # not about a story: never digested
+        return None
+    return str(owner_id), type, project["id"]
+
+
+def _digest_contents(
+    content: dict[str, Any], new_content: dict[str, Any]
+) -> dict[str, Any]:
+    refs = {*content.get("digest_refs", [content["story"]["ref"]])}
+    refs.update(new_content.get("digest_refs", [new_content["story"]["ref"]]))
+    return {**new_content, "digest_refs": sorted(refs)}
+
+
+def _digest_pending_notifications(
+    pending_notifications: list[PendingNotification],
+) -> list[PendingNotification]:
+    digested: list[PendingNotification] = []
+    digests: dict[tuple[str, str, str], PendingNotification] = {}
+    for pending in pending_notifications:
+        key = _digest_key(pending["owner_id"], pending["type"], pending["content"])
+        if key is None:
+            digested.append(pending)
+        elif key in digests:
+            digest = digests[key]
+            digest["content"] = _digest_contents(digest["content"], pending["content"])
+            digest["created_by_id"] = pending["created_by_id"]
+        else:
+            digests[key] = digest = PendingNotification(**pending)
+            digested.append(digest)
+    return digested
+
+
+async def _digest_pending_notifications_into_unread_ones(
+    pending_notifications: list[PendingNotification], created_after: datetime
+) -> tuple[list[PendingNotification], list[Notification]]:
+    """
+    Return the pending notifications that are not digested, and the (updated) digests.
+    """
+    keys = {
+        key: pending
+        for pending in pending_notifications
+        if (
+            key := _digest_key(pending["owner_id"], pending["type"], pending["content"])
+        )
+    }
+    if not keys:
+        return pending_notifications, []
+
+    qs = notifications_repositories.list_notifications_for_update_qs(
+        filters={
+            "owner_id__in": list({UUID(owner_id) for owner_id, _, _ in keys}),
+            "type__in": list({type for _, type, _ in keys}),
+            "content__project__id__in": list({project_id for _, _, project_id in keys}),
+            "read_at__isnull": True,
+            "created_at__gte": created_after,
+        }
     )
-    await notifications_events.emit_event_when_notifications_are_created(
-        notifications=notifications
+    digests: dict[tuple[str, str, str], Notification] = {}
+    async for notification in qs:
+        key = _digest_key(
+            notification.owner_id, notification.type, notification.content
+        )
+        # notifications are ordered by -created_at: the last one is kept as the digest
+        if key in keys and key not in digests:
+            notification.content = _digest_contents(
+                notification.content, keys[key]["content"]
+            )
+            digests[key] = notification
+
+    if digests:
+        await notifications_repositories.bulk_update_notifications(
+            objs_to_update=list(digests.values()), fields_to_update=["content"]
+        )
+
+    return [
+        pending
+        for pending in pending_notifications
+        if _digest_key(pending["owner_id"], pending["type"], pending["content"])
+        not in digests
+    ], list(digests.values())
+
+
+def _to_json(content: dict[str, Any]) -> dict[str, Any]:
+    # the same representation as the one stored by the (DjangoJSONEncoder) content field
+    return json.loads(json.dumps(content, cls=DjangoJSONEncoder))
+
+
+def _coalescing_key(pending: PendingNotification) -> Hashable:
+    story = pending["content"].get("story")
+    if not isinstance(story, dict) or "ref" not in story:
+        # not about a story: never coalesced
+        return object()
+    return (
+        pending["owner_id"],
+        pending["type"],
+        story.get("project_id"),
+        story["ref"],
     )
 
 
 async def list_user_notifications(
-    user: User, is_read: bool | None = None
+    user: User,
+    is_read: bool | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    limit: int | None = None,
 ) -> list[Notification]:
     filters: NotificationFilters = {"owner": user}
 
     if is_read is not None:
         filters["read_at__isnull"] = not is_read
 
-    return await notifications_repositories.list_notifications(filters=filters)
+    return await notifications_repositories.list_notifications(
+        filters=filters, after=after, limit=limit
+    )
 
 
 async def get_notification(notification_id: UUID) -> Notification | None:
@@ -84,13 +289,45 @@ async def mark_user_notifications_as_read(
 
 
 async def count_user_notifications(user: User) -> dict[str, int]:
-    count = await notifications_repositories.count_notifications(
-        filters={"owner": user}
-    )
+    count = await notifications_repositories.get_notification_counters(owner=user)
     return {**count, "total": count["read"] + count["unread"]}
 
 
 def clean_read_notifications(before: datetime) -> int:
-    return notifications_repositories.delete_notifications(
-        filters={"read_at__isnull": False, "read_at__lt": before}
+    return notifications_repositories.delete_read_notifications_by_chunks(
+        before=before,
+        chunk_size=settings.NOTIFICATIONS.DELETE_READ_NOTIFICATIONS_CHUNK_SIZE,
+    )
+
+
+def manage_notifications_partitions(today: date) -> tuple[list[date], list[date]]:
+    """
+    Create the partitions of the notifications table for the current month and the next ones (if missing), and drop
+    the partitions of the months older than the retention period. Return the months of the created and dropped
+    partitions.
+    """
+    this_month = today.replace(day=1)
+    existing = set(notifications_repositories.list_notifications_partitions())
+
+    created = []
+    for months in range(settings.NOTIFICATIONS.PARTITIONS_MONTHS_AHEAD + 1):
+        month = _add_months(this_month, months)
+        if month not in existing:
+            notifications_repositories.create_notifications_partition(month=month)
+            created.append(month)
+
+    oldest_month = _add_months(
+        this_month, -settings.NOTIFICATIONS.MONTHS_TO_STORE_NOTIFICATIONS
     )
+    dropped = []
+    for month in sorted(existing):
+        if month < oldest_month:
+            notifications_repositories.drop_notifications_partition(month=month)
+            dropped.append(month)
+
+    return created, dropped
+
+
+def _add_months(month: date, months: int) -> date:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return date(year, month_index + 1, 1)
@@ -24,10 +24,20 @@ from procrastinate.contrib.django import app
 
 from ninja_jwt.utils import aware_utcnow
 from notifications import services as notifications_services
+from notifications.repositories import PendingNotification
 
 logger = logging.getLogger(__name__)
 
 
+@app.task
+async def create_notifications(
+    pending_notifications: list[PendingNotification],
+) -> None:
+    await notifications_services.create_notifications(
+        pending_notifications=pending_notifications
+    )
+
+
 @app.periodic(cron=settings.NOTIFICATIONS.CLEAN_READ_NOTIFICATIONS_CRON)  # type: ignore
 @app.task
 def clean_read_notifications(timestamp: int) -> int:
@@ -43,3 +53,18 @@ def clean_read_notifications(timestamp: int) -> int:
     )
 
     return total_deleted
+
+
+@app.periodic(cron=settings.NOTIFICATIONS.MANAGE_PARTITIONS_CRON)  # type: ignore
+@app.task
+def manage_notifications_partitions(timestamp: int) -> None:
+    created, dropped = notifications_services.manage_notifications_partitions(
+        today=aware_utcnow().date()
+    )
+
+    logger.info(
+        "notifications partitions: %s created, %s dropped",
+        len(created),
+        len(dropped),
+        extra={"created": created, "dropped": dropped},
+    )
@@ -35,6 +35,7 @@ from projects.memberships.models import ProjectMembership, ProjectRole
 from projects.projects.models import Project
 from stories.assignments import repositories as story_assignments_repositories
 from users.models import User
+from workspaces.workspaces import repositories as workspaces_repositories
 
 ##########################################################
 # list project memberships
@@ -79,6 +80,9 @@ async def update_project_membership(
         membership=membership, role_id=role_id, user_role=user_role
     )
 
+    await transaction_on_commit_async(memberships_services.invalidate_roles_cache)(
+        membership
+    )
     await transaction_on_commit_async(
         memberships_events.emit_event_when_project_membership_is_updated
     )(membership=updated_membership)
@@ -163,6 +167,12 @@ async def delete_project_membership(
                 membership.user.email
             ),
         )
+        await transaction_on_commit_async(memberships_services.invalidate_roles_cache)(
+            membership
+        )
+        await transaction_on_commit_async(
+            workspaces_repositories.delete_cached_users_workspaces_overview
+        )(user_ids=[membership.user_id])
         await transaction_on_commit_async(
             memberships_events.emit_event_when_project_membership_is_deleted
         )(membership=membership, workspace_id=membership.project.workspace_id)
@@ -243,6 +253,7 @@ async def update_project_role(
         values=values,
     )
 
+    await transaction_on_commit_async(memberships_services.invalidate_roles_cache)(role)
     await transaction_on_commit_async(
         memberships_events.emit_event_when_project_role_is_updated
     )(role=role)
@@ -312,6 +323,9 @@ async def delete_project_role(
         )
 
     if deleted > 0:
+        await transaction_on_commit_async(memberships_services.invalidate_roles_cache)(
+            role
+        )
         await transaction_on_commit_async(
             memberships_events.emit_event_when_project_role_is_deleted
         )(role=role, target_role=target_role)
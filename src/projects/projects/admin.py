@@ -87,18 +87,30 @@ class ProjectAdmin(admin.ModelAdmin):
             "Extra info",
             {
                 "classes": ("collapse",),
-                "fields": ("color", "logo", ("created_at", "modified_at")),
+                "fields": (
+                    "color",
+                    "logo",
+                    ("created_at", "modified_at"),
+                    ("deleted_at", "deleted_by"),
+                ),
             },
         ),
     )
-    readonly_fields = ("id", "b64id", "created_at", "modified_at")
+    readonly_fields = (
+        "id",
+        "b64id",
+        "created_at",
+        "modified_at",
+        "deleted_at",
+        "deleted_by",
+    )
     list_display = [
         "b64id",
         "name",
         "workspace",
         "created_by",
     ]
-    list_filter = ("workspace", "created_by")
+    list_filter = ("workspace", "created_by", "deleted_at")
     search_fields = [
         "id",
         "name",
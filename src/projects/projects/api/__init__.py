@@ -17,18 +17,21 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+import mimetypes
 from pathlib import Path as PathlibPath
 from typing import Literal
 from uuid import UUID
 
 from django.conf import settings
-from django.http import FileResponse
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
 from django.views.decorators.cache import cache_control
+from easy_thumbnails.files import ThumbnailFile
 from ninja import File, Form, Path, Router, Status
 from ninja.decorators import decorate_view
 
+from base.api import file_response
 from base.serializers import BaseDataSchema
-from base.utils.files import iterfile
 from base.utils.images import ImageSizeFormat
 from commons.exceptions import api as ex
 from commons.exceptions.api.errors import (
@@ -194,7 +197,7 @@ async def get_project_logo(
     project_id: Path[B64UUID],
     last_mod: float | Literal[""],
     format: ImageSizeFormat = "small",
-) -> FileResponse | None:
+) -> HttpResponse | None:
     """
     Get project logo by project id.
     last_mod is used for caching purpose
@@ -211,11 +214,15 @@ async def get_project_logo(
     if file is None:
         return file
 
-    response = FileResponse(
-        iterfile(file, mode="rb"),
-        as_attachment=True,
+    response = await file_response(
+        request,
+        file,
+        content_type=mimetypes.guess_file_type(file.name)[0],
         filename=PathlibPath(file.name).name,
     )
+    if format != "original" and not isinstance(file, ThumbnailFile):
+        # the thumbnail is not generated yet, the original logo is only cached for a short time
+        patch_cache_control(response, max_age=60)
     return response
 
 
@@ -285,6 +292,9 @@ async def delete_project(
 ) -> Status[None]:
     """
     Delete a project
+
+    The project is hidden right away while its content is removed in background, the user who deleted it is notified
+    of the progress.
     """
     project = await get_project_or_404(project_id)
     await check_permissions(
@@ -21,7 +21,9 @@ from uuid import UUID
 from events import events_manager
 from projects.projects.events.content import (
     CreateProjectContent,
+    DeleteProjectCompletedContent,
     DeleteProjectContent,
+    DeleteProjectProgressContent,
     UpdateProjectContent,
 )
 from projects.projects.models import Project
@@ -30,6 +32,8 @@ from users.models import User
 
 CREATE_PROJECT = "projects.create"
 DELETE_PROJECT = "projects.delete"
+DELETE_PROJECT_PROGRESS = "projects.delete.progress"
+DELETE_PROJECT_COMPLETED = "projects.delete.completed"
 UPDATE_PROJECT = "projects.update"
 
 
@@ -110,3 +114,46 @@ async def emit_event_when_project_is_deleted(
         content=content,
     )
     # TODO handle pj-members and pj-invitees on homepage
+
+
+async def emit_event_when_project_deletion_progresses(
+    project: Project, progress_percentage: int
+) -> None:
+    """
+    This event is emitted to the user who deleted a project while its content is being removed in background
+    """
+    if not project.deleted_by_id:
+        return
+
+    await events_manager.publish_on_user_channel(
+        user=project.deleted_by_id,
+        type=DELETE_PROJECT_PROGRESS,
+        content=DeleteProjectProgressContent(
+            project_id=project.id,
+            name=project.name,
+            workspace_id=project.workspace_id,
+            progress_percentage=progress_percentage,
+        ),
+    )
+
+
+async def emit_event_when_project_deletion_is_completed(project: Project) -> None:
+    """
+    This event is emitted once all the content of a deleted project has been removed
+    """
+    content = DeleteProjectCompletedContent(
+        project_id=project.id,
+        name=project.name,
+        workspace_id=project.workspace_id,
+    )
+    if project.deleted_by_id:
+        await events_manager.publish_on_user_channel(
+            user=project.deleted_by_id,
+            type=DELETE_PROJECT_COMPLETED,
+            content=content,
+        )
+    await events_manager.publish_on_workspace_channel(
+        workspace=project.workspace_id,
+        type=DELETE_PROJECT_COMPLETED,
+        content=content,
+    )
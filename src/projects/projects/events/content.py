@@ -41,3 +41,13 @@ class DeleteProjectContent(BaseSchema):
     name: str
     workspace_id: UUIDB64
     deleted_by: UserNestedSerializer
+
+
+class DeleteProjectCompletedContent(BaseSchema):
+    project_id: UUIDB64
+    name: str
+    workspace_id: UUIDB64
+
+
+class DeleteProjectProgressContent(DeleteProjectCompletedContent):
+    progress_percentage: int
@@ -25,11 +25,14 @@ from django.db import models
 from slugify import slugify
 
 from base.db.models import BaseDBModel, LowerSlugField
-from base.db.models.mixins import CreatedMetaInfoMixin, ModifiedAtMetaInfoMixin
+from base.db.models.mixins import (
+    CreatedMetaInfoMixin,
+    DeletedMetaInfoMixin,
+    ModifiedAtMetaInfoMixin,
+)
 from base.utils.files import get_obfuscated_file_path
 from base.utils.slug import slugify_uniquely
 from commons.colors import NUM_COLORS, generate_random_color
-from projects import references
 
 if TYPE_CHECKING:
     from django_stubs_ext.db.models.manager import ManyRelatedManager
@@ -39,7 +42,9 @@ get_project_logo_file_path = functools.partial(
 )
 
 
-class Project(BaseDBModel, CreatedMetaInfoMixin, ModifiedAtMetaInfoMixin):
+class Project(
+    BaseDBModel, CreatedMetaInfoMixin, ModifiedAtMetaInfoMixin, DeletedMetaInfoMixin
+):
     name = models.CharField(max_length=80, null=False, blank=False, verbose_name="name")
     description = models.CharField(
         max_length=220, null=False, blank=True, default="", verbose_name="description"
@@ -98,11 +103,6 @@ class Project(BaseDBModel, CreatedMetaInfoMixin, ModifiedAtMetaInfoMixin):
     def slug(self) -> str:
         return slugify(self.name)
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        super().save(*args, **kwargs)
-
-        references.create_project_references_sequence(project_id=self.id)
-
 
 class ProjectTemplate(BaseDBModel):
     # WARNING: see nots about _get_default_template's cache if you ever need to modify this
@@ -20,7 +20,6 @@
 from typing import Any, Literal, TypedDict
 from uuid import UUID
 
-from asgiref.sync import sync_to_async
 from django.core.files import File
 from django.db.models import Exists, OuterRef, Q
 from pydantic import BaseModel, PositiveInt
@@ -148,6 +147,7 @@ async def list_workspace_projects_for_user(
                 importation__status=ImportationStatus.SUCCESS
             ),  # exclude ongoing importation from result
             workspace=workspace,
+            deleted_at__isnull=True,
         )
         .annotate(
             user_is_invited=Exists(
@@ -173,12 +173,15 @@ async def get_project(
     project_id: UUID,
     select_related: ProjectSelectRelated = ["workspace"],
     prefetch_related: ProjectPrefetchRelated = [],
+    include_deleted: bool = False,
 ) -> Project:
     qs = (
         Project.objects.all()
         .select_related(*select_related)
         .prefetch_related(*prefetch_related)
     )
+    if not include_deleted:
+        qs = qs.filter(deleted_at__isnull=True)
 
     return await qs.aget(id=project_id)
 
@@ -202,13 +205,18 @@ async def update_project(project: Project, values: dict[str, Any] = {}) -> Proje
 ##########################################################
 
 
+async def mark_project_as_deleted(project: Project, deleted_by: User) -> Project:
+    return await update_project(
+        project=project, values={"deleted_at": aware_utcnow(), "deleted_by": deleted_by}
+    )
+
+
 @transaction_atomic_async()
 async def delete_projects(project_id: UUID) -> int:
     qs = Project.objects.all().filter(id=project_id)
-    await sync_to_async(references.delete_project_references_sequences)(
-        project_ids=[p_id async for p_id in qs.values_list("id", flat=True)]
-    )
     count, _ = await qs.adelete()
+    # the references counter is deleted in cascade
+    references.forget_project_references(project_ids=[project_id])
     return count
 
 
@@ -223,7 +231,7 @@ async def get_total_projects(
 ) -> int:
     return await (
         Project.objects.all()
-        .filter(workspace_id=workspace_id, **filters)
+        .filter(workspace_id=workspace_id, deleted_at__isnull=True, **filters)
         .distinct()
         .acount()
     )
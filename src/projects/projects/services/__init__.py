@@ -24,9 +24,12 @@ from django.conf import settings
 from django.db.models.fields.files import FieldFile
 from easy_thumbnails.files import ThumbnailFile
 from ninja import UploadedFile
+from procrastinate.exceptions import AlreadyEnqueued
 from pydantic import ValidationError
 
-from base.utils.images import ImageSizeFormat, get_thumbnail
+from attachments import repositories as attachments_repositories
+from base.db.models import get_contenttype_for_model
+from base.utils.images import ImageSizeFormat, generate_thumbnails, get_thumbnail
 from commons.colors import generate_random_color
 from commons.utils import (
     async_cache,
@@ -45,8 +48,11 @@ from projects.projects.models import Project, ProjectTemplate
 from projects.projects.serializers import (
     ProjectDetailSerializer,
 )
+from stories.stories import repositories as stories_repositories
+from stories.stories.models import Story
 from users.models import AnyUser, User
 from workflows import repositories as workflows_repositories
+from workspaces.workspaces import repositories as workspaces_repositories
 from workspaces.workspaces.models import Workspace
 
 
@@ -78,6 +84,9 @@ async def create_project(
             logo_file=logo,
         )
     )[0]
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_users_workspaces_overview
+    )(user_ids=[created_by.id])
     await transaction_on_commit_async(
         projects_events.emit_event_when_project_is_created
     )(project=project)
@@ -146,6 +155,9 @@ async def _create_project(
         **kwargs,
     )
 
+    if project.logo:
+        await _defer_generate_logo_thumbnails(project)
+
     roles = await projects_repositories.apply_template_to_project(
         template=template, project=project
     )
@@ -243,6 +255,9 @@ async def update_project(
     project: Project, updated_by: User, values: dict[str, Any] = {}
 ) -> ProjectDetailSerializer:
     updated_project = await _update_project(project=project, values=values)
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_workspaces_overviews
+    )(workspace_ids=[project.workspace_id])
     project_detail = await get_project_detail(
         project=updated_project,
         user=updated_by,
@@ -295,6 +310,9 @@ async def _update_project(project: Project, values: dict[str, Any] = {}) -> Proj
     if file_to_delete:
         await projects_tasks.delete_old_logo.defer_async(file_name=file_to_delete)
 
+    if values.get("logo"):
+        await _defer_generate_logo_thumbnails(updated_project)
+
     return updated_project
 
 
@@ -305,6 +323,62 @@ async def _update_project(project: Project, values: dict[str, Any] = {}) -> Proj
 
 @transaction_atomic_async()
 async def delete_project(project: Project, deleted_by: User) -> bool:
+    """
+    The project is only marked as deleted here, so it disappears at once for everyone; its content is then removed
+    by a background job (see `do_delete_project`).
+    """
+    if project.deleted_at:
+        return False
+
+    await projects_repositories.mark_project_as_deleted(
+        project=project, deleted_by=deleted_by
+    )
+    await transaction_on_commit_async(projects_tasks.delete_project.defer_async)(
+        project_id=project.b64id
+    )
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_workspaces_overviews
+    )(workspace_ids=[project.workspace_id])
+
+    # Emit event
+    await transaction_on_commit_async(
+        projects_events.emit_event_when_project_is_deleted
+    )(
+        workspace_id=project.workspace_id,
+        project=project,
+        deleted_by=deleted_by,
+    )
+
+    return True
+
+
+async def do_delete_project(project_id: UUID) -> bool:
+    """
+    Run by the deletion job of a (soft) deleted project. The stories, with their comments and attachments, are
+    deleted by chunks of `DELETE_PROJECT_STORIES_CHUNK_SIZE`, each one in its own transaction, so the rest of the
+    cascade left for the project itself stays small.
+    """
+    try:
+        project = await projects_repositories.get_project(
+            project_id=project_id, select_related=[None], include_deleted=True
+        )
+    except Project.DoesNotExist:
+        # already deleted (by another job for instance)
+        return False
+    if not project.deleted_at:
+        return False
+
+    total_stories = await stories_repositories.list_stories_qs(
+        filters={"project_id": project.id}
+    ).acount()
+    deleted_stories = 0
+    while deleted := await _delete_project_stories_chunk(project=project):
+        deleted_stories += deleted
+        await projects_events.emit_event_when_project_deletion_progresses(
+            project=project,
+            progress_percentage=min(100, deleted_stories * 100 // total_stories),
+        )
+
     # Mark the file to delete
     file_to_delete = None
     if project.logo:
@@ -317,20 +391,36 @@ async def delete_project(project: Project, deleted_by: User) -> bool:
         if file_to_delete:
             await projects_tasks.delete_old_logo.defer_async(file_name=file_to_delete)
 
-        # Emit event
-        await transaction_on_commit_async(
-            projects_events.emit_event_when_project_is_deleted
-        )(
-            workspace_id=project.workspace_id,
-            project=project,
-            deleted_by=deleted_by,
+        await projects_events.emit_event_when_project_deletion_is_completed(
+            project=project
         )
-
         return True
 
     return False
 
 
+@transaction_atomic_async()
+async def _delete_project_stories_chunk(project: Project) -> int:
+    story_ids = [
+        story_id
+        async for story_id in stories_repositories.list_stories_qs(
+            filters={"project_id": project.id},
+            limit=settings.DELETE_PROJECT_STORIES_CHUNK_SIZE,
+        ).values_list("id", flat=True)
+    ]
+    if not story_ids:
+        return 0
+
+    # attachments are deleted (and their files marked to be cleaned) in bulk before the stories
+    await attachments_repositories.bulk_delete_attachments(
+        filters={
+            "object_content_type": await get_contenttype_for_model(Story),
+            "object_id__in": story_ids,
+        }
+    )
+    return await stories_repositories.delete_stories(filters={"id__in": story_ids})
+
+
 ##########################################################
 # misc
 ##########################################################
@@ -339,22 +429,60 @@ async def delete_project(project: Project, deleted_by: User) -> bool:
 async def get_logo(
     project: Project, format: ImageSizeFormat
 ) -> FieldFile | ThumbnailFile | None:
+    """
+    Return the logo of the project in some format. While its thumbnails are not generated yet (by a background job),
+    the original logo is returned instead.
+    """
     match format:
         case "small":
-            return await get_thumbnail(
+            thumbnail = await get_thumbnail(
                 project.logo, settings.IMAGES.THUMBNAIL_FORMAT_SMALL
             )
         case "large":
-            return await get_thumbnail(
+            thumbnail = await get_thumbnail(
                 project.logo, settings.IMAGES.THUMBNAIL_FORMAT_LARGE
             )
         case "original":
             return project.logo
 
+    if thumbnail is None:
+        await _defer_generate_logo_thumbnails(project)
+        return project.logo
+    return thumbnail
+
 
 async def get_logo_url(project: Project, format: ImageSizeFormat) -> str | None:
+    """
+    Return the absolute url of the logo of the project in some format, or of the original logo while its thumbnails
+    are not generated yet (see `get_logo`).
+    """
     if project.logo:
         thumbnail = await get_logo(project, format)
         if thumbnail:
             return get_absolute_url(thumbnail.url)
     return None
+
+
+async def generate_logo_thumbnails(project_id: UUID) -> None:
+    try:
+        project = await projects_repositories.get_project(
+            project_id=project_id, select_related=[None]
+        )
+    except Project.DoesNotExist:
+        return
+
+    if project.logo:
+        await generate_thumbnails(project.logo)
+
+
+async def _defer_generate_logo_thumbnails(project: Project) -> None:
+    async def _defer() -> None:
+        # a single pending job per project
+        try:
+            await projects_tasks.generate_logo_thumbnails.configure(
+                queueing_lock=f"generate_logo_thumbnails:{project.id}"
+            ).defer_async(project_id=project.b64id)
+        except AlreadyEnqueued:
+            pass
+
+    await transaction_on_commit_async(_defer)()
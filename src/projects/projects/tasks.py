@@ -24,6 +24,7 @@ from django.core.files.storage import FileSystemStorage
 from procrastinate.contrib.django import app
 from storages.backends.s3 import S3Storage
 
+from base.utils.uuid import decode_b64str_to_uuid
 from projects.projects.models import Project
 
 
@@ -42,3 +43,21 @@ async def delete_old_logo(file_name: str) -> None:
         raise ValueError(
             "Deletion is only supported for S3Storage and FileSystemStorage"
         )
+
+
+@app.task
+async def generate_logo_thumbnails(project_id: str) -> None:
+    from projects.projects import services as projects_services
+
+    await projects_services.generate_logo_thumbnails(
+        project_id=decode_b64str_to_uuid(project_id)
+    )
+
+
+@app.task
+async def delete_project(project_id: str) -> None:
+    from projects.projects import services as projects_services
+
+    await projects_services.do_delete_project(
+        project_id=decode_b64str_to_uuid(project_id)
+    )
@@ -16,44 +16,96 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 # You can contact BIRU at ask@biru.sh
+
+"""
+Project references (the `#<ref>` of the stories) are allocated from a single counters table, one row per project.
+
+Each process reserves blocks of `PROJECT_REFERENCES_BLOCK_SIZE` references at once (a single upsert statement) and hands
+them out from memory, so most items are created without any query to get their reference. References are unique per
+project but, since blocks may be left unused when a process stops, they may have gaps.
+"""
+
+import threading
+from contextlib import closing
 from typing import Generator
 from uuid import UUID
 
-from base.db import exceptions as ex
-from base.db import sequences as seq
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+# project_id -> (next_ref, last_ref) of the block reserved by this process
+_blocks: dict[UUID, tuple[int, int]] = {}
+_blocks_lock = threading.Lock()
 
 
-def get_project_references_seqname(id: UUID) -> str:
-    return f"project_references_{id.hex}"
+def _take_from_block(project_id: UUID, quantity: int) -> list[int]:
+    with _blocks_lock:
+        next_ref, last_ref = _blocks.pop(project_id, (1, 0))
+        refs = list(range(next_ref, min(next_ref + quantity - 1, last_ref) + 1))
+        if next_ref + len(refs) <= last_ref:
+            _blocks[project_id] = (next_ref + len(refs), last_ref)
+    return refs
 
 
-def create_project_references_sequence(project_id: UUID) -> None:
-    seqname = get_project_references_seqname(project_id)
-    seq.create(seqname)
+def _reserve(project_id: UUID, quantity: int) -> list[int]:
+    from projects.references.models import ProjectReferencesCounter
+
+    # inside a transaction the reservation may be rolled back, so no reference can be kept for later
+    block_size = (
+        quantity
+        if connection.in_atomic_block
+        else max(quantity, settings.PROJECT_REFERENCES_BLOCK_SIZE)
+    )
+    table = ProjectReferencesCounter._meta.db_table
+    sql = f"""
+    INSERT INTO {table} (project_id, last_ref) VALUES (%s, %s)
+    ON CONFLICT (project_id) DO UPDATE SET last_ref = {table}.last_ref + EXCLUDED.last_ref
+    RETURNING last_ref;
+    """
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, [project_id, block_size])
+        last_ref = cursor.fetchone()[0]
+
+    first_ref = last_ref - block_size + 1
+    if block_size > quantity:
+        with _blocks_lock:
+            _blocks[project_id] = (first_ref + quantity, last_ref)
+    return list(range(first_ref, first_ref + quantity))
 
 
 def get_new_project_reference_id(project_id: UUID) -> int:
-    seqname = get_project_references_seqname(project_id)
-    try:
-        return seq.next_value(seqname)
-    except ex.SequenceDoesNotExist:
-        seq.create(seqname)
-        return seq.next_value(seqname)
+    return next(get_multiple_new_project_reference_ids(project_id, 1))
 
 
 def get_multiple_new_project_reference_ids(
     project_id: UUID, quantity: int
 ) -> Generator[int]:
-    seqname = get_project_references_seqname(project_id)
-    try:
-        return seq.next_values(seqname, quantity)
-    except ex.SequenceDoesNotExist:
-        seq.create(seqname)
-        return seq.next_values(seqname, quantity)
-
-
-def delete_project_references_sequences(project_ids: list[UUID]) -> None:
-    seqnames = [
-        get_project_references_seqname(project_id) for project_id in project_ids
-    ]
-    seq.delete(seqnames)
+    refs = _take_from_block(project_id, quantity)
+    if len(refs) < quantity:
+        refs += _reserve(project_id, quantity - len(refs))
+    return (ref for ref in refs)
+
+
+async def aget_new_project_reference_id(project_id: UUID) -> int:
+    return next(await aget_multiple_new_project_reference_ids(project_id, 1))
+
+
+async def aget_multiple_new_project_reference_ids(
+    project_id: UUID, quantity: int
+) -> Generator[int]:
+    # the database (and so a thread) is only reached when the block of this process is exhausted
+    refs = _take_from_block(project_id, quantity)
+    if len(refs) < quantity:
+        refs += await sync_to_async(_reserve)(project_id, quantity - len(refs))
+    return (ref for ref in refs)
+
+
+def forget_project_references(project_ids: list[UUID]) -> None:
+    """
+    Drop the blocks reserved by this process for the given (deleted) projects; their counters are deleted along with
+    the projects.
+    """
+    with _blocks_lock:
+        for project_id in project_ids:
+            _blocks.pop(project_id, None)
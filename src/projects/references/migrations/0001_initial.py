@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+# Generated by Django 6.0.6 on 2026-10-18 11:40
+
+from contextlib import closing
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def _seqname(project_id) -> str:
+    return f"project_references_{project_id.hex}"
+
+
+def sequences_to_counters(apps, schema_editor):
+    """
+    Carry the last value of the per-project sequences over to the counters table, then drop the sequences.
+    """
+    Project = apps.get_model("projects", "Project")
+    Story = apps.get_model("stories", "Story")
+    ProjectReferencesCounter = apps.get_model(
+        "projects_references", "ProjectReferencesCounter"
+    )
+    connection = schema_editor.connection
+
+    max_refs = dict(
+        Story.objects.values("project_id")
+        .annotate(max_ref=Max("ref"))
+        .values_list("project_id", "max_ref")
+    )
+    counters = []
+    seqnames = []
+    with closing(connection.cursor()) as cursor:
+        cursor.execute("SELECT relname FROM pg_class WHERE relkind = 'S'")
+        existing_seqnames = {row[0] for row in cursor.fetchall()}
+
+        for project_id in Project.objects.values_list("id", flat=True):
+            last_ref = max_refs.get(project_id) or 0
+            seqname = _seqname(project_id)
+            if seqname in existing_seqnames:
+                cursor.execute(f"SELECT last_value, is_called FROM {seqname}")
+                last_value, is_called = cursor.fetchone()
+                last_ref = max(last_ref, last_value if is_called else last_value - 1)
+                seqnames.append(seqname)
+            if last_ref:
+                counters.append(
+                    ProjectReferencesCounter(project_id=project_id, last_ref=last_ref)
+                )
+
+        ProjectReferencesCounter.objects.bulk_create(counters, batch_size=1000)
+        for i in range(0, len(seqnames), 1000):
+            cursor.execute(
+                "DROP SEQUENCE IF EXISTS {}".format(", ".join(seqnames[i : i + 1000]))
+            )
+
+
+def counters_to_sequences(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    ProjectReferencesCounter = apps.get_model(
+        "projects_references", "ProjectReferencesCounter"
+    )
+    last_refs = dict(
+        ProjectReferencesCounter.objects.values_list("project_id", "last_ref")
+    )
+    with closing(schema_editor.connection.cursor()) as cursor:
+        for project_id in Project.objects.values_list("id", flat=True):
+            cursor.execute(
+                "CREATE SEQUENCE IF NOT EXISTS {} START %s".format(
+                    _seqname(project_id)
+                ),
+                [last_refs.get(project_id, 0) + 1],
+            )
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("projects", "0011_project_deleted_at_project_deleted_by"),
+        ("stories", "0007_story_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectReferencesCounter",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="references_counter",
+                        serialize=False,
+                        to="projects.project",
+                        verbose_name="project",
+                    ),
+                ),
+                (
+                    "last_ref",
+                    models.BigIntegerField(default=0, verbose_name="last reference"),
+                ),
+            ],
+            options={
+                "verbose_name": "project references counter",
+                "verbose_name_plural": "project references counters",
+            },
+        ),
+        migrations.RunPython(sequences_to_counters, counters_to_sequences),
+    ]
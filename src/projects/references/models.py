@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+from django.db import models
+
+
+class ProjectReferencesCounter(models.Model):
+    """
+    Last reference reserved for the items of a project (stories...). References are reserved by blocks, see
+    `projects.references.get_multiple_new_project_reference_ids`.
+    """
+
+    project = models.OneToOneField(
+        "projects.Project",
+        primary_key=True,
+        null=False,
+        blank=False,
+        on_delete=models.CASCADE,
+        related_name="references_counter",
+        verbose_name="project",
+    )
+    last_ref = models.BigIntegerField(
+        null=False, blank=False, default=0, verbose_name="last reference"
+    )
+
+    class Meta:
+        verbose_name = "project references counter"
+        verbose_name_plural = "project references counters"
+
+    def __str__(self) -> str:
+        return f"{self.project_id}: {self.last_ref}"
+
+    def __repr__(self) -> str:
+        return f"<ProjectReferencesCounter {self.project_id} {self.last_ref}>"
@@ -20,19 +20,20 @@
 from uuid import UUID
 
 from django.conf import settings
-from django.http import FileResponse, HttpRequest
-from ninja import File, Path, Router, Status, UploadedFile
+from django.http import HttpRequest, HttpResponse
+from ninja import Path, Router, Status
 
 from attachments import services as attachments_services
 from attachments.models import Attachment
+from base.api import file_response, zip_response
 from base.serializers import BaseDataSchema
-from base.utils.files import iterfile
 from commons.exceptions import api as ex
 from commons.exceptions.api.errors import (
     ERROR_RESPONSE_403,
     ERROR_RESPONSE_404,
     ERROR_RESPONSE_422,
 )
+from commons.storage.uploadhandler import receive_uploaded_files
 from commons.validators import B64UUID
 from permissions import check_permissions
 from stories.attachments import services as services
@@ -60,12 +61,26 @@ attachments_router = Router()
         422: ERROR_RESPONSE_422,
     },
     by_alias=True,
+    # the file is not a parameter of the view: it's received once the request is authorized
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"],
+                    }
+                }
+            },
+            "required": True,
+        }
+    },
 )
 async def create_story_attachments(
     request,
     project_id: Path[B64UUID],
     ref: Path[int],
-    file: File[(UploadedFile, {"max_length": settings.MAX_UPLOAD_FILE_SIZE})],
 ) -> Attachment:
     """
     Create an attachment associated to a story
@@ -74,6 +89,16 @@ async def create_story_attachments(
     await check_permissions(
         permissions=StoryPermissionsCheck.MODIFY.value, user=request.user, obj=story
     )
+    files = await receive_uploaded_files(
+        request, max_size=settings.MAX_UPLOAD_FILE_SIZE
+    )
+    if "file" not in files:
+        raise ex.ValidationError("The file is required")
+    file = files["file"]
+    if file.size > settings.MAX_UPLOAD_FILE_SIZE:
+        raise ex.ValidationError(
+            f"The file is too large (maximum {settings.MAX_UPLOAD_FILE_SIZE} bytes)"
+        )
 
     return await services.create_attachment(
         file=file,
@@ -177,9 +202,9 @@ async def get_story_attachment_file(
     request,
     attachment_id: Path[B64UUID],
     is_view: bool = False,
-) -> FileResponse:
+) -> HttpResponse:
     """
-    Download a story attachment file
+    Download a story attachment file (supporting range and conditional requests)
     """
     attachment = await get_story_attachment_or_404(attachment_id=attachment_id)
     await check_permissions(
@@ -188,15 +213,60 @@ async def get_story_attachment_file(
         obj=attachment.content_object,
     )
 
-    file = attachment.storaged_object.file
-
-    response = FileResponse(
-        iterfile(file, mode="rb"),
+    storaged_object = attachment.storaged_object
+    return await file_response(
+        request,
+        storaged_object.file,
         content_type=attachment.content_type,
-        as_attachment=not is_view,
         filename=attachment.name,
+        as_attachment=not is_view,
+        etag=storaged_object.sha256 or storaged_object.b64id,
+    )
+
+
+##########################################################
+# download story attachments files (zip)
+##########################################################
+
+
+@attachments_router.get(
+    "/projects/{project_id}/stories/{int:ref}/attachments.zip",
+    url_name="project.story.attachments.zip",
+    summary="Download all the story attachments files in a zip archive",
+    response={
+        # FileResponse is not supported by django ninja swagger generation
+        # As presented in the documentation, type the result as str
+        # https://django-ninja.dev/guides/response/#filefield-and-imagefield
+        200: str,
+        403: ERROR_RESPONSE_403,
+        404: ERROR_RESPONSE_404,
+        422: ERROR_RESPONSE_422,
+    },
+    by_alias=True,
+)
+async def get_story_attachments_zip(
+    request,
+    project_id: Path[B64UUID],
+    ref: Path[int],
+) -> HttpResponse:
+    """
+    Download all the story attachments files in a zip archive (streamed while it's built)
+    """
+    story = await get_story_or_404(project_id=project_id, ref=ref)
+    await check_permissions(
+        permissions=StoryPermissionsCheck.VIEW.value, user=request.user, obj=story
+    )
+    attachments = await attachments_services.list_attachments(
+        content_object=story,
+    )
+
+    return zip_response(
+        [
+            (attachment.name, attachment.storaged_object.file, attachment.created_at)
+            for attachment in attachments
+        ],
+        filename=f"{story.ref}-attachments.zip",
     )
-    return response
 
 
 ################################################
@@ -215,5 +285,7 @@ async def get_story_attachment_or_404(
         raise ex.NotFoundError(f"Attachment {attachment_id} does not exist") from e
     if not isinstance(attachment.content_object, Story):
         raise ex.NotFoundError(f"Attachment {attachment_id} is not a story attachment")
+    if attachment.content_object.project.deleted_at:
+        raise ex.NotFoundError(f"Attachment {attachment_id} does not exist")
 
     return attachment
@@ -27,16 +27,21 @@ from stories.stories.events.content import (
 )
 from stories.stories.serializers import ReorderStoriesSerializer, StoryDetailSerializer
 from users.models import AnyUser
+from workflows import repositories as workflows_repositories
 
 CREATE_STORY = "stories.create"
 UPDATE_STORY = "stories.update"
 REORDER_STORIES = "stories.reorder"
 DELETE_STORY = "stories.delete"
 
+# stories attributes that change the stories count of the workflow statuses
+_STORIES_COUNT_ATTRS = {"status", "workflow"}
+
 
 async def emit_event_when_story_is_created(
     project: Project, story: StoryDetailSerializer
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=CREATE_STORY,
@@ -47,6 +52,8 @@ async def emit_event_when_story_is_created(
 async def emit_event_when_story_is_updated(
     project: Project, story: StoryDetailSerializer, updates_attrs: list[str]
 ) -> None:
+    if not _STORIES_COUNT_ATTRS.isdisjoint(updates_attrs):
+        await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=UPDATE_STORY,
@@ -60,6 +67,7 @@ async def emit_event_when_story_is_updated(
 async def emit_when_stories_are_reordered(
     project: Project, reorder: ReorderStoriesSerializer
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=REORDER_STORIES,
@@ -70,6 +78,7 @@ async def emit_when_stories_are_reordered(
 async def emit_event_when_story_is_deleted(
     project: Project, ref: int, deleted_by: AnyUser
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=DELETE_STORY,
@@ -21,7 +21,6 @@ from decimal import Decimal
 from typing import Any, Final, Literal, TypedDict
 from uuid import UUID
 
-from asgiref.sync import sync_to_async
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.contrib.postgres.fields import ArrayField
 from django.db.models import OuterRef, Q, QuerySet, Subquery, UUIDField, Value
@@ -30,7 +29,10 @@ from django.db.models.functions import Coalesce
 from base.occ import repositories as occ_repositories
 from base.repositories import neighbors as neighbors_repositories
 from base.repositories.neighbors import Neighbor
-from projects.references import get_multiple_new_project_reference_ids
+from projects.references import (
+    aget_multiple_new_project_reference_ids,
+    aget_new_project_reference_id,
+)
 from stories.stories.models import Story
 from stories.tags.models import StoryTagAssignment
 
@@ -59,12 +61,15 @@ TAG_IDS_ANNOTATION = Coalesce(
 
 
 class StoryFilters(TypedDict, total=False):
+    id__in: list[UUID]
     project_id: UUID
     workflow_id: UUID
     workflow__slug: str
     status_id: UUID
+    status_id__in: list[UUID]
     order__gt: int
     ref__in: list[int]
+    project__deleted_at__isnull: bool
 
 
 StorySelectRelated = list[
@@ -105,6 +110,7 @@ async def create_story(
     description: str | None = None,
 ) -> Story:
     return await Story.objects.acreate(
+        ref=await aget_new_project_reference_id(project_id),
         title=title,
         description=description,
         project_id=project_id,
@@ -116,9 +122,7 @@ async def create_story(
 
 
 async def bulk_create_stories(project_id: UUID, stories: list[Story]) -> list[Story]:
-    refs = await sync_to_async(get_multiple_new_project_reference_ids)(
-        project_id, len(stories)
-    )
+    refs = await aget_multiple_new_project_reference_ids(project_id, len(stories))
     for story in stories:
         story.ref = next(refs)
     return await Story.objects.abulk_create(stories)
@@ -219,6 +223,12 @@ async def delete_story(story_id: UUID) -> int:
     return count
 
 
+async def delete_stories(filters: StoryFilters = {}) -> int:
+    qs = Story.objects.all().filter(**filters)
+    _, deleted = await qs.adelete()
+    return deleted.get(Story._meta.label, 0)
+
+
 ##########################################################
 # misc
 ##########################################################
@@ -258,8 +268,19 @@ async def list_stories_to_reorder(
 
 
 async def bulk_update_workflow_to_stories(
-    statuses_ids: list[UUID], old_workflow_id: UUID, new_workflow_id: UUID
-) -> None:
-    await Story.objects.filter(
-        status_id__in=statuses_ids, workflow_id=old_workflow_id
-    ).aupdate(workflow_id=new_workflow_id)
+    old_workflow_id: UUID,
+    new_workflow_id: UUID,
+    statuses_ids: list[UUID] | None = None,
+    limit: int | None = None,
+) -> int:
+    """
+    Move the stories of a workflow (only the ones of the given statuses, if any) to another workflow.
+    When a limit is provided, only a chunk of the stories is updated so the statement stays short;
+    call it again until it returns 0 to move all the stories.
+    """
+    qs = Story.objects.filter(workflow_id=old_workflow_id)
+    if statuses_ids is not None:
+        qs = qs.filter(status_id__in=statuses_ids)
+    if limit is not None:
+        qs = Story.objects.filter(id__in=qs.order_by().values("id")[:limit])
+    return await qs.aupdate(workflow_id=new_workflow_id)
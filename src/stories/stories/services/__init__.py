@@ -26,6 +26,7 @@ from base.repositories.neighbors import Neighbor
 from comments import services as comments_services
 from commons.ordering import DEFAULT_ORDER_OFFSET, calculate_offset
 from ninja_jwt.utils import aware_utcnow
+from notifications import services as notifications_services
 from projects.projects.models import Project
 from stories.stories import events as stories_events
 from stories.stories import notifications as stories_notifications
@@ -131,7 +132,7 @@ async def list_stories_for_workflow(
 async def get_story(project_id: UUID, ref: int, get_assignees=False) -> Story:
     return await stories_repositories.get_story(
         ref=ref,
-        filters={"project_id": project_id},
+        filters={"project_id": project_id, "project__deleted_at__isnull": True},
         select_related=["project", "project__workspace", "workflow", "created_by"],
         get_assignees=get_assignees,
     )
@@ -145,7 +146,7 @@ async def get_story_detail(
 ) -> StoryDetailSerializer:
     story = await stories_repositories.get_story(
         ref=ref,
-        filters={"project_id": project_id},
+        filters={"project_id": project_id, "project__deleted_at__isnull": True},
         select_related=[
             "created_by",
             "project",
@@ -469,13 +470,14 @@ async def reorder_stories(
         project=project, reorder=reorder_story_serializer
     )
 
-    # notifications
-    for story in stories_with_changed_status:
-        await stories_notifications.notify_when_story_status_change(
-            story=story,
-            status=story.status.name,
-            emitted_by=reordered_by,
-        )
+    # notifications (created together by a single task)
+    async with notifications_services.notifications_batch():
+        for story in stories_with_changed_status:
+            await stories_notifications.notify_when_story_status_change(
+                story=story,
+                status=story.status.name,
+                emitted_by=reordered_by,
+            )
 
 
 async def _calculate_next_order(status_id: UUID) -> int:
@@ -17,6 +17,8 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+from unittest.mock import patch
+
 import pytest
 from asgiref.sync import sync_to_async
 from django.contrib.contenttypes.models import ContentType
@@ -24,6 +26,7 @@ from django.contrib.contenttypes.models import ContentType
 from attachments import repositories
 from attachments.models import Attachment
 from base.db.models import get_contenttype_for_model
+from commons.storage import repositories as storage_repositories
 from commons.storage.models import StoragedObject
 from stories.stories.models import Story
 from tests.utils import factories as f
@@ -82,7 +85,9 @@ async def test_bulk_create_attachment(project_template):
     assert all(attachment.name == file.name for attachment in attachments)
     assert all(attachment.content_type == "image/png" for attachment in attachments)
     assert all(attachment.size == 145 for attachment in attachments)
-    assert await StoragedObject.objects.acount() == 2
+    # the same content is stored once
+    assert await StoragedObject.objects.acount() == 1
+    assert attachments[0].storaged_object_id == attachments[1].storaged_object_id
 
 
 ##########################################################
@@ -209,3 +214,73 @@ async def test_delete_attachments():
         )
         == 2
     )
+
+
+async def test_bulk_delete_attachments():
+    story1 = await f.create_story()
+    story2 = await f.create_story()
+    story3 = await f.create_story()
+    attachment1 = await f.create_attachment(content_object=story1)
+    attachment2 = await f.create_attachment(content_object=story2)
+    attachment3 = await f.create_attachment(content_object=story3)
+
+    assert (
+        await repositories.bulk_delete_attachments(
+            filters={
+                "object_content_type": await get_contenttype_for_model(Story),
+                "object_id__in": [story1.id, story2.id],
+            }
+        )
+        == 2
+    )
+    assert [a.id async for a in Attachment.objects.all()] == [attachment3.id]
+    assert {
+        so.id async for so in StoragedObject.objects.filter(deleted_at__isnull=False)
+    } == {attachment1.storaged_object_id, attachment2.storaged_object_id}
+
+
+async def test_bulk_delete_attachments_locks_the_storaged_objects():
+    story = await f.create_story()
+    attachment1 = await f.create_attachment(content_object=story)
+    attachment2 = await f.create_attachment(content_object=story)
+
+    with patch(
+        "attachments.repositories.storage_repositories.lock_storaged_objects",
+        wraps=storage_repositories.lock_storaged_objects,
+    ) as fake_lock_storaged_objects:
+        await repositories.bulk_delete_attachments(
+            filters={
+                "object_content_type": await get_contenttype_for_model(Story),
+                "object_id__in": [story.id],
+            }
+        )
+
+    fake_lock_storaged_objects.assert_called_once_with(
+        {attachment1.storaged_object_id, attachment2.storaged_object_id}
+    )
+
+
+async def test_bulk_delete_attachments_with_shared_storaged_object():
+    story1 = await f.create_story()
+    story2 = await f.create_story()
+    storaged_object = await f.create_storaged_object()
+    await f.create_attachment(content_object=story1, storaged_object=storaged_object)
+    await f.create_attachment(content_object=story2, storaged_object=storaged_object)
+
+    await repositories.bulk_delete_attachments(
+        filters={
+            "object_content_type": await get_contenttype_for_model(Story),
+            "object_id__in": [story1.id],
+        }
+    )
+    await storaged_object.arefresh_from_db()
+    assert storaged_object.deleted_at is None
+
+    await repositories.bulk_delete_attachments(
+        filters={
+            "object_content_type": await get_contenttype_for_model(Story),
+            "object_id__in": [story2.id],
+        }
+    )
+    await storaged_object.arefresh_from_db()
+    assert storaged_object.deleted_at
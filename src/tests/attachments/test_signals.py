@@ -17,11 +17,14 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+from unittest.mock import patch
+
 import pytest
 
 from attachments import repositories as attachments_repositories
 from attachments.models import Attachment
 from attachments.signals import mark_attachment_file_to_delete
+from commons.storage import repositories as storage_repositories
 from tests.utils import factories as f
 from tests.utils import signals as signals_utils
 from workspaces.workspaces import repositories as workspaces_repositories
@@ -83,3 +86,35 @@ async def test_mark_attachment_file_to_delete_when_delete_n_level_related_object
     assert storaged_object11.deleted_at
     assert storaged_object12.deleted_at
     assert storaged_object21.deleted_at
+
+
+async def test_mark_attachment_file_to_delete_when_shared_with_another_attachment():
+    story = await f.create_story()
+    storaged_object = await f.create_storaged_object()
+    attachment1 = await f.create_attachment(
+        content_object=story, storaged_object=storaged_object
+    )
+    attachment2 = await f.create_attachment(
+        content_object=story, storaged_object=storaged_object
+    )
+
+    await attachments_repositories.delete_attachments(filters={"id": attachment1.id})
+    await storaged_object.arefresh_from_db()
+    assert storaged_object.deleted_at is None
+
+    await attachments_repositories.delete_attachments(filters={"id": attachment2.id})
+    await storaged_object.arefresh_from_db()
+    assert storaged_object.deleted_at
+
+
+async def test_mark_attachment_file_to_delete_locks_the_storaged_object():
+    story = await f.create_story()
+    attachment = await f.create_attachment(content_object=story)
+
+    with patch(
+        "attachments.signals.storage_repositories.lock_storaged_objects",
+        wraps=storage_repositories.lock_storaged_objects,
+    ) as fake_lock_storaged_objects:
+        await attachments_repositories.delete_attachments(filters={"id": attachment.id})
+
+    fake_lock_storaged_objects.assert_called_once_with([attachment.storaged_object_id])
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import zipfile
+from datetime import datetime
+from io import BytesIO
+from unittest.mock import Mock
+
+import pytest
+from django.conf import settings
+from django.core.files import File
+from django.test import RequestFactory
+
+from base.api.files import file_response, parse_range_header, zip_response
+from configurations.conf.storage import DownloadModes, StorageBackends
+
+CONTENT = bytes(range(256)) * 4  # 1024 bytes
+
+
+def _build_file() -> File:
+    return File(BytesIO(CONTENT), name="test.bin")
+
+
+async def _read(response) -> bytes:
+    return b"".join([chunk async for chunk in response.streaming_content])
+
+
+##########################################################
+# parse_range_header
+##########################################################
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", [(0, 99)]),
+        ("bytes=100-", [(100, 1023)]),
+        ("bytes=-100", [(924, 1023)]),
+        ("bytes=-2000", [(0, 1023)]),
+        ("bytes=1000-2000", [(1000, 1023)]),
+        ("bytes=0-0, 10-19", [(0, 0), (10, 19)]),
+        ("bytes=0-99, 50-149", [(0, 149)]),
+        ("bytes=10-19, 0-9", [(0, 19)]),
+        ("bytes=500-599, -1000, 0-9", [(0, 9), (24, 1023)]),
+        ("bytes=500-599, 0-9", [(0, 9), (500, 599)]),
+        ("bytes=" + ",".join(["0-1023"] * 16), [(0, 1023)]),
+        ("bytes=2000-", []),
+        ("bytes=2000-, 0-9", [(0, 9)]),
+        ("bytes=10-5", None),
+        ("bytes=a-b", None),
+        ("bytes=-", None),
+        ("items=0-9", None),
+        ("bytes=" + ",".join(["0-1"] * 17), None),
+    ],
+)
+def test_parse_range_header(header, expected):
+    assert parse_range_header(header, 1024) == expected
+
+
+##########################################################
+# file_response
+##########################################################
+
+
+async def test_file_response_whole_file():
+    request = RequestFactory().get("/")
+
+    response = await file_response(
+        request, _build_file(), content_type="application/zip", filename="a.zip"
+    )
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/zip"
+    assert response["Content-Length"] == "1024"
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["Content-Disposition"] == 'attachment; filename="a.zip"'
+    assert await _read(response) == CONTENT
+
+
+async def test_file_response_by_chunks(monkeypatch):
+    monkeypatch.setattr(settings.STORAGE, "DOWNLOAD_CHUNK_SIZE", 100)
+    request = RequestFactory().get("/")
+
+    response = await file_response(request, _build_file())
+
+    chunks = [chunk async for chunk in response.streaming_content]
+    assert [len(chunk) for chunk in chunks] == [100] * 10 + [24]
+
+
+async def test_file_response_single_range():
+    request = RequestFactory().get("/", headers={"Range": "bytes=10-19"})
+
+    response = await file_response(request, _build_file())
+
+    assert response.status_code == 206
+    assert response["Content-Range"] == "bytes 10-19/1024"
+    assert response["Content-Length"] == "10"
+    assert await _read(response) == CONTENT[10:20]
+
+
+async def test_file_response_multiple_ranges():
+    request = RequestFactory().get("/", headers={"Range": "bytes=0-4, -5"})
+
+    response = await file_response(request, _build_file(), content_type="text/plain")
+
+    assert response.status_code == 206
+    assert response["Content-Type"].startswith("multipart/byteranges; boundary=")
+    boundary = response["Content-Type"].split("boundary=")[1]
+    body = await _read(response)
+    assert int(response["Content-Length"]) == len(body)
+    assert (
+        body
+        == (
+            f"--{boundary}\r\n"
+            "Content-Type: text/plain\r\n"
+            "Content-Range: bytes 0-4/1024\r\n\r\n"
+        ).encode()
+        + CONTENT[:5]
+        + (
+            f"\r\n--{boundary}\r\n"
+            "Content-Type: text/plain\r\n"
+            "Content-Range: bytes 1019-1023/1024\r\n\r\n"
+        ).encode()
+        + CONTENT[-5:]
+        + f"\r\n--{boundary}--\r\n".encode()
+    )
+
+
+async def test_file_response_range_not_satisfiable():
+    request = RequestFactory().get("/", headers={"Range": "bytes=2000-"})
+
+    response = await file_response(request, _build_file())
+
+    assert response.status_code == 416
+    assert response["Content-Range"] == "bytes */1024"
+
+
+async def test_file_response_if_none_match():
+    request = RequestFactory().get("/", headers={"If-None-Match": 'W/"hash", "other"'})
+
+    response = await file_response(request, _build_file(), etag="hash")
+
+    assert response.status_code == 304
+    assert response["ETag"] == '"hash"'
+
+    request = RequestFactory().get("/", headers={"If-None-Match": '"other"'})
+    response = await file_response(request, _build_file(), etag="hash")
+
+    assert response.status_code == 200
+    assert response["ETag"] == '"hash"'
+
+
+async def test_file_response_if_range():
+    request = RequestFactory().get(
+        "/", headers={"Range": "bytes=0-9", "If-Range": '"hash"'}
+    )
+    response = await file_response(request, _build_file(), etag="hash")
+    assert response.status_code == 206
+
+    # the file has changed: the whole file is sent
+    request = RequestFactory().get(
+        "/", headers={"Range": "bytes=0-9", "If-Range": '"old-hash"'}
+    )
+    response = await file_response(request, _build_file(), etag="hash")
+    assert response.status_code == 200
+    assert await _read(response) == CONTENT
+
+
+async def test_file_response_redirect_to_presigned_url(monkeypatch):
+    monkeypatch.setattr(settings.STORAGE, "BACKEND_CLASS", StorageBackends.S3Storage)
+    monkeypatch.setattr(settings.STORAGE, "DOWNLOAD_MODE", DownloadModes.REDIRECT)
+    monkeypatch.setattr(settings.STORAGE, "PRESIGNED_URL_EXPIRATION_SECONDS", 30)
+    file = Mock(storage=Mock(), size=1024)
+    file.name = "storagedobjects/a/b/c/d/efg/a.zip"
+    file.storage.url.return_value = "https://s3.example.com/a.zip?signature=xyz"
+    request = RequestFactory().get("/")
+
+    response = await file_response(
+        request, file, content_type="application/zip", filename="a.zip", etag="hash"
+    )
+
+    assert response.status_code == 302
+    assert response["Location"] == "https://s3.example.com/a.zip?signature=xyz"
+    assert response["Cache-Control"] == "private, max-age=30"
+    assert response["ETag"] == '"hash"'
+    file.storage.url.assert_called_once_with(
+        file.name,
+        parameters={
+            "ResponseContentType": "application/zip",
+            "ResponseContentDisposition": 'attachment; filename="a.zip"',
+        },
+        expire=30,
+    )
+
+
+async def test_file_response_stream_with_filesystem_storage(monkeypatch):
+    monkeypatch.setattr(
+        settings.STORAGE, "BACKEND_CLASS", StorageBackends.FileSystemStorage
+    )
+    monkeypatch.setattr(settings.STORAGE, "DOWNLOAD_MODE", DownloadModes.REDIRECT)
+    file = _build_file()
+    file.storage = Mock()
+    request = RequestFactory().get("/")
+
+    response = await file_response(request, file)
+
+    assert response.status_code == 200
+    file.storage.url.assert_not_called()
+
+
+##########################################################
+# zip_response
+##########################################################
+
+
+async def test_zip_response():
+    modified_at = datetime(2026, 1, 2, 3, 4, 5)
+    entries = [
+        ("test.bin", _build_file(), modified_at),
+        ("test.bin", File(BytesIO(b""), name="empty.bin"), modified_at),
+        ("../folder/other.bin", _build_file(), modified_at),
+    ]
+
+    response = zip_response(entries, filename="files.zip")
+
+    assert response["Content-Type"] == "application/zip"
+    assert response["Content-Disposition"] == 'attachment; filename="files.zip"'
+    archive = zipfile.ZipFile(BytesIO(await _read(response)))
+    assert archive.testzip() is None
+    assert [
+        (info.filename, info.file_size, info.compress_type, info.date_time)
+        for info in archive.infolist()
+    ] == [
+        ("test.bin", len(CONTENT), zipfile.ZIP_STORED, (2026, 1, 2, 3, 4, 4)),
+        ("test (1).bin", 0, zipfile.ZIP_STORED, (2026, 1, 2, 3, 4, 4)),
+        (
+            ".._folder_other.bin",
+            len(CONTENT),
+            zipfile.ZIP_STORED,
+            (2026, 1, 2, 3, 4, 4),
+        ),
+    ]
+    assert archive.read("test.bin") == CONTENT
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from base.api import CursorPaginationQuery, encode_cursor
+from ninja_jwt.utils import aware_utcnow
+
+##########################################################
+# CursorPaginationQuery
+##########################################################
+
+
+def test_cursor_pagination_query_after():
+    created_at, id = aware_utcnow(), uuid4()
+
+    query = CursorPaginationQuery(after=encode_cursor(created_at, id))
+    assert query.after == (created_at, id)
+
+
+@pytest.mark.parametrize(
+    "after", ["invalid", encode_cursor(aware_utcnow(), uuid4())[:-4]]
+)
+def test_cursor_pagination_query_invalid_after(after):
+    with pytest.raises(ValidationError):
+        CursorPaginationQuery(after=after)
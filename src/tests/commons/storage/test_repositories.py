@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import sync_to_async
+
+from commons.storage import repositories
+from commons.storage.models import StoragedObject
+from ninja_jwt.utils import aware_utcnow
+from tests.utils import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+#############################################################
+# create_storaged_objects
+#############################################################
+
+
+async def test_create_storaged_object():
+    file = f.build_image_file(name="test")
+
+    storaged_object = await repositories.create_storaged_object(
+        file=file,
+    )
+
+    assert storaged_object.id
+    assert await StoragedObject.objects.filter(id=storaged_object.id).aexists()
+
+
+async def test_bulk_create_storaged_objects():
+    file = f.build_image_file(name="test")
+
+    storaged_objects = [
+        StoragedObject(
+            file=file,
+        )
+    ]
+
+    await repositories.bulk_create_storaged_objects(storaged_objects)
+    assert all(storaged_object.pk for storaged_object in storaged_objects)
+
+
+async def test_create_storaged_object_with_same_content():
+    storaged_object1 = await repositories.create_storaged_object(
+        file=f.build_image_file(name="test1")
+    )
+    storaged_object2 = await repositories.create_storaged_object(
+        file=f.build_image_file(name="test2")
+    )
+    storaged_object3 = await repositories.create_storaged_object(
+        file=f.build_image_file(name="test3", format="gif")
+    )
+
+    assert storaged_object1.sha256
+    assert storaged_object2.id == storaged_object1.id
+    assert storaged_object3.id != storaged_object1.id
+    assert await StoragedObject.objects.acount() == 2
+
+
+async def test_create_storaged_object_restores_deleted_one_with_same_content():
+    storaged_object1 = await repositories.create_storaged_object(
+        file=f.build_image_file(name="test1")
+    )
+    await sync_to_async(repositories.mark_storaged_object_as_deleted)(
+        storaged_object=storaged_object1
+    )
+
+    storaged_object2 = await repositories.create_storaged_object(
+        file=f.build_image_file(name="test2")
+    )
+
+    assert storaged_object2.id == storaged_object1.id
+    assert storaged_object2.deleted_at is None
+
+
+async def test_bulk_create_storaged_objects_with_same_content():
+    existing = await repositories.create_storaged_object(
+        file=f.build_image_file(name="existing")
+    )
+    storaged_objects = [
+        StoragedObject(file=f.build_image_file(name="test1")),
+        StoragedObject(file=f.build_image_file(name="test2", format="gif")),
+        StoragedObject(file=f.build_image_file(name="test3", format="gif")),
+    ]
+
+    result = await repositories.bulk_create_storaged_objects(storaged_objects)
+
+    assert result[0].id == existing.id
+    assert result[1].id == result[2].id == storaged_objects[1].id
+    assert await StoragedObject.objects.acount() == 2
+
+
+##########################################################
+# delete_storaged_objects_by_chunks
+##########################################################
+
+
+def test_delete_storaged_objects_by_chunks():
+    storaged_objects = f.StoragedObjectFactory.create_batch(
+        3, deleted_at=aware_utcnow() - timedelta(days=3)
+    )
+    recently_deleted = f.StoragedObjectFactory.create(
+        deleted_at=aware_utcnow() - timedelta(days=1)
+    )
+    not_deleted = f.StoragedObjectFactory.create()
+
+    chunks = list(
+        repositories.delete_storaged_objects_by_chunks(
+            before=aware_utcnow() - timedelta(days=2), chunk_size=2
+        )
+    )
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert sorted(name for chunk in chunks for name in chunk) == sorted(
+        storaged_object.file.name for storaged_object in storaged_objects
+    )
+    assert set(StoragedObject.objects.all()) == {
+        recently_deleted,
+        not_deleted,
+    }
+
+
+def test_delete_storaged_objects_by_chunks_restores_used_ones():
+    storaged_object = f.StoragedObjectFactory.create(
+        deleted_at=aware_utcnow() - timedelta(days=3)
+    )
+    story = f.StoryFactory.create()
+    f.AttachmentFactory.create(content_object=story, storaged_object=storaged_object)
+
+    chunks = list(
+        repositories.delete_storaged_objects_by_chunks(
+            before=aware_utcnow(), chunk_size=10
+        )
+    )
+
+    assert chunks == [[]]
+    storaged_object.refresh_from_db()
+    assert storaged_object.deleted_at is None
+
+
+##########################################################
+# delete_storaged_objects_files
+##########################################################
+
+
+def test_delete_storaged_objects_files():
+    storaged_objects = f.StoragedObjectFactory.create_batch(2)
+    storage = storaged_objects[0].file.storage
+
+    repositories.delete_storaged_objects_files(
+        [storaged_object.file.name for storaged_object in storaged_objects]
+    )
+
+    assert not any(
+        storage.exists(storaged_object.file.name)
+        for storaged_object in storaged_objects
+    )
+
+
+def test_delete_storaged_objects_files_skips_the_failing_ones(caplog):
+    storaged_objects = f.StoragedObjectFactory.create_batch(2)
+    storage = storaged_objects[0].file.storage
+    names = [storaged_object.file.name for storaged_object in storaged_objects]
+    delete = storage.delete
+
+    def failing_delete(name):
+        if name == names[0]:
+            raise OSError("permission denied")
+        delete(name)
+
+    with patch.object(storage, "delete", side_effect=failing_delete):
+        repositories.delete_storaged_objects_files(names)
+
+    assert storage.exists(names[0])
+    assert not storage.exists(names[1])
+    assert "permission denied" in caplog.text
+
+
+##########################################################
+# mark_storaged_object_as_deleted
+##########################################################
+
+
+def test_mark_storaged_object_as_deleted():
+    storaged_object = f.StoragedObjectFactory.create()
+
+    assert not storaged_object.deleted_at
+    repositories.mark_storaged_object_as_deleted(storaged_object=storaged_object)
+    assert storaged_object.deleted_at
@@ -20,33 +20,29 @@
 from datetime import timedelta
 from unittest.mock import call, patch
 
+from django.conf import settings
+
 from commons.storage import services
 from ninja_jwt.utils import aware_utcnow
-from tests.utils import factories as f
 
 
 def test_clean_deleted_storaged_objects():
-    storaged_objects = [
-        f.build_storaged_object(),
-        f.build_storaged_object(),
-    ]
+    chunks = [["file1", "file2"], ["file3"]]
     before_datetime = aware_utcnow() - timedelta(days=1)
 
     with patch(
         "commons.storage.services.storage_repositories", autospec=True
     ) as fake_storage_repositories:
-        fake_storage_repositories.list_storaged_objects.return_value = storaged_objects
-        fake_storage_repositories.delete_storaged_object.return_value = True
+        fake_storage_repositories.delete_storaged_objects_by_chunks.return_value = iter(
+            chunks
+        )
 
-        assert services.clean_deleted_storaged_objects(before=before_datetime) == 2
+        assert services.clean_deleted_storaged_objects(before=before_datetime) == 3
 
-        fake_storage_repositories.list_storaged_objects.assert_awaited_once_with(
-            filters={"deleted_at__lt": before_datetime}
+        fake_storage_repositories.delete_storaged_objects_by_chunks.assert_called_once_with(
+            before=before_datetime,
+            chunk_size=settings.STORAGE.CLEAN_DELETED_STORAGED_OBJECTS_CHUNK_SIZE,
         )
-
-        fake_storage_repositories.delete_storaged_object.assert_has_awaits(
-            [
-                call(storaged_objects[0]),
-                call(storaged_objects[1]),
-            ],
+        fake_storage_repositories.delete_storaged_objects_files.assert_has_calls(
+            [call(chunks[0]), call(chunks[1])]
         )
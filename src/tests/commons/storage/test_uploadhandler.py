@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+import hashlib
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory
+
+from commons.exceptions import api as ex
+from commons.storage import repositories
+from commons.storage.models import StoragedObject
+from commons.storage.uploadhandler import (
+    StorageUploadHandler,
+    StoredUploadedFile,
+    receive_uploaded_files,
+)
+from tests.utils import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+def _upload(
+    content: bytes,
+    name: str = "test.png",
+    content_type: str = "application/octet-stream",
+    max_size: int | None = None,
+    chunk_size: int = 1024,
+) -> StoredUploadedFile:
+    handler = StorageUploadHandler(max_size=max_size)
+    handler.new_file("file", name, content_type, len(content))
+    for start in range(0, len(content), chunk_size):
+        handler.receive_data_chunk(content[start : start + chunk_size], start)
+    return handler.file_complete(len(content))
+
+
+#############################################################
+# StorageUploadHandler
+#############################################################
+
+
+def test_upload_writes_the_file_to_the_storage():
+    content = f.build_image_file(name="test").read()
+
+    uploaded_file = _upload(content)
+
+    assert uploaded_file.name == "test.png"
+    assert uploaded_file.size == len(content)
+    assert uploaded_file.sha256 == hashlib.sha256(content).hexdigest()
+    # sniffed from the content, as the declared one is generic
+    assert uploaded_file.content_type == "image/png"
+    assert uploaded_file.storage.exists(uploaded_file.storage_name)
+    assert uploaded_file.read() == content
+    uploaded_file.close()
+
+
+def test_upload_keeps_the_declared_content_type():
+    uploaded_file = _upload(b"some text", name="test.txt", content_type="text/plain")
+
+    assert uploaded_file.content_type == "text/plain"
+    uploaded_file.close()
+
+
+def test_upload_too_large_file():
+    handler = StorageUploadHandler(max_size=10)
+    handler.new_file("file", "test.txt", "text/plain", None)
+    storage, storage_name = handler.storage, handler.storage_name
+    handler.receive_data_chunk(b"a" * 10, 0)
+
+    with pytest.raises(ex.ValidationError):
+        handler.receive_data_chunk(b"a", 10)
+
+    assert not storage.exists(storage_name)
+
+
+def test_close_deletes_the_file_without_storaged_object():
+    uploaded_file = _upload(b"some text", name="test.txt")
+
+    uploaded_file.close()
+
+    assert not uploaded_file.storage.exists(uploaded_file.storage_name)
+
+
+async def test_close_keeps_the_file_of_a_storaged_object():
+    uploaded_file = await sync_to_async(_upload)(b"some text", name="test.txt")
+
+    storaged_object = await repositories.create_storaged_object(uploaded_file)
+    await sync_to_async(uploaded_file.close)()
+
+    assert storaged_object.file.name == uploaded_file.storage_name
+    assert storaged_object.sha256 == hashlib.sha256(b"some text").hexdigest()
+    assert await StoragedObject.objects.acount() == 1
+    assert uploaded_file.storage.exists(uploaded_file.storage_name)
+
+
+async def test_close_deletes_the_file_of_an_already_stored_content():
+    first_file = await sync_to_async(_upload)(b"some text", name="test.txt")
+    storaged_object = await repositories.create_storaged_object(first_file)
+    await sync_to_async(first_file.close)()
+    uploaded_file = await sync_to_async(_upload)(b"some text", name="test.txt")
+
+    # the existing storaged object (with the same content) is reused
+    assert (await repositories.create_storaged_object(uploaded_file)) == storaged_object
+    await sync_to_async(uploaded_file.close)()
+
+    assert not uploaded_file.storage.exists(uploaded_file.storage_name)
+    assert uploaded_file.storage.exists(first_file.storage_name)
+
+
+#############################################################
+# receive_uploaded_files
+#############################################################
+
+
+async def test_receive_uploaded_files():
+    request = RequestFactory().post(
+        "/", {"file": SimpleUploadedFile("test.txt", b"some text")}
+    )
+
+    files = await receive_uploaded_files(request, max_size=10)
+
+    uploaded_file = files["file"]
+    assert isinstance(uploaded_file, StoredUploadedFile)
+    assert uploaded_file.sha256 == hashlib.sha256(b"some text").hexdigest()
+    await sync_to_async(uploaded_file.close)()
+
+
+async def test_receive_uploaded_files_too_large_file():
+    request = RequestFactory().post(
+        "/",
+        {
+            "small": SimpleUploadedFile("small.txt", b"a" * 5),
+            "large": SimpleUploadedFile("large.txt", b"a" * 11),
+        },
+    )
+
+    # the files already uploaded are removed, without any database query on the event loop
+    with pytest.raises(ex.ValidationError):
+        await receive_uploaded_files(request, max_size=10)
+
+    (uploaded_file,) = request.upload_handlers[0].uploaded_files
+    assert uploaded_file.closed
+    assert not uploaded_file.storage.exists(uploaded_file.storage_name)
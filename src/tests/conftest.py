@@ -22,8 +22,12 @@ from unittest import mock
 from unittest.mock import patch
 
 import pytest
+from django.core.cache import cache
 from django.db import connections
 
+from feeds import repositories as feeds_repositories
+from memberships import cache as memberships_cache
+
 # import pytest_asyncio
 from .fixtures import *  # noqa
 
@@ -86,6 +90,17 @@ def fix_async_db(request):
         object.__setattr__(main_thread_local, "_lock_storage", main_thread_storage)
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Prevent payloads cached by a test to leak into the next ones
+    """
+    yield
+    cache.clear()
+    memberships_cache.clear_local()
+    feeds_repositories.clear_local_active_feed_items()
+
+
 #
 # Manage slow tests
 #
@@ -19,9 +19,11 @@
 from datetime import timedelta
 
 import pytest
+from django.conf import settings
 
+from configurations.conf.cache import CacheBackendChoices
 from feeds import repositories
-from feeds.models import FeedItemReadStatus, FeedItemType
+from feeds.models import FeedItem, FeedItemReadStatus, FeedItemType
 from ninja_jwt.utils import aware_utcnow
 from tests.utils import factories as f
 
@@ -97,6 +99,112 @@ async def test_list_active_orders_maintenance_first_then_recent(empty_feed_items
     assert [item.id for item in items[1:]] == [newer.id, older.id]
 
 
+async def test_list_active_is_cached_until_next_boundary(empty_feed_items):
+    now = aware_utcnow()
+    user = await f.create_user()
+    active = await f.create_feed_item(
+        type=FeedItemType.CALL_TO_ACTION,
+        publication_date=now - timedelta(days=1),
+        expiration_date=now + timedelta(days=2),
+    )
+    scheduled = await f.create_feed_item(
+        type=FeedItemType.CALL_TO_ACTION,
+        publication_date=now + timedelta(days=1),
+    )
+
+    items = await repositories.list_active_feed_items(user=user, at=now)
+    assert [item.id for item in items] == [active.id]
+
+    # a bulk update sends no signal: the cached items are returned
+    await FeedItem.objects.filter(id=active.id).aupdate(title="updated")
+    items = await repositories.list_active_feed_items(user=user, at=now)
+    assert items[0].title == active.title
+
+    # the scheduled item becomes active
+    items = await repositories.list_active_feed_items(
+        user=user, at=now + timedelta(days=1, seconds=1)
+    )
+    assert [item.id for item in items] == [scheduled.id, active.id]
+    assert items[1].title == "updated"
+
+    # the active item expires
+    items = await repositories.list_active_feed_items(
+        user=user, at=now + timedelta(days=3)
+    )
+    assert [item.id for item in items] == [scheduled.id]
+
+
+async def test_list_active_is_cached_until_the_local_timeout(
+    empty_feed_items, monkeypatch
+):
+    monkeypatch.setattr(settings.CACHE, "FEEDS_LOCAL_TIMEOUT", 60)
+    now = aware_utcnow()
+    user = await f.create_user()
+    # no boundary ahead
+    item = await f.create_feed_item(
+        type=FeedItemType.RELEASE,
+        publication_date=now - timedelta(days=1),
+        expiration_date=None,
+    )
+    await repositories.list_active_feed_items(user=user, at=now)
+
+    await FeedItem.objects.filter(id=item.id).aupdate(title="updated")
+    items = await repositories.list_active_feed_items(
+        user=user, at=now + timedelta(seconds=59)
+    )
+    assert items[0].title == item.title
+
+    items = await repositories.list_active_feed_items(
+        user=user, at=now + timedelta(seconds=60)
+    )
+    assert items[0].title == "updated"
+
+
+async def test_list_active_is_not_cached_in_memory(empty_feed_items, monkeypatch):
+    monkeypatch.setattr(settings.CACHE, "BACKEND", CacheBackendChoices.MEMORY)
+    now = aware_utcnow()
+    user = await f.create_user()
+    item = await f.create_feed_item(publication_date=now - timedelta(days=1))
+    await repositories.list_active_feed_items(user=user, at=now)
+
+    await FeedItem.objects.filter(id=item.id).aupdate(title="updated")
+    items = await repositories.list_active_feed_items(user=user, at=now)
+    assert items[0].title == "updated"
+
+
+async def test_list_active_is_invalidated_on_save_and_delete(empty_feed_items):
+    now = aware_utcnow()
+    user = await f.create_user()
+    item = await f.create_feed_item(
+        type=FeedItemType.CALL_TO_ACTION,
+        publication_date=now - timedelta(days=1),
+    )
+    await repositories.list_active_feed_items(user=user, at=now)
+
+    item.title = "updated"
+    await item.asave()
+    items = await repositories.list_active_feed_items(user=user, at=now)
+    assert items[0].title == "updated"
+
+    await item.adelete()
+    assert await repositories.list_active_feed_items(user=user, at=now) == []
+
+
+async def test_list_active_read_at_is_not_shared(empty_feed_items):
+    now = aware_utcnow()
+    user = await f.create_user()
+    other = await f.create_user()
+    item = await f.create_feed_item(publication_date=now - timedelta(days=1))
+    await f.create_feed_item_read_status(feed_item=item, user=user)
+
+    items = await repositories.list_active_feed_items(user=user, at=now)
+    items_other = await repositories.list_active_feed_items(user=other, at=now)
+
+    assert items[0].read_at is not None
+    assert items_other[0].read_at is None
+    assert items[0].read_at is not None
+
+
 ##########################################################
 # bulk_mark_as_read
 ##########################################################
@@ -48,7 +48,9 @@ from ninja_jwt.models import TokenUser
 from ninja_jwt.ninja_extra.lazy import LazyStrImport
 from ninja_jwt.settings import api_settings
 from ninja_jwt.tokens import AccessToken, SlidingToken
+from ninja_jwt.utils import aware_utcnow
 from tests.utils.factories import sync_create_user as create_user
+from users import repositories as users_repositories
 
 AuthToken = api_settings.AUTH_TOKEN_CLASSES[0]
 
@@ -199,6 +201,71 @@ class TestAsyncJWTAuth(TestJWTAuth):
         _test_get_user = sync_to_async(super(TestAsyncJWTAuth, self).test_get_user)
         await _test_get_user()
 
+    @pytest.mark.django_db
+    async def test_aget_validated_token_is_cached_until_expiration(self, monkeypatch):
+        token = AuthToken()
+        token.set_exp()
+
+        validated_token = await self.backend.aget_validated_token(str(token))
+        assert validated_token.payload == token.payload
+
+        with monkeypatch.context() as m:
+            m.setattr(
+                authentication.JWTBaseAuthentication,
+                "get_validated_token",
+                classmethod(lambda cls, raw_token: pytest.fail("not cached")),
+            )
+            assert (
+                await self.backend.aget_validated_token(str(token)) is validated_token
+            )
+
+        # once expired, the cached token is dropped and the token is validated again
+        with monkeypatch.context() as m:
+            m.setattr(
+                authentication,
+                "aware_utcnow",
+                lambda: aware_utcnow() + api_settings.ACCESS_TOKEN_LIFETIME,
+            )
+            assert (
+                await self.backend.aget_validated_token(str(token))
+                is not validated_token
+            )
+
+    @pytest.mark.django_db
+    async def test_aget_user(self):
+        payload = {"some_other_id": "foo"}
+
+        # Should raise error if no recognizable user identification
+        with pytest.raises(InvalidToken):
+            await self.backend.aget_user(payload)
+
+        payload[api_settings.USER_ID_CLAIM] = 42
+
+        # Should raise exception if user not found
+        with pytest.raises(AuthenticationFailed):
+            await self.backend.aget_user(payload)
+
+        u = await sync_to_async(create_user)(username="markhamill")
+        u.is_active = False
+        await u.asave()
+
+        payload[api_settings.USER_ID_CLAIM] = getattr(u, api_settings.USER_ID_FIELD)
+
+        # Should raise exception if user is inactive
+        with pytest.raises(AuthenticationFailed):
+            await self.backend.aget_user(payload)
+
+        await users_repositories.update_user(user=u, values={"is_active": True})
+
+        # Otherwise, should return correct user (and cache it)
+        assert (await self.backend.aget_user(payload)).id == u.id
+        assert (await users_repositories.get_cached_user(u.id)).id == u.id
+
+        # Deleting the user invalidates the cache
+        await users_repositories.delete_user(u)
+        with pytest.raises(AuthenticationFailed):
+            await self.backend.aget_user(payload)
+
 
 class TestAsyncJWTTokenUserAuth(TestJWTTokenUserAuth):
     def init_backend(self):
@@ -47,6 +47,7 @@ from ninja_jwt.exceptions import TokenError, ValidationError
 from ninja_jwt.schema import TokenVerifyInputSchema
 from ninja_jwt.settings import api_settings
 from ninja_jwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from ninja_jwt.token_blacklist.snapshot import blacklist_snapshot, is_blacklisted
 from ninja_jwt.tokens import AccessToken, RefreshToken, SlidingToken
 from ninja_jwt.utils import aware_utcnow, datetime_from_epoch
 
@@ -156,6 +157,33 @@ class TestTokenBlacklist:
 
         assert OutstandingToken.objects.count() == 2
 
+    def test_not_blacklisted_tokens_are_checked_without_queries(
+        self, django_assert_num_queries
+    ):
+        token = RefreshToken.for_user(self.user)
+        # warm up the snapshot
+        RefreshToken(str(token))
+
+        with django_assert_num_queries(0):
+            RefreshToken(str(token))
+
+        token.blacklist()
+
+        with pytest.raises(TokenError):
+            RefreshToken(str(token))
+
+    def test_blacklist_snapshot_is_confirmed_by_the_database(self):
+        token = RefreshToken.for_user(self.user)
+        token.blacklist()
+
+        assert is_blacklisted(token["jti"])
+        assert blacklist_snapshot.might_contain(token["jti"])
+
+        # un-blacklisted (e.g. from the admin) tokens are still in the snapshot
+        BlacklistedToken.objects.all().delete()
+        assert blacklist_snapshot.might_contain(token["jti"])
+        assert not is_blacklisted(token["jti"])
+
 
 @pytest.mark.django_db
 class TestTokenBlacklistFlushExpiredTokens:
@@ -214,6 +242,21 @@ class TestTokenBlacklistFlushExpiredTokens:
             not_expired_3["jti"],
         ]
 
+    def test_it_should_delete_expired_tokens_by_chunks(self, monkeypatch):
+        monkeypatch.setattr(api_settings, "FLUSH_EXPIRED_TOKENS_CHUNK_SIZE", 2)
+        fake_now = aware_utcnow() - api_settings.REFRESH_TOKEN_LIFETIME
+
+        with patch("ninja_jwt.tokens.aware_utcnow") as fake_aware_utcnow:
+            fake_aware_utcnow.return_value = fake_now
+            for _ in range(5):
+                RefreshToken.for_user(self.user).blacklist()
+        not_expired = RefreshToken.for_user(self.user)
+
+        call_command("flushexpiredtokens")
+
+        assert [i.jti for i in OutstandingToken.objects.all()] == [not_expired["jti"]]
+        assert not BlacklistedToken.objects.exists()
+
     def test_token_blacklist_will_not_be_removed_on_User_delete(self):
         token = RefreshToken.for_user(self.user)
         outstanding_token = OutstandingToken.objects.first()
@@ -19,6 +19,7 @@
 
 import pytest
 
+from base.api import encode_cursor
 from ninja_jwt.utils import aware_utcnow
 from tests.utils import factories as f
 from tests.utils.bad_params import INVALID_B64ID, NOT_EXISTING_B64ID
@@ -69,6 +70,34 @@ async def test_list_notifications_200_ok_filter_only_unread(client):
     assert len(res) == 2
 
 
+async def test_list_notifications_200_ok_paginated(client):
+    user = await f.create_user()
+    n1 = await f.create_notification(owner=user)
+    n2 = await f.create_notification(owner=user)
+    n3 = await f.create_notification(owner=user)
+
+    client.login(user)
+    response = await client.get("/notifications?limit=2")
+    assert response.status_code == 200, response.data
+    assert [n["id"] for n in response.data["data"]] == [n3.b64id, n2.b64id]
+    assert response.headers["Pagination-Next"] == encode_cursor(n2.created_at, n2.id)
+
+    response = await client.get(
+        f"/notifications?limit=2&after={response.headers['Pagination-Next']}"
+    )
+    assert response.status_code == 200, response.data
+    assert [n["id"] for n in response.data["data"]] == [n1.b64id]
+    assert "Pagination-Next" not in response.headers
+
+
+async def test_list_notifications_422_invalid_cursor(client):
+    user = await f.create_user()
+
+    client.login(user)
+    response = await client.get("/notifications?after=invalid")
+    assert response.status_code == 422, response.data
+
+
 async def test_list_notifications_401_forbidden_error_anonymous(client):
     response = await client.get("/notifications")
     assert response.status_code == 401, response.data
@@ -17,10 +17,10 @@
 #
 # You can contact BIRU at ask@biru.sh
 
-from datetime import timedelta
+from datetime import date, datetime, timedelta, timezone
 
 import pytest
-from asgiref.sync import async_to_sync
+from asgiref.sync import async_to_sync, sync_to_async
 
 from ninja_jwt.utils import aware_utcnow
 from notifications import repositories
@@ -35,24 +35,34 @@ pytestmark = pytest.mark.django_db
 ##########################################################
 
 
-async def test_create_notification():
+async def test_bulk_create_notifications():
     user1 = await f.create_user()
     user2 = await f.create_user()
-    user3 = await f.create_user()
 
-    notifications = await repositories.create_notifications(
-        owner_ids=[user1.id, user2.id],
-        created_by=user3,
-        notification_type="test_notification",
-        content_list=[{"msg": "test"}],
+    notifications = await repositories.bulk_create_notifications(
+        pending_notifications=[
+            {
+                "owner_id": str(user1.id),
+                "created_by_id": str(user2.id),
+                "type": "test_notification",
+                "content": {"msg": "test1"},
+            },
+            {
+                "owner_id": str(user2.id),
+                "created_by_id": None,
+                "type": "test_notification",
+                "content": {"msg": "test2"},
+            },
+        ]
     )
 
     assert len(notifications) == 2
-    assert notifications[0].created_by == notifications[1].created_by == user3
-    assert notifications[0].type == notifications[1].type == "test_notification"
-    assert notifications[0].content == notifications[1].content == {"msg": "test"}
     assert notifications[0].owner_id == user1.id
+    assert notifications[0].created_by == user2
+    assert notifications[0].content == {"msg": "test1"}
     assert notifications[1].owner_id == user2.id
+    assert notifications[1].created_by is None
+    assert await Notification.objects.acount() == 2
 
 
 ##########################################################
@@ -96,6 +106,46 @@ async def test_list_notifications_filters():
     )
 
 
+async def test_list_notifications_after():
+    user = await f.create_user()
+    n1 = await f.create_notification(owner=user)
+    n2 = await f.create_notification(owner=user)
+    n3 = await f.create_notification(owner=user)
+    # same created_at: ordered by id
+    n4 = await f.create_notification(owner=user, created_at=n3.created_at)
+    first, second = sorted([n3, n4], key=lambda n: n.id, reverse=True)
+
+    page = await repositories.list_notifications(filters={"owner": user}, limit=2)
+    assert page == [first, second]
+    page = await repositories.list_notifications(
+        filters={"owner": user}, after=(page[-1].created_at, page[-1].id), limit=2
+    )
+    assert page == [n2, n1]
+    page = await repositories.list_notifications(
+        filters={"owner": user}, after=(page[-1].created_at, page[-1].id), limit=2
+    )
+    assert page == []
+    page = await repositories.list_notifications(
+        filters={"owner": user}, after=(first.created_at, first.id), limit=2
+    )
+    assert page == [second, n2]
+
+
+async def test_list_notifications_after_deleted_notification():
+    user = await f.create_user()
+    n1 = await f.create_notification(owner=user)
+    n2 = await f.create_notification(owner=user)
+    n3 = await f.create_notification(owner=user)
+
+    page = await repositories.list_notifications(filters={"owner": user}, limit=2)
+    assert page == [n3, n2]
+    await n2.adelete()
+    page = await repositories.list_notifications(
+        filters={"owner": user}, after=(n2.created_at, n2.id), limit=2
+    )
+    assert page == [n1]
+
+
 ##########################################################
 # get_notification
 ##########################################################
@@ -147,47 +197,87 @@ async def test_mark_notifications_as_read():
 ##########################################################
 
 
-def test_delete_notifications():
+def test_delete_read_notifications_by_chunks():
     user1 = f.UserFactory.create()
     user2 = f.UserFactory.create()
-    user3 = f.UserFactory.create()
 
     now = aware_utcnow()
 
-    f.NotificationFactory.create(owner=user1, created_by=user3)
-    f.NotificationFactory.create(
-        owner=user1, created_by=user3, read_at=now - timedelta(minutes=1)
+    f.NotificationFactory.create(owner=user1)
+    f.NotificationFactory.create_batch(
+        3, owner=user1, read_at=now - timedelta(minutes=2)
     )
-    f.NotificationFactory.create(
-        owner=user1, created_by=user3, read_at=now - timedelta(minutes=2)
+    f.NotificationFactory.create_batch(
+        2, owner=user2, read_at=now - timedelta(minutes=2)
     )
+    f.NotificationFactory.create(owner=user2, read_at=now)
 
-    f.NotificationFactory.create(owner=user2, created_by=user3)
-    f.NotificationFactory.create(
-        owner=user2, created_by=user3, read_at=now - timedelta(minutes=1)
+    assert (
+        repositories.delete_read_notifications_by_chunks(
+            before=now - timedelta(minutes=1), chunk_size=2
+        )
+        == 5
     )
 
-    repositories.delete_notifications(
-        filters={"read_at__lt": now - timedelta(minutes=1)}
+    assert 2 == Notification.objects.count()
+    assert async_to_sync(repositories.get_notification_counters)(owner=user1) == {
+        "read": 0,
+        "unread": 1,
+    }
+    assert async_to_sync(repositories.get_notification_counters)(owner=user2) == {
+        "read": 1,
+        "unread": 0,
+    }
+
+    assert (
+        repositories.delete_read_notifications_by_chunks(
+            before=now + timedelta(minutes=1), chunk_size=2
+        )
+        == 1
     )
+    assert async_to_sync(repositories.get_notification_counters)(owner=user2) == {
+        "read": 0,
+        "unread": 0,
+    }
 
-    assert 4 == Notification.objects.count()
-    count = async_to_sync(repositories.count_notifications)(filters={"owner": user1})
-    assert count["read"] == 1
-    assert count["unread"] == 1
-    count = async_to_sync(repositories.count_notifications)(filters={"owner": user2})
-    assert count["read"] == 1
-    assert count["unread"] == 1
 
-    repositories.delete_notifications(filters={"read_at__lt": now})
+##########################################################
+# partitions
+##########################################################
 
-    assert 2 == Notification.objects.count()
-    count = async_to_sync(repositories.count_notifications)(filters={"owner": user1})
-    assert count["read"] == 0
-    assert count["unread"] == 1
-    count = async_to_sync(repositories.count_notifications)(filters={"owner": user2})
-    assert count["read"] == 0
-    assert count["unread"] == 1
+
+def test_create_and_drop_notifications_partitions():
+    user = f.UserFactory.create()
+    month = date(2001, 2, 1)
+
+    assert month not in repositories.list_notifications_partitions()
+    repositories.create_notifications_partition(month=date(2001, 2, 15))
+    # already created
+    repositories.create_notifications_partition(month=month)
+    assert month in repositories.list_notifications_partitions()
+
+    f.NotificationFactory.create(
+        owner=user, created_at=datetime(2001, 2, 28, 23, 59, tzinfo=timezone.utc)
+    )
+    f.NotificationFactory.create(
+        owner=user,
+        created_at=datetime(2001, 2, 1, tzinfo=timezone.utc),
+        read_at=aware_utcnow(),
+    )
+    f.NotificationFactory.create(owner=user)
+    assert async_to_sync(repositories.get_notification_counters)(owner=user) == {
+        "read": 1,
+        "unread": 2,
+    }
+
+    repositories.drop_notifications_partition(month=month)
+
+    assert month not in repositories.list_notifications_partitions()
+    assert 1 == Notification.objects.filter(owner=user).count()
+    assert async_to_sync(repositories.get_notification_counters)(owner=user) == {
+        "read": 0,
+        "unread": 1,
+    }
 
 
 ##########################################################
@@ -195,21 +285,51 @@ def test_delete_notifications():
 ##########################################################
 
 
-async def test_count_notifications():
+async def test_get_notification_counters():
     user1 = await f.create_user()
     user2 = await f.create_user()
-    user3 = await f.create_user()
-
-    await f.create_notification(owner=user1, created_by=user3)
-    await f.create_notification(owner=user1, created_by=user3, read_at=aware_utcnow())
-    await f.create_notification(owner=user1, created_by=user3)
-
-    await f.create_notification(owner=user2, created_by=user3)
-    await f.create_notification(owner=user2, created_by=user3, read_at=aware_utcnow())
 
-    count = await repositories.count_notifications()
-    assert count["read"] == 2
-    assert count["unread"] == 3
-    count = await repositories.count_notifications(filters={"owner": user1})
-    assert count["read"] == 1
-    assert count["unread"] == 2
+    assert await repositories.get_notification_counters(owner=user1) == {
+        "read": 0,
+        "unread": 0,
+    }
+
+    # kept in sync by the triggers of the notifications table
+    await repositories.bulk_create_notifications(
+        pending_notifications=[
+            {
+                "owner_id": str(user.id),
+                "created_by_id": None,
+                "type": "test",
+                "content": {},
+            }
+            for user in [user1, user1, user1, user2]
+        ]
+    )
+    await f.create_notification(owner=user1, read_at=aware_utcnow())
+    assert await repositories.get_notification_counters(owner=user1) == {
+        "read": 1,
+        "unread": 3,
+    }
+    assert await repositories.get_notification_counters(owner=user2) == {
+        "read": 0,
+        "unread": 1,
+    }
+
+    await repositories.mark_notifications_as_read(filters={"owner": user1})
+    assert await repositories.get_notification_counters(owner=user1) == {
+        "read": 4,
+        "unread": 0,
+    }
+
+    await sync_to_async(repositories.delete_read_notifications_by_chunks)(
+        before=aware_utcnow(), chunk_size=10
+    )
+    assert await repositories.get_notification_counters(owner=user1) == {
+        "read": 0,
+        "unread": 0,
+    }
+    assert await repositories.get_notification_counters(owner=user2) == {
+        "read": 0,
+        "unread": 1,
+    }
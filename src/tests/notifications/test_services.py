@@ -17,18 +17,31 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+from datetime import date
 from unittest.mock import call, patch
 
+import pytest
+from django.conf import settings
+
 from base.serializers import BaseSchema
 from ninja_jwt.utils import aware_utcnow
 from notifications import services
 from tests.utils import factories as f
+from tests.utils.utils import (
+    async_django_capture_on_commit_callbacks,
+    patch_db_transaction,
+)
 
 
 class SampleContent(BaseSchema):
     msg: str
 
 
+class SampleStoryContent(BaseSchema):
+    story: dict
+    msg: str
+
+
 #####################################################################
 # notify_users
 #####################################################################
@@ -36,9 +49,140 @@ class SampleContent(BaseSchema):
 
 async def test_notify_users():
     user = f.build_user()
-    notification = f.build_notification(type="test", owner=user)
+    other_user = f.build_user()
     content = SampleContent(msg="Test notify")
 
+    with (
+        patch(
+            "notifications.services.notifications_tasks", autospec=True
+        ) as fake_notifications_tasks,
+        patch_db_transaction(),
+    ):
+        await services.notify_users(
+            notification_type="test",
+            emitted_by=user,
+            notified_user_ids=[other_user.id],
+            content_list=[content],
+        )
+
+        fake_notifications_tasks.create_notifications.defer_async.assert_awaited_once_with(
+            pending_notifications=[
+                {
+                    "owner_id": str(other_user.id),
+                    "created_by_id": str(user.id),
+                    "type": "test",
+                    "content": {"msg": "Test notify"},
+                }
+            ]
+        )
+
+
+async def test_notify_users_in_a_batch():
+    user = f.build_user()
+    other_user = f.build_user()
+    story1 = {"ref": 1, "project_id": "pj"}
+    story2 = {"ref": 2, "project_id": "pj"}
+
+    with (
+        patch(
+            "notifications.services.notifications_tasks", autospec=True
+        ) as fake_notifications_tasks,
+        patch_db_transaction(),
+    ):
+        async with services.notifications_batch():
+            for story, msg in [(story1, "1"), (story2, "2"), (story1, "3")]:
+                await services.notify_users(
+                    notification_type="test",
+                    emitted_by=None,
+                    notified_user_ids=[user.id, other_user.id],
+                    content_list=[SampleStoryContent(story=story, msg=msg)],
+                )
+            # not about a story
+            await services.notify_users(
+                notification_type="test",
+                emitted_by=None,
+                notified_user_ids=[user.id],
+                content_list=[SampleContent(msg="4"), SampleContent(msg="4")],
+            )
+            fake_notifications_tasks.create_notifications.defer_async.assert_not_awaited()
+
+        # a single task, the last notification about story1 replacing the first one
+        fake_notifications_tasks.create_notifications.defer_async.assert_awaited_once()
+        pending_notifications = (
+            fake_notifications_tasks.create_notifications.defer_async.call_args.kwargs[
+                "pending_notifications"
+            ]
+        )
+        assert [
+            (n["owner_id"], n["content"]["msg"]) for n in pending_notifications
+        ] == [
+            (str(user.id), "2"),
+            (str(other_user.id), "2"),
+            (str(user.id), "3"),
+            (str(other_user.id), "3"),
+            (str(user.id), "4"),
+            (str(user.id), "4"),
+        ]
+
+
+async def test_notify_users_in_a_failed_batch():
+    user = f.build_user()
+
+    with (
+        patch(
+            "notifications.services.notifications_tasks", autospec=True
+        ) as fake_notifications_tasks,
+        patch_db_transaction(),
+    ):
+        with pytest.raises(ValueError):
+            async with services.notifications_batch():
+                await services.notify_users(
+                    notification_type="test",
+                    emitted_by=None,
+                    notified_user_ids=[user.id],
+                    content_list=[SampleContent(msg="test")],
+                )
+                raise ValueError()
+
+        fake_notifications_tasks.create_notifications.defer_async.assert_not_awaited()
+
+
+@pytest.mark.django_db
+async def test_notify_users_deferred_on_commit():
+    user = f.build_user()
+
+    with patch(
+        "notifications.services.notifications_tasks", autospec=True
+    ) as fake_notifications_tasks:
+        async with async_django_capture_on_commit_callbacks() as callbacks:
+            await services.notify_users(
+                notification_type="test",
+                emitted_by=None,
+                notified_user_ids=[user.id],
+                content_list=[SampleContent(msg="test")],
+            )
+
+        fake_notifications_tasks.create_notifications.defer_async.assert_not_awaited()
+        assert len(callbacks) == 1
+
+
+#####################################################################
+# create_notifications
+#####################################################################
+
+
+async def test_create_notifications():
+    user = f.build_user()
+    notification = f.build_notification(type="test", owner=user)
+    pending_notifications = [
+        {
+            "owner_id": str(user.id),
+            "created_by_id": None,
+            "type": "test",
+            "content": {"msg": "test"},
+        }
+    ]
+
     with (
         patch(
             "notifications.services.notifications_repositories", autospec=True
@@ -46,28 +190,146 @@ async def test_notify_users():
         patch(
             "notifications.services.notifications_events", autospec=True
         ) as fake_notifications_events,
+        patch_db_transaction(),
     ):
-        fake_notifications_repository.create_notifications.return_value = [notification]
+        fake_notifications_repository.bulk_create_notifications.return_value = [
+            notification
+        ]
 
-        await services.notify_users(
-            notification_type="test",
-            emitted_by=user,
-            notified_user_ids=[user.id],
-            content_list=[content],
+        await services.create_notifications(pending_notifications=pending_notifications)
+
+        fake_notifications_repository.bulk_create_notifications.assert_awaited_once_with(
+            pending_notifications=pending_notifications
+        )
+        fake_notifications_events.emit_event_when_notifications_are_created.assert_awaited_once_with(
+            notifications=[notification]
         )
 
-        fake_notifications_repository.create_notifications.assert_called_once_with(
-            owner_ids=[user.id],
-            created_by=user,
-            notification_type="test",
-            content_list=[{"msg": "Test notify"}],
+
+def _story_pending_notification(owner, type, project_id, ref):
+    return {
+        "owner_id": str(owner.id),
+        "created_by_id": None,
+        "type": type,
+        "content": {
+            "project": {"id": project_id},
+            "story": {"ref": ref},
+            "msg": f"story {ref}",
+        },
+    }
+
+
+async def test_create_notifications_digested_in_batch():
+    user = f.build_user()
+    other_user = f.build_user()
+    pending_notifications = [
+        _story_pending_notification(user, "test", "pj1", 1),
+        _story_pending_notification(user, "test", "pj1", 2),
+        _story_pending_notification(user, "other", "pj1", 3),
+        _story_pending_notification(user, "test", "pj2", 4),
+        _story_pending_notification(other_user, "test", "pj1", 5),
+        _story_pending_notification(user, "test", "pj1", 6),
+    ]
+
+    with (
+        patch(
+            "notifications.services.notifications_repositories", autospec=True
+        ) as fake_notifications_repository,
+        patch("notifications.services.notifications_events", autospec=True),
+        patch_db_transaction(),
+    ):
+        fake_notifications_repository.list_notifications_for_update_qs.return_value.__aiter__.return_value = []
+
+        await services.create_notifications(pending_notifications=pending_notifications)
+
+        fake_notifications_repository.bulk_update_notifications.assert_not_awaited()
+        created = (
+            fake_notifications_repository.bulk_create_notifications.call_args.kwargs[
+                "pending_notifications"
+            ]
         )
+        assert [
+            (
+                n["owner_id"],
+                n["type"],
+                n["content"]["msg"],
+                n["content"].get("digest_refs"),
+            )
+            for n in created
+        ] == [
+            (str(user.id), "test", "story 6", [1, 2, 6]),
+            (str(user.id), "other", "story 3", None),
+            (str(user.id), "test", "story 4", None),
+            (str(other_user.id), "test", "story 5", None),
+        ]
 
-        fake_notifications_events.emit_event_when_notifications_are_created.assert_called_once_with(
-            notifications=[notification]
+
+async def test_create_notifications_without_digests(monkeypatch):
+    monkeypatch.setattr(settings.NOTIFICATIONS, "DIGEST_WINDOW_SECONDS", 0)
+    user = f.build_user()
+    pending_notifications = [
+        _story_pending_notification(user, "test", "pj1", 1),
+        _story_pending_notification(user, "test", "pj1", 2),
+    ]
+
+    with (
+        patch(
+            "notifications.services.notifications_repositories", autospec=True
+        ) as fake_notifications_repository,
+        patch("notifications.services.notifications_events", autospec=True),
+        patch_db_transaction(),
+    ):
+        await services.create_notifications(pending_notifications=pending_notifications)
+
+        fake_notifications_repository.list_notifications_for_update_qs.assert_not_called()
+        fake_notifications_repository.bulk_create_notifications.assert_awaited_once_with(
+            pending_notifications=pending_notifications
         )
 
 
+@pytest.mark.django_db
+async def test_create_notifications_digested_in_unread_notification():
+    user = await f.create_user()
+    unread = await f.create_notification(
+        owner=user,
+        type="test",
+        content={"project": {"id": "pj1"}, "story": {"ref": 1}, "msg": "story 1"},
+    )
+    read = await f.create_notification(
+        owner=user,
+        type="test",
+        content={"project": {"id": "pj2"}, "story": {"ref": 2}, "msg": "story 2"},
+        read_at=aware_utcnow(),
+    )
+
+    with patch(
+        "notifications.services.notifications_events", autospec=True
+    ) as fake_notifications_events:
+        created = await services.create_notifications(
+            pending_notifications=[
+                _story_pending_notification(user, "test", "pj1", 3),
+                _story_pending_notification(user, "test", "pj2", 4),
+            ]
+        )
+
+    # merged in the unread notification, which stays unread
+    await unread.arefresh_from_db()
+    assert unread.read_at is None
+    assert unread.content["msg"] == "story 3"
+    assert unread.content["digest_refs"] == [1, 3]
+    fake_notifications_events.emit_event_when_notifications_are_updated.assert_awaited_once_with(
+        notifications=[unread]
+    )
+
+    # a new notification rather than a merge in the read one
+    await read.arefresh_from_db()
+    assert "digest_refs" not in read.content
+    assert [n.content["msg"] for n in created] == ["story 4"]
+    fake_notifications_events.emit_event_when_notifications_are_created.assert_awaited_once_with(
+        notifications=created
+    )
+
+
 #####################################################################
 # list_user_notifications
 #####################################################################
@@ -82,7 +344,7 @@ async def test_list_user_notifications():
         await services.list_user_notifications(user=user)
 
         fake_notifications_repository.list_notifications.assert_called_once_with(
-            filters={"owner": user}
+            filters={"owner": user}, after=None, limit=None
         )
 
 
@@ -95,7 +357,7 @@ async def test_list_user_notifications_read_only():
         await services.list_user_notifications(user=user, is_read=True)
 
         fake_notifications_repository.list_notifications.assert_called_once_with(
-            filters={"owner": user, "read_at__isnull": False}
+            filters={"owner": user, "read_at__isnull": False}, after=None, limit=None
         )
 
 
@@ -108,7 +370,25 @@ async def test_list_user_notifications_unread_only():
         await services.list_user_notifications(user=user, is_read=False)
 
         fake_notifications_repository.list_notifications.assert_called_once_with(
-            filters={"owner": user, "read_at__isnull": True}
+            filters={"owner": user, "read_at__isnull": True}, after=None, limit=None
+        )
+
+
+async def test_list_user_notifications_paginated():
+    user = f.build_user()
+    notification = f.build_notification(owner=user)
+
+    with patch(
+        "notifications.services.notifications_repositories", autospec=True
+    ) as fake_notifications_repository:
+        await services.list_user_notifications(
+            user=user, after=(notification.created_at, notification.id), limit=10
+        )
+
+        fake_notifications_repository.list_notifications.assert_called_once_with(
+            filters={"owner": user},
+            after=(notification.created_at, notification.id),
+            limit=10,
         )
 
 
@@ -186,23 +466,58 @@ async def test_mark_user_notifications_as_read_with_many():
 #####################################################################
 
 
-def test_clean_read_notifications():
+def test_clean_read_notifications(monkeypatch):
     now = aware_utcnow()
+    monkeypatch.setattr(
+        settings.NOTIFICATIONS, "DELETE_READ_NOTIFICATIONS_CHUNK_SIZE", 10
+    )
 
     with (
         patch(
             "notifications.services.notifications_repositories", autospec=True
         ) as fake_notifications_repository,
     ):
-        fake_notifications_repository.delete_notifications.return_value = 1
+        fake_notifications_repository.delete_read_notifications_by_chunks.return_value = 1
 
         assert services.clean_read_notifications(before=now) == 1
 
-        fake_notifications_repository.delete_notifications.assert_called_once_with(
-            filters={
-                "read_at__isnull": False,
-                "read_at__lt": now,
-            }
+        fake_notifications_repository.delete_read_notifications_by_chunks.assert_called_once_with(
+            before=now, chunk_size=10
+        )
+
+
+#####################################################################
+# manage_notifications_partitions
+#####################################################################
+
+
+def test_manage_notifications_partitions(monkeypatch):
+    monkeypatch.setattr(settings.NOTIFICATIONS, "PARTITIONS_MONTHS_AHEAD", 2)
+    monkeypatch.setattr(settings.NOTIFICATIONS, "MONTHS_TO_STORE_NOTIFICATIONS", 12)
+
+    with (
+        patch(
+            "notifications.services.notifications_repositories", autospec=True
+        ) as fake_notifications_repository,
+    ):
+        fake_notifications_repository.list_notifications_partitions.return_value = [
+            date(2025, 9, 1),
+            date(2025, 10, 1),
+            date(2025, 11, 1),
+            date(2026, 11, 1),
+        ]
+
+        created, dropped = services.manage_notifications_partitions(
+            today=date(2026, 11, 18)
+        )
+
+        assert created == [date(2026, 12, 1), date(2027, 1, 1)]
+        assert dropped == [date(2025, 9, 1), date(2025, 10, 1)]
+        fake_notifications_repository.create_notifications_partition.assert_has_calls(
+            [call(month=date(2026, 12, 1)), call(month=date(2027, 1, 1))]
+        )
+        fake_notifications_repository.drop_notifications_partition.assert_has_calls(
+            [call(month=date(2025, 9, 1)), call(month=date(2025, 10, 1))]
         )
 
 
@@ -217,7 +532,7 @@ async def test_count_user_notifications():
     with patch(
         "notifications.services.notifications_repositories", autospec=True
     ) as fake_notifications_repository:
-        fake_notifications_repository.count_notifications.return_value = {
+        fake_notifications_repository.get_notification_counters.return_value = {
             "read": 2,
             "unread": 8,
         }
@@ -226,8 +541,6 @@ async def test_count_user_notifications():
 
         assert result == {"total": 10, "read": 2, "unread": 8}
 
-        fake_notifications_repository.count_notifications.assert_has_awaits(
-            [
-                call(filters={"owner": user}),
-            ]
+        fake_notifications_repository.get_notification_counters.assert_awaited_once_with(
+            owner=user
         )
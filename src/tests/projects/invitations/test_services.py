@@ -22,6 +22,7 @@ from unittest.mock import patch
 import pytest
 from django.test import override_settings
 
+from commons.utils import get_absolute_url
 from memberships.choices import InvitationStatus
 from memberships.services import exceptions as ex
 from ninja_jwt.utils import aware_utcnow
@@ -236,6 +237,47 @@ async def test_send_project_invitations_for_existing_user(tqmanager, correlation
         assert args["context"]["sender_name"] == invitation.invited_by.full_name
 
 
+async def test_send_project_invitations_with_logo_thumbnail_not_generated_yet(
+    tqmanager,
+):
+    project = f.build_project(logo=f.build_image_file())
+    role = f.build_project_role(project=project, slug="member")
+
+    invitation = f.build_project_invitation(
+        user=None,
+        project=project,
+        role=role,
+        email="test@email.com",
+        invited_by=project.created_by,
+    )
+
+    with (
+        patch(
+            "projects.invitations.services.ProjectInvitationToken", autospec=True
+        ) as FakeProjectInvitationToken,
+        patch(
+            "projects.projects.services.get_thumbnail",
+            autospec=True,
+            return_value=None,
+        ),
+    ):
+        FakeProjectInvitationToken.create_for_object.return_value = "invitation-token"
+
+        await services.send_project_invitation_email(
+            invitation=invitation,
+            project=invitation.project,
+            sender=invitation.invited_by,
+        )
+
+        jobs = [
+            job for job in tqmanager.pending_jobs if "send_email" in job["task_name"]
+        ]
+        assert len(jobs) == 1
+        assert jobs[0]["args"]["context"]["project_image_url"] == get_absolute_url(
+            project.logo.url
+        )
+
+
 async def test_send_project_invitations_for_new_user(tqmanager):
     project = f.build_project()
     role = f.build_project_role(project=project, slug="member")
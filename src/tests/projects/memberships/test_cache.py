@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+from unittest.mock import AsyncMock
+
+import pytest
+from django.conf import settings
+
+from configurations.conf.cache import CacheBackendChoices
+from memberships import cache as memberships_cache
+from memberships import services as memberships_services
+from tests.utils import factories as f
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    memberships_cache.reset_stats()
+    yield
+    memberships_cache.reset_stats()
+
+
+async def test_aget_or_compute_local_and_shared_hits():
+    compute = AsyncMock(return_value="role")
+
+    assert (
+        await memberships_cache.aget_or_compute(
+            "role", "project", "pj1", "user1", compute
+        )
+        == "role"
+    )
+    assert (
+        await memberships_cache.aget_or_compute(
+            "role", "project", "pj1", "user1", compute
+        )
+        == "role"
+    )
+    # another process only has the shared cache
+    memberships_cache.clear_local()
+    assert (
+        await memberships_cache.aget_or_compute(
+            "role", "project", "pj1", "user1", compute
+        )
+        == "role"
+    )
+
+    compute.assert_awaited_once()
+    assert memberships_cache.get_stats() == {
+        "local_hits": 1,
+        "shared_hits": 1,
+        "misses": 1,
+    }
+    assert memberships_cache.get_hit_ratio() == pytest.approx(2 / 3)
+
+
+async def test_aget_or_compute_caches_none():
+    compute = AsyncMock(return_value=None)
+
+    for _ in range(2):
+        assert (
+            await memberships_cache.aget_or_compute(
+                "role", "project", "pj1", "user1", compute
+            )
+            is None
+        )
+        memberships_cache.clear_local()
+
+    compute.assert_awaited_once()
+
+
+async def test_aget_or_compute_not_cached_in_memory(monkeypatch):
+    monkeypatch.setattr(settings.CACHE, "BACKEND", CacheBackendChoices.MEMORY)
+    compute = AsyncMock(return_value="role")
+
+    for _ in range(2):
+        assert (
+            await memberships_cache.aget_or_compute(
+                "role", "project", "pj1", "user1", compute
+            )
+            == "role"
+        )
+
+    assert compute.await_count == 2
+
+
+async def test_invalidate_drops_values_of_the_object():
+    compute = AsyncMock(return_value="role")
+    other_compute = AsyncMock(return_value="other role")
+    await memberships_cache.aget_or_compute("role", "project", "pj1", "user1", compute)
+    await memberships_cache.aget_or_compute(
+        "invitation", "project", "pj1", "user2", compute
+    )
+    await memberships_cache.aget_or_compute(
+        "role", "project", "pj2", "user1", other_compute
+    )
+
+    await memberships_cache.invalidate("project", "pj1")
+
+    await memberships_cache.aget_or_compute("role", "project", "pj1", "user1", compute)
+    await memberships_cache.aget_or_compute(
+        "invitation", "project", "pj1", "user2", compute
+    )
+    await memberships_cache.aget_or_compute(
+        "role", "project", "pj2", "user1", other_compute
+    )
+    assert compute.await_count == 4
+    other_compute.assert_awaited_once()
+    assert memberships_cache.get_stats()["local_hits"] == 1
+
+
+async def test_invalidate_during_compute_is_not_cached_locally():
+    async def compute():
+        await memberships_cache.invalidate("project", "pj1")
+        return "stale role"
+
+    await memberships_cache.aget_or_compute("role", "project", "pj1", "user1", compute)
+
+    assert (
+        memberships_cache._get_local(("role", "project", "pj1", "user1"))
+        is memberships_cache.MISSING
+    )
+
+
+async def test_invalidate_roles_cache_from_related_objects():
+    project = f.build_project()
+    workspace = f.build_workspace()
+    membership = f.build_project_membership(project=project)
+    invitation = f.build_workspace_invitation(workspace=workspace)
+
+    for obj, model_name, obj_id in [
+        (project, "project", project.id),
+        (membership, "project", project.id),
+        (workspace, "workspace", workspace.id),
+        (invitation, "workspace", workspace.id),
+    ]:
+        compute = AsyncMock(return_value="role")
+        await memberships_cache.aget_or_compute(
+            "role", model_name, obj_id, "user1", compute
+        )
+        await memberships_services.invalidate_roles_cache(obj)
+        await memberships_cache.aget_or_compute(
+            "role", model_name, obj_id, "user1", compute
+        )
+        assert compute.await_count == 2
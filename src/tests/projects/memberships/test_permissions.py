@@ -16,9 +16,14 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+from unittest.mock import patch
+
 import pytest
 
 from commons.exceptions import api as ex
+from memberships import repositories as memberships_repositories
+from memberships import services as memberships_services
+from memberships.context import roles_cache_scope
 from memberships.permissions import CanModifyAssociatedRole, HasPermission, IsMember
 from permissions import (
     check_permissions,
@@ -155,3 +160,48 @@ async def test_check_permission_can_modify_projects_membership():
     )
     with pytest.raises(ex.ForbiddenError):
         await check_permissions(permissions=permissions, user=user1, obj=membership1)
+
+
+@pytest.mark.django_db()
+async def test_check_permission_roles_are_cached_in_scope(project_template):
+    user = await f.create_user()
+    project = await f.create_project(project_template, created_by=user)
+    view = HasPermission("project", ProjectPermissions.VIEW_STORY)
+    modify = HasPermission("project", ProjectPermissions.MODIFY_STORY)
+
+    with patch(
+        "memberships.repositories.get_role",
+        wraps=memberships_repositories.get_role,
+    ) as fake_get_role:
+        with roles_cache_scope():
+            await check_permissions(permissions=view, user=user, obj=project)
+            await check_permissions(permissions=modify, user=user, obj=project)
+            assert user.project_role.is_owner
+        fake_get_role.assert_awaited_once()
+
+        # out of the scope, the role comes from the shared roles cache
+        await check_permissions(permissions=view, user=user, obj=project)
+        fake_get_role.assert_awaited_once()
+
+        await memberships_services.invalidate_roles_cache(project)
+        await check_permissions(permissions=view, user=user, obj=project)
+        assert fake_get_role.await_count == 2
+
+
+@pytest.mark.django_db()
+async def test_check_permission_not_member_is_cached_in_scope(project_template):
+    user = await f.create_user()
+    project = await f.create_project(project_template)
+    permissions = IsMember("project")
+
+    with patch(
+        "memberships.repositories.get_role",
+        wraps=memberships_repositories.get_role,
+    ) as fake_get_role:
+        with roles_cache_scope():
+            for _ in range(2):
+                with pytest.raises(ex.ForbiddenError):
+                    await check_permissions(
+                        permissions=permissions, user=user, obj=project
+                    )
+        fake_get_role.assert_awaited_once()
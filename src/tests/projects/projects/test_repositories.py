@@ -16,19 +16,16 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 # You can contact BIRU at ask@biru.sh
-from uuid import uuid1
 
 import pytest
-from asgiref.sync import sync_to_async
 from django.core.files import File
 from django.db import models
 
-from base.db import sequences as seq
 from import_export.models import ImportationStatus
 from memberships.choices import InvitationStatus
-from projects import references
 from projects.projects import repositories
 from projects.projects.models import Project
+from projects.references.models import ProjectReferencesCounter
 from tests.utils import factories as f
 from tests.utils.bad_params import NOT_EXISTING_UUID
 
@@ -51,7 +48,6 @@ async def test_create_project():
         landing_page="",
     )
     assert project.slug == "my-test-project"
-    assert await _seq_exists(references.get_project_references_seqname(project.id))
 
 
 async def test_create_project_with_non_ASCI_chars():
@@ -65,7 +61,6 @@ async def test_create_project_with_non_ASCI_chars():
         landing_page="",
     )
     assert project.slug == "my-proj-hu-shect"
-    assert await _seq_exists(references.get_project_references_seqname(project.id))
 
 
 async def test_create_project_with_logo():
@@ -81,7 +76,6 @@ async def test_create_project_with_logo():
         landing_page="",
     )
     assert project.logo.name.endswith(image_file.name)
-    assert await _seq_exists(references.get_project_references_seqname(project.id))
 
 
 async def test_create_project_with_no_logo():
@@ -96,7 +90,6 @@ async def test_create_project_with_no_logo():
         landing_page="",
     )
     assert project.logo == File(None)
-    assert await _seq_exists(references.get_project_references_seqname(project.id))
 
 
 ##########################################################
@@ -185,6 +178,20 @@ async def test_get_project_return_none():
         await repositories.get_project(project_id=NOT_EXISTING_UUID)
 
 
+async def test_get_project_deleted(project_template):
+    project = await f.create_project(template=project_template)
+    await repositories.mark_project_as_deleted(
+        project=project, deleted_by=project.created_by
+    )
+
+    with pytest.raises(Project.DoesNotExist):
+        await repositories.get_project(project_id=project.id)
+    assert (
+        await repositories.get_project(project_id=project.id, include_deleted=True)
+        == project
+    )
+
+
 ##########################################################
 # update project
 ##########################################################
@@ -221,6 +228,19 @@ async def test_update_project_delete_logo(project_template):
     assert updated_project.logo == models.FileField(None)
 
 
+async def test_mark_project_as_deleted(project_template):
+    project = await f.create_project(template=project_template)
+    assert project.deleted_at is None
+
+    await repositories.mark_project_as_deleted(
+        project=project, deleted_by=project.created_by
+    )
+    await project.arefresh_from_db()
+    assert project.deleted_at is not None
+    assert project.deleted_by_id == project.created_by_id
+    assert await repositories.get_total_projects(workspace_id=project.workspace_id) == 0
+
+
 ##########################################################
 # delete_projects
 ##########################################################
@@ -233,14 +253,15 @@ async def test_delete_projects(project_template):
     await f.create_project_invitation(
         project=project, role=await project.roles.filter(is_owner=False).afirst()
     )
-    seqname = references.get_project_references_seqname(project.id)
+    await f.create_story(project=project)
 
-    assert await _seq_exists(seqname)
     deleted = await repositories.delete_projects(project_id=project.id)
     assert (
-        deleted == 12
-    )  # 1 project, 1 workflow, 4 statuses, 1 invitation, 1 membership, 4 roles
-    assert not await _seq_exists(seqname)
+        deleted == 16
+    )  # 1 project, 2 workflows, 5 statuses, 1 story, 1 invitation, 1 membership, 4 roles, 1 references counter
+    assert not await ProjectReferencesCounter.objects.filter(
+        project_id=project.id
+    ).aexists()
 
 
 ##########################################################
@@ -288,11 +309,3 @@ async def test_get_template_return_template():
     assert (
         await repositories.get_project_template(filters={"slug": "kanban"}) is not None
     )
-
-
-##########################################################
-# utils
-##########################################################
-
-
-_seq_exists = sync_to_async(seq.exists)
@@ -20,8 +20,15 @@
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from django.conf import settings
+from django.test import override_settings
 
+from attachments.models import Attachment
+from comments.models import Comment
+from commons.storage.models import StoragedObject
+from commons.utils import get_absolute_url
 from import_export.models import ImportationStatus
+from ninja_jwt.utils import aware_utcnow
 from permissions.choices import ProjectPermissions
 from projects.projects import services
 from projects.projects.models import ProjectTemplate
@@ -451,7 +458,8 @@ async def test_update_project_ok_with_new_logo(tqmanager):
             project=project, values=values
         )
         fake_updated_project = fake_pj_repo.update_project.return_value
-        assert len(tqmanager.pending_jobs) == 0
+        assert len(tqmanager.pending_jobs) == 1
+        assert "generate_logo_thumbnails" in tqmanager.pending_jobs[0]["task_name"]
         fake_get_project_detail.assert_awaited_once_with(
             project=fake_updated_project, user=user, importation=None
         )
@@ -485,11 +493,12 @@ async def test_update_project_ok_with_logo_replacement(tqmanager):
             project=project, values=values
         )
         fake_updated_project = fake_pj_repo.update_project.return_value
-        assert len(tqmanager.pending_jobs) == 1
+        assert len(tqmanager.pending_jobs) == 2
         job = tqmanager.pending_jobs[0]
         assert "delete_old_logo" in job["task_name"]
         assert "file_name" in job["args"]
         assert job["args"]["file_name"] == logo.name
+        assert "generate_logo_thumbnails" in tqmanager.pending_jobs[1]["task_name"]
         fake_get_project_detail.assert_awaited_once_with(
             project=fake_updated_project, user=user, importation=None
         )
@@ -614,9 +623,9 @@ async def test_update_project_landing_page_ok_new_slug():
 ##########################################################
 
 
-async def test_delete_project_fail():
+async def test_delete_project_already_deleted():
     user = f.build_user()
-    project = f.build_project()
+    project = f.build_project(deleted_at=aware_utcnow())
 
     with (
         patch(
@@ -627,20 +636,15 @@ async def test_delete_project_fail():
         ) as fake_projects_events,
         patch_db_transaction(),
     ):
-        fake_projects_repo.delete_projects.return_value = 0
-
-        await services.delete_project(project=project, deleted_by=user)
+        assert await services.delete_project(project=project, deleted_by=user) is False
 
         fake_projects_events.emit_event_when_project_is_deleted.assert_not_awaited()
-        fake_projects_repo.delete_projects.assert_awaited_once_with(
-            project_id=project.id,
-        )
+        fake_projects_repo.mark_project_as_deleted.assert_not_awaited()
 
 
 async def test_delete_project_ok(tqmanager):
     user = f.build_user()
-    logo = f.build_image_file()
-    project = f.build_project(logo=logo)
+    project = f.build_project()
 
     with (
         patch(
@@ -651,17 +655,187 @@ async def test_delete_project_ok(tqmanager):
         ) as fake_projects_events,
         patch_db_transaction(),
     ):
-        fake_projects_repo.delete_projects.return_value = 1
+        assert await services.delete_project(project=project, deleted_by=user) is True
 
-        await services.delete_project(project=project, deleted_by=user)
+        fake_projects_repo.mark_project_as_deleted.assert_awaited_once_with(
+            project=project, deleted_by=user
+        )
+        fake_projects_repo.delete_projects.assert_not_awaited()
         fake_projects_events.emit_event_when_project_is_deleted.assert_awaited_once_with(
             workspace_id=project.workspace_id, project=project, deleted_by=user
         )
+        assert len(tqmanager.pending_jobs) == 1
+        job = tqmanager.pending_jobs[0]
+        assert "delete_project" in job["task_name"]
+        assert job["args"] == {"project_id": project.b64id}
+
+
+##########################################################
+# do_delete_project
+##########################################################
+
+
+async def test_do_delete_project_not_deleted():
+    project = f.build_project()
+
+    with (
+        patch(
+            "projects.projects.services.projects_repositories", autospec=True
+        ) as fake_projects_repo,
+        patch(
+            "projects.projects.services.projects_events", autospec=True
+        ) as fake_projects_events,
+    ):
+        fake_projects_repo.get_project.return_value = project
+
+        assert await services.do_delete_project(project_id=project.id) is False
+
+        fake_projects_repo.delete_projects.assert_not_awaited()
+        fake_projects_events.emit_event_when_project_deletion_is_completed.assert_not_awaited()
+
+
+async def test_do_delete_project_ok(tqmanager):
+    user = f.build_user()
+    logo = f.build_image_file()
+    project = f.build_project(logo=logo, deleted_at=aware_utcnow(), deleted_by=user)
+
+    with (
+        patch(
+            "projects.projects.services.projects_repositories", autospec=True
+        ) as fake_projects_repo,
+        patch(
+            "projects.projects.services.stories_repositories", autospec=True
+        ) as fake_stories_repo,
+        patch(
+            "projects.projects.services._delete_project_stories_chunk", autospec=True
+        ) as fake_delete_project_stories_chunk,
+        patch(
+            "projects.projects.services.projects_events", autospec=True
+        ) as fake_projects_events,
+    ):
+        fake_projects_repo.get_project.return_value = project
+        fake_projects_repo.delete_projects.return_value = 1
+        fake_stories_repo.list_stories_qs.return_value.acount = AsyncMock(
+            return_value=3
+        )
+        fake_delete_project_stories_chunk.side_effect = [2, 1, 0]
+
+        assert await services.do_delete_project(project_id=project.id) is True
+
+        fake_projects_repo.get_project.assert_awaited_once_with(
+            project_id=project.id, select_related=[None], include_deleted=True
+        )
+        assert fake_delete_project_stories_chunk.await_count == 3
+        assert [
+            call.kwargs["progress_percentage"]
+            for call in fake_projects_events.emit_event_when_project_deletion_progresses.await_args_list
+        ] == [66, 100]
         fake_projects_repo.delete_projects.assert_awaited_once_with(
-            project_id=project.id,
+            project_id=project.id
+        )
+        fake_projects_events.emit_event_when_project_deletion_is_completed.assert_awaited_once_with(
+            project=project
         )
         assert len(tqmanager.pending_jobs) == 1
         job = tqmanager.pending_jobs[0]
         assert "delete_old_logo" in job["task_name"]
-        assert "file_name" in job["args"]
         assert job["args"]["file_name"] == logo.name
+
+
+@pytest.mark.django_db
+@override_settings(DELETE_PROJECT_STORIES_CHUNK_SIZE=2)
+async def test_delete_project_stories_chunk(project_template):
+    project = await f.create_project(project_template)
+    stories = [await f.create_story(project=project) for _ in range(3)]
+    attachment = await f.create_attachment(content_object=stories[0])
+    await f.create_comment(content_object=stories[0])
+
+    assert await services._delete_project_stories_chunk(project=project) == 2
+    assert await services._delete_project_stories_chunk(project=project) == 1
+    assert await services._delete_project_stories_chunk(project=project) == 0
+    assert not await Attachment.objects.filter(id=attachment.id).aexists()
+    assert not await Comment.objects.filter(object_id=stories[0].id).aexists()
+    assert await StoragedObject.objects.filter(
+        id=attachment.storaged_object_id, deleted_at__isnull=False
+    ).aexists()
+
+
+##########################################################
+# get_logo
+##########################################################
+
+
+async def test_get_logo_thumbnail():
+    project = f.build_project(logo=f.build_image_file())
+
+    with patch(
+        "projects.projects.services.get_thumbnail", autospec=True
+    ) as fake_get_thumbnail:
+        assert (
+            await services.get_logo(project, "small") == fake_get_thumbnail.return_value
+        )
+        fake_get_thumbnail.assert_awaited_once_with(
+            project.logo, settings.IMAGES.THUMBNAIL_FORMAT_SMALL
+        )
+
+
+async def test_get_logo_thumbnail_not_generated_yet(tqmanager):
+    project = f.build_project(logo=f.build_image_file())
+
+    with patch(
+        "projects.projects.services.get_thumbnail", autospec=True, return_value=None
+    ):
+        assert await services.get_logo(project, "large") == project.logo
+        # a single job is deferred until it's done
+        assert await services.get_logo(project, "small") == project.logo
+
+    assert len(tqmanager.pending_jobs) == 1
+    job = tqmanager.pending_jobs[0]
+    assert "generate_logo_thumbnails" in job["task_name"]
+    assert job["args"] == {"project_id": project.b64id}
+
+
+async def test_get_logo_url_thumbnail_not_generated_yet(tqmanager):
+    project = f.build_project(logo=f.build_image_file())
+
+    with patch(
+        "projects.projects.services.get_thumbnail", autospec=True, return_value=None
+    ):
+        assert await services.get_logo_url(project, "small") == get_absolute_url(
+            project.logo.url
+        )
+
+    assert len(tqmanager.pending_jobs) == 1
+
+
+async def test_get_logo_url_without_logo(tqmanager):
+    project = f.build_project(logo=None)
+
+    assert await services.get_logo_url(project, "small") is None
+    assert len(tqmanager.pending_jobs) == 0
+
+
+##########################################################
+# generate_logo_thumbnails
+##########################################################
+
+
+async def test_generate_logo_thumbnails():
+    project = f.build_project(logo=f.build_image_file())
+
+    with (
+        patch(
+            "projects.projects.services.projects_repositories", autospec=True
+        ) as fake_projects_repo,
+        patch(
+            "projects.projects.services.generate_thumbnails", autospec=True
+        ) as fake_generate_thumbnails,
+    ):
+        fake_projects_repo.get_project.return_value = project
+
+        await services.generate_logo_thumbnails(project_id=project.id)
+
+        fake_projects_repo.get_project.assert_awaited_once_with(
+            project_id=project.id, select_related=[None]
+        )
+        fake_generate_thumbnails.assert_awaited_once_with(project.logo)
@@ -17,58 +17,108 @@
 #
 # You can contact BIRU at ask@biru.sh
 
-from uuid import uuid1
+from unittest.mock import patch
 
 import pytest
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.test import override_settings
 
-from base.db import sequences as seq
 from projects import references as refs
+from projects.references.models import ProjectReferencesCounter
+from tests.utils import factories as f
 
 pytestmark = pytest.mark.django_db
 
 
-def test_get_project_references_seqname():
-    project1_id = uuid1()
-    project2_id = uuid1()
-
-    seqname1 = refs.get_project_references_seqname(project1_id)
-    seqname2 = refs.get_project_references_seqname(project2_id)
-
-    assert project1_id.hex in seqname1
-    assert project2_id.hex in seqname2
-
-
-def test_create_project_references_sequence():
-    project1_id = uuid1()
-    project2_id = uuid1()
-
-    refs.create_project_references_sequence(project1_id)
-    refs.create_project_references_sequence(project2_id)
-
-    assert refs.get_new_project_reference_id(project1_id) == 1
-    assert refs.get_new_project_reference_id(project2_id) == 1
-    assert refs.get_new_project_reference_id(project2_id) == 2
-
-    refs.create_project_references_sequence(project1_id)  # do nothing
-    refs.create_project_references_sequence(project2_id)  # do nothing
-
-    assert refs.get_new_project_reference_id(project2_id) == 3
-    assert refs.get_new_project_reference_id(project1_id) == 2
-
-
-def test_get_new_project_reference_id_if_sequence_does_not_exist():
-    project_id = uuid1()
-    seqname = refs.get_project_references_seqname(project_id)
-
-    assert not seq.exists(seqname)
-    assert refs.get_new_project_reference_id(project_id) == 1
-    assert seq.exists(seqname)
-
-
-def test_delete_project_references_sequence():
-    project_id = uuid1()
-
-    refs.create_project_references_sequence(project_id)
-
-    refs.delete_project_references_sequences([project_id])
-    assert not seq.exists(refs.get_project_references_seqname(project_id))
+@pytest.fixture(autouse=True)
+def clear_blocks():
+    yield
+    refs._blocks.clear()
+
+
+@override_settings(PROJECT_REFERENCES_BLOCK_SIZE=1)
+def test_get_new_project_reference_id():
+    project1 = f.ProjectFactory.create()
+    project2 = f.ProjectFactory.create()
+
+    assert refs.get_new_project_reference_id(project1.id) == 1
+    assert refs.get_new_project_reference_id(project2.id) == 1
+    assert refs.get_new_project_reference_id(project2.id) == 2
+    assert refs.get_new_project_reference_id(project2.id) == 3
+    assert refs.get_new_project_reference_id(project1.id) == 2
+    assert ProjectReferencesCounter.objects.get(project_id=project2.id).last_ref == 3
+
+
+# blocks are only kept in memory outside transactions
+@pytest.mark.django_db(transaction=True)
+@override_settings(PROJECT_REFERENCES_BLOCK_SIZE=5)
+def test_get_multiple_new_project_reference_ids_by_blocks():
+    project = f.ProjectFactory.create()
+
+    with patch("projects.references._reserve", wraps=refs._reserve) as fake_reserve:
+        assert list(refs.get_multiple_new_project_reference_ids(project.id, 2)) == [
+            1,
+            2,
+        ]
+        assert ProjectReferencesCounter.objects.get(project_id=project.id).last_ref == 5
+        # served from the block of the process
+        assert list(refs.get_multiple_new_project_reference_ids(project.id, 3)) == [
+            3,
+            4,
+            5,
+        ]
+        assert fake_reserve.call_count == 1
+        # the end of the block is used before reserving a new one
+        assert refs.get_new_project_reference_id(project.id) == 6
+        assert list(refs.get_multiple_new_project_reference_ids(project.id, 6)) == [
+            7,
+            8,
+            9,
+            10,
+            11,
+            12,
+        ]
+        assert fake_reserve.call_count == 3
+
+    assert ProjectReferencesCounter.objects.get(project_id=project.id).last_ref == 12
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(PROJECT_REFERENCES_BLOCK_SIZE=5)
+def test_get_new_project_reference_id_in_transaction():
+    project = f.ProjectFactory.create()
+
+    with transaction.atomic():
+        assert refs.get_new_project_reference_id(project.id) == 1
+        assert refs.get_new_project_reference_id(project.id) == 2
+
+    # nothing has been kept in memory
+    assert project.id not in refs._blocks
+    assert ProjectReferencesCounter.objects.get(project_id=project.id).last_ref == 2
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(PROJECT_REFERENCES_BLOCK_SIZE=3)
+async def test_aget_multiple_new_project_reference_ids():
+    project = await f.create_simple_project()
+
+    assert list(await refs.aget_multiple_new_project_reference_ids(project.id, 2)) == [
+        1,
+        2,
+    ]
+    assert await refs.aget_new_project_reference_id(project.id) == 3
+    assert await refs.aget_new_project_reference_id(project.id) == 4
+    assert (
+        await sync_to_async(ProjectReferencesCounter.objects.get)(project_id=project.id)
+    ).last_ref == 6
+
+
+@pytest.mark.django_db(transaction=True)
+def test_forget_project_references():
+    project = f.ProjectFactory.create()
+    refs.get_new_project_reference_id(project.id)
+    assert project.id in refs._blocks
+
+    refs.forget_project_references([project.id])
+    assert project.id not in refs._blocks
@@ -20,6 +20,7 @@
 
 from configurations.settings import *  # noqa
 from configurations.settings import ACCOUNT
+from configurations.settings import CACHES
 from configurations.settings import INSTALLED_APPS
 
 DEBUG = True
@@ -59,6 +60,15 @@ STORAGES = {
     },
 }
 
+# the tests run in a single process, the local memory is enough (no redis server needed)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "KEY_PREFIX": CACHES["default"]["KEY_PREFIX"],
+        "TIMEOUT": CACHES["default"]["TIMEOUT"],
+    },
+}
+
 REQUIRED_TERMS = True
 MAX_UPLOAD_FILE_SIZE = 1 * 1024  # 1 KB
 
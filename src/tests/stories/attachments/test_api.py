@@ -17,11 +17,16 @@
 #
 # You can contact BIRU at ask@biru.sh
 
+from unittest.mock import patch
+
 import pytest
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient
 
+from ninja_jwt.tokens import AccessToken
 from permissions.choices import ProjectPermissions
+from projects.projects import repositories as projects_repositories
 from tests.utils import factories as f
 from tests.utils.bad_params import (
     INVALID_B64ID,
@@ -87,6 +92,32 @@ async def test_create_story_attachment_401_forbidden_anonymous(
     assert response.status_code == 401, response.data
 
 
+@pytest.mark.parametrize("logged", [False, True])
+async def test_create_story_attachment_unauthorized_upload_not_stored(
+    project_template, logged
+):
+    project = await f.create_project(project_template)
+    story = await f.create_story(project=project)
+    client = AsyncClient()
+    headers = {}
+    if logged:
+        # not a member of the project
+        user = await f.create_user()
+        headers["Authorization"] = f"Bearer {AccessToken.for_user(user)}"
+
+    with patch(
+        "commons.storage.uploadhandler.open_storage_writer", autospec=True
+    ) as fake_open_storage_writer:
+        response = await client.post(
+            f"/api/{settings.API_VERSION}/projects/{project.b64id}/stories/{story.ref}/attachments",
+            {"file": SimpleUploadedFile("test.txt", b"data345")},
+            headers=headers,
+        )
+
+    assert response.status_code == (403 if logged else 401), response.content
+    fake_open_storage_writer.assert_not_called()
+
+
 async def test_create_story_attachment_403_forbidden_error_not_member(
     client, project_template
 ):
@@ -308,6 +339,65 @@ async def test_list_story_attachments_404_not_found_story(client, project_templa
     assert response.status_code == 404, response.data
 
 
+##########################################################
+# GET projects/<id>/stories/<ref>/attachments.zip
+##########################################################
+
+
+async def test_get_story_attachments_zip_200_ok(client, project_template):
+    project = await f.create_project(project_template)
+    user = project.created_by
+    story = await f.create_story(project=project)
+    await f.create_attachment(content_object=story, created_by=user)
+    await f.create_attachment(content_object=story, created_by=user)
+
+    client.login(user)
+    response = await client.get(
+        f"/projects/{project.b64id}/stories/{story.ref}/attachments.zip"
+    )
+    assert response.status_code == 200, response.data
+    assert response["Content-Type"] == "application/zip"
+
+
+async def test_get_story_attachments_zip_403_forbidden_no_permission(
+    client, project_template
+):
+    project = await f.create_project(project_template)
+    story = await f.create_story(project=project)
+    await f.create_attachment(content_object=story, created_by=project.created_by)
+    user = await f.create_user()
+
+    client.login(user)
+    response = await client.get(
+        f"/projects/{project.b64id}/stories/{story.ref}/attachments.zip"
+    )
+    assert response.status_code == 403, response.data
+
+
+async def test_get_story_attachments_zip_404_not_found_story(client, project_template):
+    project = await f.create_project(project_template)
+
+    client.login(project.created_by)
+    response = await client.get(
+        f"/projects/{project.b64id}/stories/{NOT_EXISTING_REF}/attachments.zip"
+    )
+    assert response.status_code == 404, response.data
+
+
+async def test_get_story_attachments_zip_404_deleted_project(client, project_template):
+    project = await f.create_project(project_template)
+    story = await f.create_story(project=project)
+    await projects_repositories.mark_project_as_deleted(
+        project=project, deleted_by=project.created_by
+    )
+
+    client.login(project.created_by)
+    response = await client.get(
+        f"/projects/{project.b64id}/stories/{story.ref}/attachments.zip"
+    )
+    assert response.status_code == 404, response.data
+
+
 ##########################################################
 # DELETE stories/attachments/<id>
 ##########################################################
@@ -436,6 +526,34 @@ async def test_get_story_attachment_file_200_ok(client, project_template):
     assert response.status_code == 200, response.data["data"]
 
 
+async def test_get_story_attachment_file_404_deleted_project(client, project_template):
+    project = await f.create_project(project_template)
+    story = await f.create_story(project=project)
+    user = project.created_by
+    attachment = await f.create_attachment(content_object=story, created_by=user)
+    await projects_repositories.mark_project_as_deleted(
+        project=project, deleted_by=user
+    )
+
+    client.login(user)
+    response = await client.get(f"/stories/attachments/{attachment.b64id}")
+    assert response.status_code == 404, response.data
+
+
+async def test_get_story_attachment_file_304_not_modified(client, project_template):
+    project = await f.create_project(project_template)
+    story = await f.create_story(project=project)
+    user = project.created_by
+    attachment = await f.create_attachment(content_object=story, created_by=user)
+
+    client.login(user)
+    response = await client.get(
+        f"/stories/attachments/{attachment.b64id}",
+        headers={"If-None-Match": f'"{attachment.storaged_object.b64id}"'},
+    )
+    assert response.status_code == 304, response.content
+
+
 async def test_get_story_attachment_file_401_forbidden_anonymous(
     client, project_template
 ):
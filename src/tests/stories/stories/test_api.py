@@ -20,6 +20,7 @@
 import pytest
 
 from permissions.choices import ProjectPermissions
+from projects.projects import repositories as projects_repositories
 from tests.utils import factories as f
 from tests.utils.bad_params import (
     INVALID_B64ID,
@@ -369,6 +370,19 @@ async def test_get_story_404_not_found_story_ref(client, project_template):
     assert response.status_code == 404, response.data
 
 
+async def test_get_story_404_deleted_project(client, project_template):
+    project = await f.create_project(project_template)
+    story = await f.create_story(project=project)
+    await projects_repositories.mark_project_as_deleted(
+        project=project, deleted_by=project.created_by
+    )
+
+    client.login(project.created_by)
+    response = await client.get(f"/projects/{project.b64id}/stories/{story.ref}")
+
+    assert response.status_code == 404, response.data
+
+
 async def test_get_story_422_unprocessable_project_b64id(client):
     pj_owner = await f.create_user()
 
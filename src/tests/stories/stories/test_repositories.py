@@ -219,6 +219,23 @@ async def test_delete_stories() -> None:
     )
 
 
+async def test_delete_stories_by_ids(project_template) -> None:
+    project = await f.create_project(project_template)
+    workflow = await sync_to_async(project.workflows.first)()
+    story1 = await f.create_story(project=project, workflow=workflow)
+    story2 = await f.create_story(project=project, workflow=workflow)
+    story3 = await f.create_story(project=project, workflow=workflow)
+    await f.create_story_assignment(story=story1)
+
+    deleted = await repositories.delete_stories(
+        filters={"id__in": [story1.id, story2.id]}
+    )
+    assert deleted == 2  # the assignment isn't counted
+    assert [s.id async for s in Story.objects.filter(project_id=project.id)] == [
+        story3.id
+    ]
+
+
 ##########################################################
 # misc - list_story_neighbors
 ##########################################################
@@ -366,3 +383,31 @@ async def test_bulk_update_workflow_to_stories(project_template) -> None:
     assert story1 in stories and story2 in stories
     assert stories[0].workflow == new_workflow
     assert stories[1].workflow == new_workflow
+
+
+async def test_bulk_update_workflow_to_stories_by_chunks() -> None:
+    status = await f.create_workflow_status()
+    old_workflow = status.workflow
+    new_workflow = await f.create_workflow(project=old_workflow.project)
+    for _ in range(3):
+        await f.create_story(
+            project=old_workflow.project, workflow=old_workflow, status=status
+        )
+
+    updated = [
+        await repositories.bulk_update_workflow_to_stories(
+            statuses_ids=[status.id],
+            old_workflow_id=old_workflow.id,
+            new_workflow_id=new_workflow.id,
+            limit=2,
+        )
+        for _ in range(3)
+    ]
+
+    assert updated == [2, 1, 0]
+    assert (
+        await repositories.list_stories_qs(
+            filters={"workflow_id": new_workflow.id}
+        ).acount()
+        == 3
+    )
@@ -210,7 +210,10 @@ async def test_get_story_detail_ok():
 
         fake_stories_repo.get_story.assert_awaited_once_with(
             ref=story2.ref,
-            filters={"project_id": story2.project_id},
+            filters={
+                "project_id": story2.project_id,
+                "project__deleted_at__isnull": True,
+            },
             select_related=[
                 "created_by",
                 "project",
@@ -249,7 +252,10 @@ async def test_get_story_detail_no_neighbors():
 
         fake_stories_repo.get_story.assert_awaited_once_with(
             ref=story1.ref,
-            filters={"project_id": story1.project_id},
+            filters={
+                "project_id": story1.project_id,
+                "project__deleted_at__isnull": True,
+            },
             select_related=[
                 "created_by",
                 "project",
@@ -383,17 +383,26 @@ async def test_update_current_user_forbiddden_ldap_only(client):
 #####################################################################
 
 
-async def test_delete_user_204_ok(client):
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+async def test_delete_user_204_ok(client, tqmanager):
     user = await f.create_user(username="user", is_active=True)
 
     client.login(user)
     response = await client.delete("/users/me")
     assert response.status_code == 204, response.data
+
+    # the user is deactivated at once and deleted by a background job
+    await user.arefresh_from_db()
+    assert not user.is_active
+    assert len(tqmanager.pending_jobs) == 1
+
+    await tqmanager.run_async()
+    assert tqmanager.succeeded_jobs and not tqmanager.failed_jobs
     assert not await User.objects.aexists()
 
 
 @pytest.mark.django_db(transaction=True, serialized_rollback=True)
-async def test_delete_user_204_complex_data(client, project_template):
+async def test_delete_user_204_complex_data(client, project_template, tqmanager):
     user = await f.create_user(username="user", is_active=True)
     other_user = await f.create_user(username="other_user", is_active=True)
     # user only ws and pj member
@@ -454,6 +463,10 @@ async def test_delete_user_204_complex_data(client, project_template):
     response = await client.delete("/users/me")
     assert response.status_code == 204, response.data
 
+    # deletion of the user, then of their projects
+    await tqmanager.run_async()
+    assert not tqmanager.failed_jobs
+
     with pytest.raises(User.DoesNotExist):
         await user.arefresh_from_db()
 
@@ -20,9 +20,11 @@
 
 import pytest
 from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.db import IntegrityError
 from django.test import override_settings
 
+from configurations.conf.cache import CacheBackendChoices
 from memberships.choices import InvitationStatus
 from ninja_jwt.utils import aware_utcnow
 from projects.projects.models import ProjectTemplate
@@ -319,6 +321,44 @@ async def test_list_project_users_text_weights(_setup_user_text_search_data):
     assert _setup_user_text_search_data.storm not in result
 
 
+async def test_list_project_users_by_text_after_cursor(_setup_user_text_search_data):
+    # keyset pagination returns the same pages as offset pagination
+    for text_search in ("", "EL"):
+        all_users = await users_repositories.list_project_users_by_text(
+            text_search=text_search, project_id=_setup_user_text_search_data.project.id
+        )
+        first_page = await users_repositories.list_project_users_by_text(
+            text_search=text_search,
+            project_id=_setup_user_text_search_data.project.id,
+            offset=0,
+            limit=2,
+        )
+        second_page = await users_repositories.list_project_users_by_text(
+            text_search=text_search,
+            project_id=_setup_user_text_search_data.project.id,
+            offset=0,
+            limit=2,
+            after=users_repositories.get_user_search_cursor(first_page[-1]),
+        )
+        assert first_page + second_page == all_users[:4]
+
+
+async def test_list_project_users_by_text_after_update(_setup_user_text_search_data):
+    # the stored search vector follows the changes of full_name and username
+    await users_repositories.update_user(
+        user=_setup_user_text_search_data.storm,
+        values={"full_name": "Ororo Munroe", "username": "ororo"},
+    )
+
+    assert (
+        await users_repositories.list_project_users_by_text(text_search="storm") == []
+    )
+    result = await users_repositories.list_project_users_by_text(text_search="munroe")
+    assert result == [_setup_user_text_search_data.storm]
+    result = await users_repositories.list_project_users_by_text(text_search="ororo")
+    assert result == [_setup_user_text_search_data.storm]
+
+
 ##########################################################
 # list_workspace_users_by_text
 ##########################################################
@@ -397,6 +437,24 @@ async def test_list_workspace_users_text_weights(_setup_user_text_search_data):
     assert _setup_user_text_search_data.storm not in result
 
 
+async def test_list_workspace_users_by_text_after_cursor(_setup_user_text_search_data):
+    all_users = await users_repositories.list_workspace_users_by_text(
+        workspace_id=_setup_user_text_search_data.workspace.id
+    )
+    users = []
+    after = None
+    while page := await users_repositories.list_workspace_users_by_text(
+        workspace_id=_setup_user_text_search_data.workspace.id,
+        offset=0,
+        limit=3,
+        after=after,
+    ):
+        users += page
+        after = users_repositories.get_user_search_cursor(page[-1])
+
+    assert users == all_users
+
+
 ##########################################################
 # get_user
 ##########################################################
@@ -465,6 +523,19 @@ async def test_update_user():
     assert updated_user.username == "new_username"
 
 
+async def test_update_user_search_vector_only_on_names_update():
+    user = await f.create_user(full_name="Old Name")
+    qs = User.objects.filter(id=user.id)
+    await qs.aupdate(search_vector=None)
+
+    # not recomputed by the updates of the other fields
+    await qs.aupdate(last_login=aware_utcnow())
+    assert (await qs.values_list("search_vector", flat=True).aget()) is None
+
+    await qs.aupdate(full_name="New Name")
+    assert (await qs.values_list("search_vector", flat=True).aget()) is not None
+
+
 ##########################################################
 # delete_user
 ##########################################################
@@ -477,6 +548,30 @@ async def test_delete_user():
     assert deleted == 1
 
 
+##########################################################
+# user - cache
+##########################################################
+
+
+async def test_cached_user():
+    user = await f.create_user()
+    assert await users_repositories.get_cached_user(user.id) is None
+
+    await users_repositories.set_cached_user(user)
+    assert (await users_repositories.get_cached_user(user.id)).id == user.id
+
+    await users_repositories.delete_cached_user(user.id)
+    assert await users_repositories.get_cached_user(user.id) is None
+
+
+async def test_cached_user_not_cached_in_memory(monkeypatch):
+    monkeypatch.setattr(settings.CACHE, "BACKEND", CacheBackendChoices.MEMORY)
+    user = await f.create_user()
+
+    await users_repositories.set_cached_user(user)
+    assert await users_repositories.get_cached_user(user.id) is None
+
+
 ##########################################################
 # misc - check_password / change_password
 ##########################################################
@@ -22,6 +22,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from django.conf import settings
+from django.test import override_settings
 
 from memberships.choices import InvitationStatus
 from memberships.services.exceptions import (
@@ -32,7 +33,6 @@ from ninja_jwt.exceptions import TokenError
 from ninja_jwt.schema import TokenObtainPairOutputSchema
 from projects.invitations.models import ProjectInvitation
 from projects.memberships.models import ProjectMembership
-from projects.projects.models import Project
 from tests.utils import factories as f
 from tests.utils.utils import patch_db_transaction, preserve_real_attrs
 from users import services
@@ -41,7 +41,6 @@ from users.services import exceptions as ex
 from users.tokens import ResetPasswordToken, VerifyUserToken
 from workspaces.invitations.models import WorkspaceInvitation
 from workspaces.memberships.models import WorkspaceMembership
-from workspaces.workspaces.models import Workspace
 
 ##########################################################
 # create_user
@@ -803,7 +802,7 @@ async def test_list_paginated_project_users_by_text_ok():
         )
 
         fake_users_repo.list_project_users_by_text.assert_awaited_with(
-            text_search="text", project_id="id", offset=9, limit=10
+            text_search="text", project_id="id", offset=9, limit=10, after=None
         )
 
         assert users == []
@@ -821,7 +820,7 @@ async def test_list_paginated_workspace_users_by_text_ok():
         )
 
         fake_users_repo.list_workspace_users_by_text.assert_awaited_with(
-            text_search="text", workspace_id="id", offset=9, limit=10
+            text_search="text", workspace_id="id", offset=9, limit=10, after=None
         )
 
         assert users == []
@@ -838,7 +837,7 @@ async def test_list_paginated_default_project_users_by_text_ok():
         )
 
         fake_users_repo.list_project_users_by_text.assert_awaited_with(
-            text_search="text", project_id=None, offset=9, limit=10
+            text_search="text", project_id=None, offset=9, limit=10, after=None
         )
 
         assert users == []
@@ -873,6 +872,63 @@ async def test_update_user_ok(tqmanager):
 
 async def test_delete_user_success():
     user = f.build_user(username="user", is_active=True)
+
+    with (
+        patch(
+            "users.services.ws_memberships_repositories", autospec=True
+        ) as fake_ws_memberships_repositories,
+        patch(
+            "users.services.pj_memberships_repositories", autospec=True
+        ) as fake_pj_memberships_repositories,
+        patch(
+            "users.services.users_repositories", autospec=True
+        ) as fake_users_repositories,
+        patch("users.services.users_tasks", autospec=True) as fake_users_tasks,
+        patch_db_transaction(),
+    ):
+        fake_ws_memberships_repositories.only_owner_queryset.return_value.aexists = (
+            AsyncMock(return_value=False)
+        )
+        fake_pj_memberships_repositories.only_owner_queryset.return_value.aexists = (
+            AsyncMock(return_value=False)
+        )
+
+        assert await services.delete_user(user=user)
+
+        fake_users_repositories.deactivate_user.assert_awaited_once_with(user)
+        fake_users_tasks.delete_user.defer_async.assert_awaited_once_with(
+            user_id=user.b64id
+        )
+        # the actual deletion is done by the job
+        fake_pj_memberships_repositories.only_project_member_queryset.assert_not_called()
+        fake_users_repositories.delete_user.assert_not_awaited()
+
+
+async def test_do_delete_user_active_user():
+    user = f.build_user(username="user", is_active=True)
+
+    with (
+        patch(
+            "users.services.pj_memberships_repositories", autospec=True
+        ) as fake_pj_memberships_repositories,
+        patch(
+            "users.services.users_repositories", autospec=True
+        ) as fake_users_repositories,
+    ):
+        fake_users_repositories.get_user.return_value = user
+
+        assert not await services.do_delete_user(user_id=user.id)
+
+        fake_users_repositories.get_user.assert_awaited_once_with(
+            filters={"id": user.id}
+        )
+        fake_pj_memberships_repositories.only_project_member_queryset.assert_not_called()
+        fake_users_repositories.delete_user.assert_not_awaited()
+
+
+@override_settings(DELETE_USER_CHUNK_SIZE=2)
+async def test_do_delete_user_success():
+    user = f.build_user(username="user", is_active=False)
     user2 = f.build_user(username="user2", is_active=True)
 
     ws1 = f.build_workspace(created_by=user)
@@ -952,14 +1008,10 @@ async def test_delete_user_success():
             "users.services.pj_invitations_events", autospec=True
         ) as fake_pj_invitations_events,
         patch("users.services.users_events", autospec=True) as fake_users_events,
+        patch("users.services.events_manager") as fake_events_manager,
         patch_db_transaction(),
     ):
-        fake_ws_memberships_repositories.only_owner_queryset.return_value.aexists = (
-            AsyncMock(return_value=False)
-        )
-        fake_pj_memberships_repositories.only_owner_queryset.return_value.aexists = (
-            AsyncMock(return_value=False)
-        )
+        fake_users_repositories.get_user.return_value = user
 
         # projects where user is the only pj member
         fake_pj_memberships_repositories.only_project_member_queryset.return_value.select_related.return_value.__aiter__.return_value = [
@@ -991,15 +1043,13 @@ async def test_delete_user_success():
 
         fake_users_repositories.delete_user.return_value = 1
 
-        deleted_user = await services.delete_user(user=user)
+        deleted_user = await services.do_delete_user(user_id=user.id)
 
-        # owner checks
-        fake_ws_memberships_repositories.only_owner_queryset.assert_called_once_with(
-            Workspace, user, is_collective=True
-        )
-        fake_pj_memberships_repositories.only_owner_queryset.assert_called_once_with(
-            Project, user, is_collective=True
+        fake_users_repositories.get_user.assert_awaited_once_with(
+            filters={"id": user.id}
         )
+        # 2 chunks of projects, 1 of workspaces and 1 for the memberships, invitations and user
+        assert fake_events_manager.batch.call_count == 4
 
         # projects deletion
         fake_pj_memberships_repositories.only_project_member_queryset.assert_called_once_with(
@@ -1089,7 +1139,7 @@ async def test_delete_user_success():
         fake_users_events.emit_event_when_user_is_deleted.assert_awaited_once_with(
             user=user
         )
-        assert deleted_user == 1
+        assert deleted_user
 
 
 async def test_delete_user_error_only_owner():
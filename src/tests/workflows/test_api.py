@@ -21,6 +21,7 @@ import pytest
 from asgiref.sync import sync_to_async
 
 from permissions.choices import ProjectPermissions
+from projects.projects import repositories as projects_repositories
 from tests.utils import factories as f
 from tests.utils.bad_params import INVALID_B64ID, NOT_EXISTING_B64ID, NOT_EXISTING_SLUG
 
@@ -224,6 +225,18 @@ async def test_get_workflow_404_not_found_b64id(client):
     assert response.status_code == 404, response.data
 
 
+async def test_get_workflow_404_deleted_project(client, project_template):
+    project = await f.create_project(project_template)
+    workflow = await f.create_workflow(project=project)
+    await projects_repositories.mark_project_as_deleted(
+        project=project, deleted_by=project.created_by
+    )
+
+    client.login(project.created_by)
+    response = await client.get(f"/workflows/{workflow.b64id}")
+    assert response.status_code == 404, response.data
+
+
 async def test_get_workflow_422_unprocessable_project_b64id(client):
     user = await f.create_user()
 
@@ -411,7 +424,7 @@ async def test_update_workflow_422_unprocessable_b64id(client, project_template)
 ################################################################################
 
 
-async def test_delete_workflow_204_ok_owner(client, project_template):
+async def test_delete_workflow_202_ok_owner(client, project_template, tqmanager):
     project = await f.create_project(project_template)
     deleted_workflow = await f.create_workflow(project=project)
     f.build_workflow_status(workflow=deleted_workflow, order=1)
@@ -424,11 +437,15 @@ async def test_delete_workflow_204_ok_owner(client, project_template):
     response = await client.delete(
         f"/workflows/{deleted_workflow.b64id}?moveTo={target_workflow.b64id}"
     )
-    assert response.status_code == 204, response.data
+    assert response.status_code == 202, response.data
+    assert len(tqmanager.pending_jobs) == 1
+    assert response.data["data"]["jobId"] == tqmanager.pending_jobs[0]["id"]
 
 
 @pytest.mark.django_db(transaction=True, serialized_rollback=True)
-async def test_delete_workflow_204_ok_member_with_permission(client, project_template):
+async def test_delete_workflow_202_ok_member_with_permission(
+    client, project_template, tqmanager
+):
     project = await f.create_project(project_template)
     deleted_workflow = await f.create_workflow(project=project)
     f.build_workflow_status(workflow=deleted_workflow, order=1)
@@ -449,7 +466,9 @@ async def test_delete_workflow_204_ok_member_with_permission(client, project_tem
     response = await client.delete(
         f"/workflows/{deleted_workflow.b64id}?moveTo={target_workflow.b64id}"
     )
-    assert response.status_code == 204, response.data
+    assert response.status_code == 202, response.data
+    assert len(tqmanager.pending_jobs) == 1
+    assert response.data["data"]["jobId"] == tqmanager.pending_jobs[0]["id"]
 
 
 async def test_delete_workflow_403_forbidden_not_member(client, project_template):
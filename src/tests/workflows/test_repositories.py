@@ -21,8 +21,10 @@ from unittest import IsolatedAsyncioTestCase
 
 import pytest
 from asgiref.sync import sync_to_async
+from django.conf import settings
 
 from commons.ordering import DEFAULT_ORDER_OFFSET
+from configurations.conf.cache import CacheBackendChoices
 from projects.projects.models import Project
 from tests.utils import factories as f
 from tests.utils.bad_params import NOT_EXISTING_UUID
@@ -67,6 +69,28 @@ async def test_list_workflows_schemas_ok(project_template) -> None:
     assert hasattr(workflows[0], "id")
 
 
+async def test_list_workflows_with_stories_count_ok() -> None:
+    workflow = await f.create_workflow(statuses=2)
+    statuses = await _list_workflow_statuses(workflow=workflow)
+    await f.create_story(
+        project=workflow.project, workflow=workflow, status=statuses[0]
+    )
+    await f.create_story(
+        project=workflow.project, workflow=workflow, status=statuses[0]
+    )
+
+    workflows = [
+        w
+        async for w in repositories.list_workflows_qs(
+            filters={"project_id": workflow.project_id},
+            prefetch_related=[repositories.STATUSES_WITH_STORIES_COUNT_PREFETCH],
+        )
+    ]
+
+    assert len(workflows) == 1
+    assert [s.stories_count for s in workflows[0].statuses.all()] == [2, 0]
+
+
 async def test_list_project_without_workflows_ok() -> None:
     project = await f.create_simple_project()
     workflows = [
@@ -137,6 +161,48 @@ async def test_delete_workflow_with_workflow_statuses_ok(project_template) -> No
     assert delete_ret == 1
 
 
+##########################################################
+# cached project workflows
+##########################################################
+
+
+async def test_cached_project_workflows_ok() -> None:
+    workflow = f.build_workflow()
+    project_id = workflow.project.id
+    assert await repositories.get_cached_project_workflows(project_id) is None
+
+    await repositories.set_cached_project_workflows(
+        project_id=project_id, workflows=["base"]
+    )
+    await repositories.set_cached_project_workflows(
+        project_id=project_id, workflows=["with count"], with_stories_count=True
+    )
+    assert await repositories.get_cached_project_workflows(project_id) == ["base"]
+    assert await repositories.get_cached_project_workflows(
+        project_id, with_stories_count=True
+    ) == ["with count"]
+
+    await repositories.delete_cached_project_workflows(project_id)
+    assert await repositories.get_cached_project_workflows(project_id) is None
+    assert (
+        await repositories.get_cached_project_workflows(
+            project_id, with_stories_count=True
+        )
+        is None
+    )
+
+
+async def test_cached_project_workflows_not_cached_in_memory(monkeypatch) -> None:
+    monkeypatch.setattr(settings.CACHE, "BACKEND", CacheBackendChoices.MEMORY)
+    workflow = f.build_workflow()
+    project_id = workflow.project.id
+
+    await repositories.set_cached_project_workflows(
+        project_id=project_id, workflows=["base"]
+    )
+    assert await repositories.get_cached_project_workflows(project_id) is None
+
+
 ##########################################################
 # create_workflow_status
 ##########################################################
@@ -17,20 +17,22 @@
 #
 # You can contact BIRU at ask@biru.sh
 
-from unittest.mock import patch
+import uuid
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from django.conf import settings
 from django.test import override_settings
 
 from base.repositories.neighbors import Neighbor
+from stories.stories import repositories as stories_repositories
 from tests.utils import factories as f
-from tests.utils.bad_params import NOT_EXISTING_SLUG
 from tests.utils.utils import patch_db_transaction
 from workflows import repositories, services
 from workflows.models import Workflow, WorkflowStatus
 from workflows.serializers import (
-    ReorderWorkflowStatusesSerializer,
     WorkflowNestedSerializer,
+    WorkflowSerializer,
 )
 from workflows.services import exceptions as ex
 
@@ -181,6 +183,73 @@ async def test_list_workflows_ok():
         )
 
 
+async def test_list_workflows_with_stories_count_ok():
+    workflow = f.build_workflow()
+
+    with patch(
+        "workflows.services.workflows_repositories", autospec=True
+    ) as fake_workflows_repo:
+        fake_workflows_repo.list_workflows_qs.return_value.__aiter__.return_value = [
+            workflow
+        ]
+        await services.list_workflows(
+            project_id=workflow.project.id, with_stories_count=True
+        )
+        fake_workflows_repo.list_workflows_qs.assert_called_once_with(
+            filters={"project_id": workflow.project.id},
+            prefetch_related=[fake_workflows_repo.STATUSES_WITH_STORIES_COUNT_PREFETCH],
+        )
+
+
+#######################################################
+# list_serialized_workflows
+#######################################################
+
+
+async def test_list_serialized_workflows_not_cached():
+    workflow_status = f.build_workflow_status()
+    workflow = f.build_workflow(statuses=[workflow_status])
+
+    with patch(
+        "workflows.services.workflows_repositories", autospec=True
+    ) as fake_workflows_repo:
+        fake_workflows_repo.get_cached_project_workflows.return_value = None
+        fake_workflows_repo.list_workflows_qs.return_value.__aiter__.return_value = [
+            workflow
+        ]
+        workflows = await services.list_serialized_workflows(
+            project_id=workflow.project.id, with_stories_count=True
+        )
+
+        assert workflows == [WorkflowSerializer.model_validate(workflow)]
+        fake_workflows_repo.get_cached_project_workflows.assert_awaited_once_with(
+            project_id=workflow.project.id, with_stories_count=True
+        )
+        fake_workflows_repo.list_workflows_qs.assert_called_once()
+        fake_workflows_repo.set_cached_project_workflows.assert_awaited_once_with(
+            project_id=workflow.project.id,
+            workflows=workflows,
+            with_stories_count=True,
+        )
+
+
+async def test_list_serialized_workflows_cached():
+    workflow = f.build_workflow(statuses=[f.build_workflow_status()])
+    cached_workflows = [WorkflowSerializer.model_validate(workflow)]
+
+    with patch(
+        "workflows.services.workflows_repositories", autospec=True
+    ) as fake_workflows_repo:
+        fake_workflows_repo.get_cached_project_workflows.return_value = cached_workflows
+        workflows = await services.list_serialized_workflows(
+            project_id=workflow.project.id
+        )
+
+        assert workflows == cached_workflows
+        fake_workflows_repo.list_workflows_qs.assert_not_called()
+        fake_workflows_repo.set_cached_project_workflows.assert_not_awaited()
+
+
 #######################################################
 # get_workflow
 #######################################################
@@ -365,7 +434,117 @@ async def test_update_workflow_status_none_name():
 #######################################################
 
 
-async def test_delete_workflow_no_target_workflow_ok():
+async def test_delete_workflow_defers_job_ok():
+    with (
+        patch(
+            "workflows.services.workflows_repositories", autospec=True
+        ) as fake_workflows_repo,
+        patch(
+            "workflows.tasks.delete_workflow", autospec=True
+        ) as fake_delete_workflow_task,
+    ):
+        user = f.build_user()
+        workflow = f.build_workflow()
+        fake_delete_workflow_task.defer_async.return_value = 42
+
+        ret = await services.delete_workflow(workflow=workflow, deleted_by=user)
+
+        fake_workflows_repo.get_workflow.assert_not_awaited()
+        fake_delete_workflow_task.defer_async.assert_awaited_once_with(
+            workflow_id=workflow.b64id,
+            deleted_by_id=user.b64id,
+            target_workflow_id=None,
+        )
+        assert ret == 42
+
+
+async def test_delete_workflow_with_target_workflow_defers_job_ok():
+    with (
+        patch(
+            "workflows.services.workflows_repositories", autospec=True
+        ) as fake_workflows_repo,
+        patch(
+            "workflows.tasks.delete_workflow", autospec=True
+        ) as fake_delete_workflow_task,
+    ):
+        user = f.build_user()
+        workflow = f.build_workflow()
+        target_workflow = f.build_workflow(project=workflow.project)
+        fake_workflows_repo.get_workflow.return_value = target_workflow
+        fake_delete_workflow_task.defer_async.return_value = 42
+
+        ret = await services.delete_workflow(
+            workflow=workflow, deleted_by=user, target_workflow_id=target_workflow.id
+        )
+
+        fake_workflows_repo.get_workflow.assert_awaited_once_with(
+            filters={"project_id": workflow.project_id, "id": target_workflow.id},
+            select_related=["project"],
+        )
+        fake_delete_workflow_task.defer_async.assert_awaited_once_with(
+            workflow_id=workflow.b64id,
+            deleted_by_id=user.b64id,
+            target_workflow_id=target_workflow.b64id,
+        )
+        assert ret == 42
+
+
+async def test_delete_workflow_not_existing_target_workflow_exception():
+    with (
+        patch(
+            "workflows.services.workflows_repositories", autospec=True
+        ) as fake_workflows_repo,
+        patch(
+            "workflows.tasks.delete_workflow", autospec=True
+        ) as fake_delete_workflow_task,
+        pytest.raises(ex.NonExistingMoveToWorkflow),
+    ):
+        user = f.build_user()
+        deleted_workflow = f.build_workflow(slug="deleted_workflow")
+        fake_workflows_repo.get_workflow.side_effect = Workflow.DoesNotExist
+
+        # service call
+        await services.delete_workflow(
+            workflow=deleted_workflow,
+            deleted_by=user,
+            target_workflow_id=uuid.uuid1(),
+        )
+
+        # asserts
+        fake_delete_workflow_task.defer_async.assert_not_awaited()
+
+
+async def test_delete_workflow_same_target_workflow_exception():
+    with (
+        patch(
+            "workflows.services.workflows_repositories", autospec=True
+        ) as fake_workflows_repo,
+        patch(
+            "workflows.tasks.delete_workflow", autospec=True
+        ) as fake_delete_workflow_task,
+        pytest.raises(ex.SameMoveToWorkflow),
+    ):
+        user = f.build_user()
+        deleted_workflow = f.build_workflow(slug="deleted_workflow", statuses=[])
+        fake_workflows_repo.get_workflow.return_value = deleted_workflow
+
+        # service call
+        await services.delete_workflow(
+            workflow=deleted_workflow,
+            deleted_by=user,
+            target_workflow_id=deleted_workflow.id,
+        )
+
+        # asserts
+        fake_delete_workflow_task.defer_async.assert_not_awaited()
+
+
+#######################################################
+# do delete workflow
+#######################################################
+
+
+async def test_do_delete_workflow_no_target_workflow_ok():
     with (
         patch(
             "workflows.services.workflows_repositories", autospec=True
@@ -377,8 +556,8 @@ async def test_delete_workflow_no_target_workflow_ok():
             "workflows.services.projects_services", autospec=True
         ) as fake_projects_services,
         patch(
-            "workflows.services.stories_services", autospec=True
-        ) as fake_stories_services,
+            "workflows.services.stories_repositories", autospec=True
+        ) as fake_stories_repo,
         patch_db_transaction(),
     ):
         user = f.build_user()
@@ -387,15 +566,14 @@ async def test_delete_workflow_no_target_workflow_ok():
         status3 = f.build_workflow_status(order=3)
         workflow = f.build_workflow(statuses=[status1, status2, status3])
         fake_workflows_repo.get_workflow.return_value = workflow
-        fake_workflows_repo.list_workflow_statuses.return_value = [
-            status1,
-            status2,
-            status3,
-        ]
         fake_workflows_repo.delete_workflow.return_value = True
 
-        ret = await services.delete_workflow(workflow=workflow, deleted_by=user)
+        ret = await services.do_delete_workflow(
+            workflow_id=workflow.id, deleted_by=user
+        )
 
+        fake_workflows_repo.list_workflow_statuses.assert_not_awaited()
+        fake_stories_repo.bulk_update_workflow_to_stories.assert_not_awaited()
         fake_workflows_repo.delete_workflow.assert_awaited_once_with(
             filters={"id": workflow.id}
         )
@@ -404,7 +582,7 @@ async def test_delete_workflow_no_target_workflow_ok():
         fake_projects_services.update_project_landing_page.assert_not_called()
 
 
-async def test_delete_workflow_update_landing_to_new_slug():
+async def test_do_delete_workflow_already_deleted():
     with (
         patch(
             "workflows.services.workflows_repositories", autospec=True
@@ -412,15 +590,31 @@ async def test_delete_workflow_update_landing_to_new_slug():
         patch(
             "workflows.services.workflows_events", autospec=True
         ) as fake_workflows_events,
+        patch_db_transaction(),
+    ):
+        user = f.build_user()
+        fake_workflows_repo.get_workflow.side_effect = Workflow.DoesNotExist
+
+        ret = await services.do_delete_workflow(
+            workflow_id=uuid.uuid1(), deleted_by=user
+        )
+
+        fake_workflows_repo.delete_workflow.assert_not_awaited()
+        fake_workflows_events.emit_event_when_workflow_is_deleted.assert_not_awaited()
+        assert ret is False
+
+
+async def test_do_delete_workflow_update_landing_to_new_slug():
+    with (
         patch(
-            "workflows.services.projects_repositories", autospec=True
-        ) as fake_projects_repo,
+            "workflows.services.workflows_repositories", autospec=True
+        ) as fake_workflows_repo,
+        patch(
+            "workflows.services.workflows_events", autospec=True
+        ) as fake_workflows_events,
         patch(
             "workflows.services.projects_services", autospec=True
         ) as fake_projects_services,
-        patch(
-            "workflows.services.stories_services", autospec=True
-        ) as fake_stories_services,
         patch_db_transaction(),
     ):
         user = f.build_user()
@@ -430,19 +624,20 @@ async def test_delete_workflow_update_landing_to_new_slug():
         )
         fake_workflows_repo.get_workflow.return_value = workflow
         fake_workflows_repo.delete_workflow.return_value = True
-        fake_projects_repo.get_first_workflow_slug.return_value = None
 
-        ret = await services.delete_workflow(workflow=workflow, deleted_by=user)
+        ret = await services.do_delete_workflow(
+            workflow_id=workflow.id, deleted_by=user
+        )
 
         fake_projects_services.update_project_landing_page.assert_awaited_once_with(
-            project=workflow.project, updated_by=user
+            workflow.project, user
         )
 
         fake_workflows_events.emit_event_when_workflow_is_deleted.assert_awaited_once()
         assert ret is True
 
 
-async def test_delete_workflow_with_target_workflow_with_anchor_status_ok():
+async def test_do_delete_workflow_with_target_workflow_with_anchor_status_ok():
     with (
         patch(
             "workflows.services.workflows_repositories", autospec=True
@@ -454,8 +649,8 @@ async def test_delete_workflow_with_target_workflow_with_anchor_status_ok():
             "workflows.services.workflows_events", autospec=True
         ) as fake_workflows_events,
         patch(
-            "workflows.services.stories_services", autospec=True
-        ) as fake_stories_services,
+            "workflows.services.stories_repositories", autospec=True
+        ) as fake_stories_repo,
         patch_db_transaction(),
     ):
         user = f.build_user()
@@ -469,30 +664,30 @@ async def test_delete_workflow_with_target_workflow_with_anchor_status_ok():
         target_workflow_status2 = f.build_workflow_status(order=2)
         target_workflow_statuses = [target_workflow_status1, target_workflow_status2]
         target_workflow = f.build_workflow(
-            slug="target_workflow", statuses=target_workflow_statuses
+            slug="target_workflow",
+            project=deleted_workflow.project,
+            statuses=target_workflow_statuses,
         )
 
-        fake_workflows_repo.get_workflow.return_value = target_workflow
-        # the serializer response doesn't maters
-        fake_reorder_workflow_statuses.return_value = ReorderWorkflowStatusesSerializer(
-            workflow=WorkflowNestedSerializer(
-                id=target_workflow.id,
-                project_id=target_workflow.project_id,
-                name=deleted_workflow.name,
-                slug=deleted_workflow.slug,
-            ),
-            status_ids=[],
-            reorder=None,
-        )
+        fake_workflows_repo.get_workflow.side_effect = [
+            deleted_workflow,
+            target_workflow,
+        ]
         fake_workflows_repo.list_workflow_statuses.return_value = (
             deleted_workflow_statuses
         )
+        fake_stories_repo.list_stories_qs.return_value.acount = AsyncMock(
+            return_value=0
+        )
+        fake_stories_repo.list_stories_qs.return_value.aexists = AsyncMock(
+            return_value=False
+        )
         fake_workflows_repo.delete_workflow.return_value = True
         # service call
-        ret = await services.delete_workflow(
-            workflow=deleted_workflow,
+        ret = await services.do_delete_workflow(
+            workflow_id=deleted_workflow.id,
             deleted_by=user,
-            target_workflow_id=target_workflow.slug,
+            target_workflow_id=target_workflow.id,
         )
         # asserts
         fake_workflows_repo.list_workflow_statuses.assert_awaited_once_with(
@@ -508,7 +703,9 @@ async def test_delete_workflow_with_target_workflow_with_anchor_status_ok():
             status_ids=[status.id for status in deleted_workflow_statuses],
             reorder={"place": "after", "status_id": target_workflow_status2.id},
             source_workflow=deleted_workflow,
+            move_stories=False,
         )
+        fake_stories_repo.bulk_update_workflow_to_stories.assert_not_awaited()
         fake_workflows_events.emit_event_when_workflow_is_deleted.assert_awaited_once_with(
             project=deleted_workflow.project,
             workflow=WorkflowNestedSerializer(
@@ -522,7 +719,7 @@ async def test_delete_workflow_with_target_workflow_with_anchor_status_ok():
         assert ret is True
 
 
-async def test_delete_workflow_with_target_workflow_with_no_anchor_status_ok():
+async def test_do_delete_workflow_with_target_workflow_with_no_anchor_status_ok():
     with (
         patch(
             "workflows.services.workflows_repositories", autospec=True
@@ -534,8 +731,8 @@ async def test_delete_workflow_with_target_workflow_with_no_anchor_status_ok():
             "workflows.services.workflows_events", autospec=True
         ) as fake_workflows_events,
         patch(
-            "workflows.services.stories_services", autospec=True
-        ) as fake_stories_services,
+            "workflows.services.stories_repositories", autospec=True
+        ) as fake_stories_repo,
         patch_db_transaction(),
     ):
         user = f.build_user()
@@ -544,92 +741,104 @@ async def test_delete_workflow_with_target_workflow_with_no_anchor_status_ok():
         deleted_workflow = f.build_workflow(
             slug="deleted_workflow", statuses=deleted_workflow_statuses
         )
-        target_workflow = f.build_workflow(slug="target_workflow", statuses=[])
-
-        fake_workflows_repo.get_workflow.return_value = target_workflow
-        # the serializer response doesn't matters
-        fake_reorder_workflow_statuses.return_value = ReorderWorkflowStatusesSerializer(
-            workflow=WorkflowNestedSerializer(
-                id=target_workflow.id,
-                project_id=target_workflow.project_id,
-                name=deleted_workflow.name,
-                slug=deleted_workflow.slug,
-            ),
-            status_ids=[],
-            reorder=None,
+        target_workflow = f.build_workflow(
+            slug="target_workflow", project=deleted_workflow.project, statuses=[]
         )
+
+        fake_workflows_repo.get_workflow.side_effect = [
+            deleted_workflow,
+            target_workflow,
+        ]
         fake_workflows_repo.list_workflow_statuses.return_value = (
             deleted_workflow_statuses
         )
+        fake_stories_repo.list_stories_qs.return_value.acount = AsyncMock(
+            return_value=0
+        )
+        fake_stories_repo.list_stories_qs.return_value.aexists = AsyncMock(
+            return_value=False
+        )
         fake_workflows_repo.delete_workflow.return_value = True
         # service call
-        ret = await services.delete_workflow(
-            workflow=deleted_workflow,
+        ret = await services.do_delete_workflow(
+            workflow_id=deleted_workflow.id,
             deleted_by=user,
-            target_workflow_id=target_workflow.slug,
+            target_workflow_id=target_workflow.id,
         )
         # asserts
-        fake_workflows_repo.list_workflow_statuses.assert_awaited_once_with(
-            workflow_id=deleted_workflow.id,
-            is_empty=False,
-            order_by=["order"],
-        )
-        fake_workflows_repo.delete_workflow.assert_awaited_once_with(
-            filters={"id": deleted_workflow.id}
-        )
         fake_reorder_workflow_statuses.assert_awaited_once_with(
             target_workflow=target_workflow,
             status_ids=[status.id for status in deleted_workflow_statuses],
             reorder=None,
             source_workflow=deleted_workflow,
+            move_stories=False,
         )
-        fake_workflows_events.emit_event_when_workflow_is_deleted.assert_awaited_once_with(
-            project=deleted_workflow.project,
-            workflow=WorkflowNestedSerializer(
-                id=deleted_workflow.id,
-                name=deleted_workflow.name,
-                slug=deleted_workflow.slug,
-                project_id=deleted_workflow.project_id,
-            ),
-            target_workflow=target_workflow,
-        )
+        fake_workflows_events.emit_event_when_workflow_is_deleted.assert_awaited_once()
         assert ret is True
 
 
-async def test_delete_workflow_not_existing_target_workflow_exception():
+@override_settings(DELETE_WORKFLOW_STORIES_CHUNK_SIZE=2)
+async def test_do_delete_workflow_moves_stories_by_chunks():
     with (
         patch(
             "workflows.services.workflows_repositories", autospec=True
         ) as fake_workflows_repo,
-        patch(
-            "workflows.services.reorder_workflow_statuses", autospec=True
-        ) as fake_reorder_workflow_statuses,
+        patch("workflows.services.reorder_workflow_statuses", autospec=True),
         patch(
             "workflows.services.workflows_events", autospec=True
         ) as fake_workflows_events,
+        patch(
+            "workflows.services.stories_repositories", autospec=True
+        ) as fake_stories_repo,
         patch_db_transaction(),
-        pytest.raises(ex.NonExistingMoveToWorkflow),
     ):
         user = f.build_user()
-        deleted_workflow = f.build_workflow(slug="deleted_workflow")
-        fake_workflows_repo.get_workflow.side_effect = Workflow.DoesNotExist
+        deleted_workflow_status = f.build_workflow_status(order=1)
+        deleted_workflow = f.build_workflow(statuses=[deleted_workflow_status])
+        target_workflow = f.build_workflow(
+            project=deleted_workflow.project, statuses=[]
+        )
 
+        fake_workflows_repo.get_workflow.side_effect = [
+            deleted_workflow,
+            target_workflow,
+        ]
+        fake_workflows_repo.list_workflow_statuses.return_value = [
+            deleted_workflow_status
+        ]
+        fake_stories_repo.list_stories_qs.return_value.acount = AsyncMock(
+            return_value=3
+        )
+        fake_stories_repo.list_stories_qs.return_value.aexists = AsyncMock(
+            return_value=False
+        )
+        fake_stories_repo.bulk_update_workflow_to_stories.side_effect = [2, 1]
+        fake_workflows_repo.delete_workflow.return_value = True
         # service call
-        ret = await services.delete_workflow(
-            workflow=deleted_workflow,
+        ret = await services.do_delete_workflow(
+            workflow_id=deleted_workflow.id,
             deleted_by=user,
-            target_workflow_id=NOT_EXISTING_SLUG,
+            target_workflow_id=target_workflow.id,
         )
-
         # asserts
-        fake_reorder_workflow_statuses.assert_not_awaited()
-        fake_workflows_repo.delete_workflow.assert_not_awaited()
-        fake_workflows_events.emit_event_when_workflow_is_deleted.assert_not_awaited()
-
-        assert ret is False
+        fake_stories_repo.list_stories_qs.assert_called_with(
+            filters={"workflow_id": deleted_workflow.id}
+        )
+        fake_stories_repo.bulk_update_workflow_to_stories.assert_awaited_with(
+            old_workflow_id=deleted_workflow.id,
+            new_workflow_id=target_workflow.id,
+            limit=2,
+        )
+        assert fake_stories_repo.bulk_update_workflow_to_stories.await_count == 2
+        assert [
+            call.kwargs["progress_percentage"]
+            for call in fake_workflows_events.emit_event_when_workflow_deletion_progresses.await_args_list
+        ] == [66, 100]
+        fake_workflows_events.emit_event_when_workflow_is_deleted.assert_awaited_once()
+        assert ret is True
 
 
-async def test_delete_workflow_same_target_workflow_exception():
+async def test_do_delete_workflow_rerun_after_a_partial_move():
     with (
         patch(
             "workflows.services.workflows_repositories", autospec=True
@@ -637,30 +846,145 @@ async def test_delete_workflow_same_target_workflow_exception():
         patch(
             "workflows.services.reorder_workflow_statuses", autospec=True
         ) as fake_reorder_workflow_statuses,
+        patch("workflows.services.workflows_events", autospec=True),
         patch(
-            "workflows.services.workflows_events", autospec=True
-        ) as fake_workflows_events,
+            "workflows.services.stories_repositories", autospec=True
+        ) as fake_stories_repo,
         patch_db_transaction(),
-        pytest.raises(ex.SameMoveToWorkflow),
     ):
         user = f.build_user()
-        deleted_workflow = f.build_workflow(slug="deleted_workflow", statuses=[])
-        fake_workflows_repo.get_workflow.return_value = deleted_workflow
+        deleted_workflow = f.build_workflow(statuses=[])
+        target_workflow = f.build_workflow(
+            project=deleted_workflow.project, statuses=[]
+        )
 
+        fake_workflows_repo.get_workflow.side_effect = [
+            deleted_workflow,
+            target_workflow,
+        ]
+        # the statuses have been moved by the previous run, but not all their stories
+        fake_workflows_repo.list_workflow_statuses.return_value = []
+        fake_stories_repo.list_stories_qs.return_value.acount = AsyncMock(
+            return_value=1
+        )
+        fake_stories_repo.list_stories_qs.return_value.aexists = AsyncMock(
+            return_value=False
+        )
+        fake_stories_repo.bulk_update_workflow_to_stories.return_value = 1
+        fake_workflows_repo.delete_workflow.return_value = True
         # service call
-        ret = await services.delete_workflow(
-            workflow=deleted_workflow,
+        ret = await services.do_delete_workflow(
+            workflow_id=deleted_workflow.id,
             deleted_by=user,
-            target_workflow_id=deleted_workflow.slug,
+            target_workflow_id=target_workflow.id,
         )
-
         # asserts
         fake_reorder_workflow_statuses.assert_not_awaited()
+        fake_stories_repo.bulk_update_workflow_to_stories.assert_awaited_once_with(
+            old_workflow_id=deleted_workflow.id,
+            new_workflow_id=target_workflow.id,
+            limit=settings.DELETE_WORKFLOW_STORIES_CHUNK_SIZE,
+        )
+        fake_workflows_repo.delete_workflow.assert_awaited_once_with(
+            filters={"id": deleted_workflow.id}
+        )
+        assert ret is True
+
+
+@pytest.mark.django_db
+@override_settings(DELETE_WORKFLOW_STORIES_CHUNK_SIZE=1)
+async def test_do_delete_workflow_rerun_after_a_partial_move_keeps_the_stories():
+    user = await f.create_user()
+    workflow = await f.create_workflow(statuses=[])
+    status = await f.create_workflow_status(workflow=workflow)
+    target_workflow = await f.create_workflow(project=workflow.project, statuses=[])
+    for _ in range(3):
+        await f.create_story(project=workflow.project, workflow=workflow, status=status)
+
+    bulk_update_workflow_to_stories = (
+        stories_repositories.bulk_update_workflow_to_stories
+    )
+
+    async def _fail_after_first_chunk(**kwargs):
+        if _fail_after_first_chunk.calls:
+            raise Exception("job failure")
+        _fail_after_first_chunk.calls += 1
+        return await bulk_update_workflow_to_stories(**kwargs)
+
+    _fail_after_first_chunk.calls = 0
+
+    with patch("workflows.services.workflows_events", autospec=True):
+        with (
+            patch(
+                "workflows.services.stories_repositories.bulk_update_workflow_to_stories",
+                new=_fail_after_first_chunk,
+            ),
+            pytest.raises(Exception, match="job failure"),
+        ):
+            await services.do_delete_workflow(
+                workflow_id=workflow.id,
+                deleted_by=user,
+                target_workflow_id=target_workflow.id,
+            )
+
+        assert await services.do_delete_workflow(
+            workflow_id=workflow.id,
+            deleted_by=user,
+            target_workflow_id=target_workflow.id,
+        )
+
+    assert not await Workflow.objects.filter(id=workflow.id).aexists()
+    assert (
+        await stories_repositories.list_stories_qs(
+            filters={"workflow_id": target_workflow.id, "status_id": status.id}
+        ).acount()
+        == 3
+    )
+
+
+async def test_do_delete_workflow_with_stories_left_to_move():
+    with (
+        patch(
+            "workflows.services.workflows_repositories", autospec=True
+        ) as fake_workflows_repo,
+        patch("workflows.services.reorder_workflow_statuses", autospec=True),
+        patch(
+            "workflows.services.workflows_events", autospec=True
+        ) as fake_workflows_events,
+        patch(
+            "workflows.services.stories_repositories", autospec=True
+        ) as fake_stories_repo,
+        patch_db_transaction(),
+    ):
+        user = f.build_user()
+        deleted_workflow = f.build_workflow(statuses=[])
+        target_workflow = f.build_workflow(
+            project=deleted_workflow.project, statuses=[]
+        )
+
+        fake_workflows_repo.get_workflow.side_effect = [
+            deleted_workflow,
+            target_workflow,
+        ]
+        fake_workflows_repo.list_workflow_statuses.return_value = []
+        fake_stories_repo.list_stories_qs.return_value.acount = AsyncMock(
+            return_value=0
+        )
+        # e.g. a story created meanwhile
+        fake_stories_repo.list_stories_qs.return_value.aexists = AsyncMock(
+            return_value=True
+        )
+        # service call
+        with pytest.raises(RuntimeError):
+            await services.do_delete_workflow(
+                workflow_id=deleted_workflow.id,
+                deleted_by=user,
+                target_workflow_id=target_workflow.id,
+            )
+        # asserts
         fake_workflows_repo.delete_workflow.assert_not_awaited()
         fake_workflows_events.emit_event_when_workflow_is_deleted.assert_not_awaited()
 
-        assert ret is True
-
 
 #######################################################
 # _calculate_offset
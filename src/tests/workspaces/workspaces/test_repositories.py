@@ -19,7 +19,9 @@
 
 
 import pytest
+from django.conf import settings
 
+from configurations.conf.cache import CacheBackendChoices
 from import_export.models import ImportationStatus
 from memberships.choices import InvitationStatus
 from tests.utils import factories as f
@@ -317,6 +319,85 @@ async def test_list_user_workspaces_overview_importations(project_template):
     ]
 
 
+##########################################################
+# list user workspaces overview - cache
+##########################################################
+
+
+async def test_cached_user_workspaces_overview():
+    user = f.build_user()
+    ws = f.build_workspace()
+    other_ws = f.build_workspace()
+
+    assert await repositories.get_cached_user_workspaces_overview(user.id) is None
+
+    computed_at = await repositories.get_workspaces_overview_time()
+    await repositories.set_cached_user_workspaces_overview(
+        user_id=user.id, workspaces=[ws], computed_at=computed_at
+    )
+    assert await repositories.get_cached_user_workspaces_overview(user.id) == [ws]
+
+    # a workspace that is not in the overview doesn't invalidate it
+    await repositories.delete_cached_workspaces_overviews(workspace_ids=[other_ws.id])
+    assert await repositories.get_cached_user_workspaces_overview(user.id) == [ws]
+
+    await repositories.delete_cached_workspaces_overviews(workspace_ids=[ws.id])
+    assert await repositories.get_cached_user_workspaces_overview(user.id) is None
+
+
+async def test_cached_user_workspaces_overview_invalidated_by_user():
+    user = f.build_user()
+    other_user = f.build_user()
+    ws = f.build_workspace()
+
+    computed_at = await repositories.get_workspaces_overview_time()
+    await repositories.set_cached_user_workspaces_overview(
+        user_id=user.id, workspaces=[ws], computed_at=computed_at
+    )
+    await repositories.delete_cached_users_workspaces_overview(user_ids=[other_user.id])
+    assert await repositories.get_cached_user_workspaces_overview(user.id) == [ws]
+
+    await repositories.delete_cached_users_workspaces_overview(user_ids=[user.id])
+    assert await repositories.get_cached_user_workspaces_overview(user.id) is None
+
+
+async def test_cached_user_workspaces_overview_invalidated_while_computed():
+    user = f.build_user()
+    ws = f.build_workspace()
+
+    computed_at = await repositories.get_workspaces_overview_time()
+    # the invalidation happens after the overview started to be computed, but before it is stored
+    await repositories.delete_cached_users_workspaces_overview(user_ids=[user.id])
+    await repositories.set_cached_user_workspaces_overview(
+        user_id=user.id, workspaces=[ws], computed_at=computed_at
+    )
+    assert await repositories.get_cached_user_workspaces_overview(user.id) is None
+
+
+async def test_cached_user_workspaces_overview_computed_after_invalidation():
+    user = f.build_user()
+    ws = f.build_workspace()
+
+    await repositories.delete_cached_users_workspaces_overview(user_ids=[user.id])
+    computed_at = await repositories.get_workspaces_overview_time()
+    await repositories.set_cached_user_workspaces_overview(
+        user_id=user.id, workspaces=[ws], computed_at=computed_at
+    )
+    assert await repositories.get_cached_user_workspaces_overview(user.id) == [ws]
+
+
+async def test_cached_user_workspaces_overview_not_cached_in_memory(monkeypatch):
+    monkeypatch.setattr(settings.CACHE, "BACKEND", CacheBackendChoices.MEMORY)
+    user = f.build_user()
+    ws = f.build_workspace()
+
+    computed_at = await repositories.get_workspaces_overview_time()
+    await repositories.set_cached_user_workspaces_overview(
+        user_id=user.id, workspaces=[ws], computed_at=computed_at
+    )
+    assert await repositories.get_cached_user_workspaces_overview(user.id) is None
+
+
 ##########################################################
 # get_workspace
 ##########################################################
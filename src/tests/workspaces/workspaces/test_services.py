@@ -86,6 +86,42 @@ async def test_list_user_workspaces():
         )
 
 
+##########################################################
+# list_serialized_user_workspaces
+##########################################################
+
+
+async def test_list_serialized_user_workspaces_cached():
+    user = f.build_user()
+    cached = [object()]
+
+    with patch(
+        "workspaces.workspaces.services.workspaces_repositories", autospec=True
+    ) as fake_workspaces_repo:
+        fake_workspaces_repo.get_cached_user_workspaces_overview.return_value = cached
+        assert await services.list_serialized_user_workspaces(user=user) is cached
+        fake_workspaces_repo.list_user_workspaces_overview.assert_not_awaited()
+        fake_workspaces_repo.set_cached_user_workspaces_overview.assert_not_awaited()
+
+
+async def test_list_serialized_user_workspaces_not_cached():
+    user = f.build_user()
+
+    with patch(
+        "workspaces.workspaces.services.workspaces_repositories", autospec=True
+    ) as fake_workspaces_repo:
+        fake_workspaces_repo.get_cached_user_workspaces_overview.return_value = None
+        fake_workspaces_repo.get_workspaces_overview_time.return_value = 42
+        fake_workspaces_repo.list_user_workspaces_overview.return_value = []
+        assert await services.list_serialized_user_workspaces(user=user) == []
+        fake_workspaces_repo.list_user_workspaces_overview.assert_awaited_once_with(
+            user=user
+        )
+        fake_workspaces_repo.set_cached_user_workspaces_overview.assert_awaited_once_with(
+            user_id=user.id, workspaces=[], computed_at=42
+        )
+
+
 ##########################################################
 # get_workspace
 ##########################################################
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024-2026 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+# Generated by Django 6.0.6 on 2026-10-18 23:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# `search_vector` is computed on each insert and on each update setting `full_name` or `username`, so it's always in
+# sync with them (whatever the query that changed them) while the other updates (e.g. `last_login`) don't recompute
+# it. It must match the vector used by the users text search.
+CREATE_SEARCH_VECTOR_TRIGGER = """
+    CREATE FUNCTION users_user_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple_unaccent', coalesce(NEW.full_name, '')), 'A') ||
+            setweight(to_tsvector('simple_unaccent', coalesce(NEW.username, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER users_user_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF full_name, username ON users_user
+        FOR EACH ROW EXECUTE FUNCTION users_user_search_vector_update();
+
+    UPDATE users_user SET search_vector =
+        setweight(to_tsvector('simple_unaccent', coalesce(full_name, '')), 'A') ||
+        setweight(to_tsvector('simple_unaccent', coalesce(username, '')), 'B');
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+    DROP TRIGGER IF EXISTS users_user_search_vector_trigger ON users_user;
+    DROP FUNCTION IF EXISTS users_user_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("db", "0001_initial"),
+        ("users", "0005_delete_authdata"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True, verbose_name="search vector"
+            ),
+        ),
+        migrations.RunSQL(
+            sql=CREATE_SEARCH_VECTOR_TRIGGER,
+            reverse_sql=DROP_SEARCH_VECTOR_TRIGGER,
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="users_user_search_vector_gin"
+            ),
+        ),
+    ]
@@ -21,6 +21,8 @@ from typing import TYPE_CHECKING, Any, Iterable
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, AnonymousUser, UserManager
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, RegexValidator
 from django.db import models
 
@@ -106,6 +108,10 @@ class User(BaseDBModel, AbstractBaseUser):
     date_verification = models.DateTimeField(
         null=True, blank=True, default=None, verbose_name="date verification"
     )
+    # full_name (weight A) and username (weight B), maintained by a database trigger (see migration 0006)
+    search_vector = SearchVectorField(
+        null=True, blank=True, editable=False, verbose_name="search vector"
+    )
     project_role: ProjectRole | None = None
     workspace_role: WorkspaceRole | None = None
     is_invited: bool = None
@@ -124,6 +130,7 @@ class User(BaseDBModel, AbstractBaseUser):
         indexes = [
             models.Index(fields=["username"]),
             models.Index(fields=["email"]),
+            GinIndex(fields=["search_vector"], name="users_user_search_vector_gin"),
         ]
         ordering = ["username"]
 
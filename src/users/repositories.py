@@ -27,17 +27,22 @@ from django.contrib.postgres.lookups import Unaccent
 from django.contrib.postgres.search import (
     SearchQuery,
     SearchRank,
-    SearchVector,
 )
+from django.core.cache import cache
 from django.db.models import (
-    BooleanField,
+    Case,
     Exists,
+    F,
+    FloatField,
+    IntegerField,
     OuterRef,
     Q,
     QuerySet,
     Value,
+    When,
 )
 from django.db.models.functions import (
+    Cast,
     Lower,
     StrIndex,
 )
@@ -63,6 +68,14 @@ class UserFilters(TypedDict, total=False):
     is_active: bool
 
 
+class UserSearchCursor(TypedDict):
+    tier: int | None
+    rank: float | None
+    first_match: int | None
+    full_name: str
+    username: str
+
+
 UserOrderBy = list[
     Literal[
         "full_name",
@@ -132,11 +145,13 @@ async def list_project_users_by_text(
     exclude_inactive: bool = True,
     offset: int | None = None,
     limit: int | None = None,
+    after: UserSearchCursor | None = None,
 ) -> list[User]:
     qs = _list_project_users_by_text_qs(
         text_search=text_search,
         project_id=project_id,
         exclude_inactive=exclude_inactive,
+        after=after,
     )
     if limit is not None and offset is not None:
         limit += offset
@@ -150,11 +165,13 @@ async def list_workspace_users_by_text(
     exclude_inactive: bool = True,
     offset: int | None = None,
     limit: int | None = None,
+    after: UserSearchCursor | None = None,
 ) -> list[User]:
     qs = _list_workspace_users_by_text_qs(
         text_search=text_search,
         workspace_id=workspace_id,
         exclude_inactive=exclude_inactive,
+        after=after,
     )
     if limit is not None and offset is not None:
         limit += offset
@@ -162,6 +179,16 @@ async def list_workspace_users_by_text(
     return [u async for u in qs[offset:limit]]
 
 
+def get_user_search_cursor(user: User) -> UserSearchCursor:
+    """
+    Get the cursor pointing after a user returned by `list_<project/workspace>_users_by_text`, to be used as their
+    `after` param to list the next users.
+    """
+    return {
+        field: getattr(user, field, None) for field in UserSearchCursor.__annotations__
+    }
+
+
 def _list_users_by_text_qs(
     text_search: str = "", exclude_inactive: bool = True
 ) -> QuerySet[User]:
@@ -187,7 +214,10 @@ def _list_users_by_text_qs(
 
 
 def _list_project_users_by_text_qs(
-    text_search: str = "", project_id: UUID | None = None, exclude_inactive: bool = True
+    text_search: str = "",
+    project_id: UUID | None = None,
+    exclude_inactive: bool = True,
+    after: UserSearchCursor | None = None,
 ) -> QuerySet[User]:
     """
     Get all the users that match a full text search (against their full_name and username fields), returning a
@@ -196,6 +226,7 @@ def _list_project_users_by_text_qs(
     :param text_search: The text the users should match in either their full names or usernames to be considered
     :param project_id: Users will be ordered by their proximity to this project excluding itself
     :param exclude_inactive: true (return just active users), false (returns all users)
+    :param after: return only the users after this cursor (see `get_user_search_cursor`)
     :return: a prioritized queryset of users
     """
     users_qs = _list_users_by_text_qs(
@@ -207,58 +238,34 @@ def _list_project_users_by_text_qs(
         #     1st. project members of this project
         #     2nd. members of the project's workspace
         #     3rd. rest of users (the priority for this group is not too important)
-
-        # 1st: Users that share the same project
         memberships = ProjectMembership.objects.filter(
             user_id=OuterRef("pk"), project_id=project_id
         )
+        workspace_memberships = WorkspaceMembership.objects.filter(
+            user_id=OuterRef("pk"), workspace__projects__id=project_id
+        )
         pending_invitations = ProjectInvitation.objects.filter(
             user_id=OuterRef("pk"),
             project_id=project_id,
             status=InvitationStatus.PENDING,
         )
-        project_users_qs = (
-            users_qs.filter(projects__id=project_id)
-            .annotate(user_is_member=Exists(memberships))
-            .annotate(user_has_pending_invitation=Exists(pending_invitations))
-        )
-        sorted_project_users_qs = _sort_queryset_if_unsorted(
-            project_users_qs, text_search
-        )
-
-        # 2nd: Users that are members of the project's workspace but are NOT project members
-        workspace_users_qs = (
-            users_qs.filter(workspaces__projects__id=project_id)
-            .annotate(user_is_member=Value(False, output_field=BooleanField()))
-            .annotate(user_has_pending_invitation=Exists(pending_invitations))
-            .exclude(projects__id=project_id)
-        )
-        sorted_workspace_users_qs = _sort_queryset_if_unsorted(
-            workspace_users_qs, text_search
-        )
-
-        # 3rd: Users that are neither a project member nor a member of its workspace
-        other_users_qs = (
-            users_qs.exclude(projects__id=project_id)
-            .exclude(workspaces__projects__id=project_id)
-            .annotate(user_is_member=Value(False, output_field=BooleanField()))
-            .annotate(user_has_pending_invitation=Exists(pending_invitations))
+        users_qs = _annotate_proximity_tier(
+            users_qs,
+            memberships=memberships,
+            closer_memberships=workspace_memberships,
+            pending_invitations=pending_invitations,
         )
-        sorted_other_users_qs = _sort_queryset_if_unsorted(other_users_qs, text_search)
 
-        # NOTE: `Union all` are important to keep the individual ordering when combining the different search criteria.
-        users_qs = sorted_project_users_qs.union(
-            sorted_workspace_users_qs.union(sorted_other_users_qs, all=True), all=True
-        )
-        return users_qs
-
-    return _sort_queryset_if_unsorted(users_qs, text_search)
+    return _sort_and_paginate_queryset(
+        users_qs, text_search=text_search, by_tier=bool(project_id), after=after
+    )
 
 
 def _list_workspace_users_by_text_qs(
     text_search: str = "",
     workspace_id: UUID | None = None,
     exclude_inactive: bool = True,
+    after: UserSearchCursor | None = None,
 ) -> QuerySet[User]:
     """
     Get all the users that match a full text search (against their full_name and username fields), returning a
@@ -267,6 +274,7 @@ def _list_workspace_users_by_text_qs(
     :param text_search: The text the users should match in either their full names or usernames to be considered
     :param workspace_id: Users will be ordered by their proximity to this workspace excluding itself
     :param exclude_inactive: true (return just active users), false (returns all users)
+    :param after: return only the users after this cursor (see `get_user_search_cursor`)
     :return: a prioritized queryset of users
     """
     users_qs = _list_users_by_text_qs(
@@ -278,63 +286,84 @@ def _list_workspace_users_by_text_qs(
         #     1st. workspace members
         #     2nd. members of the workspace's projects
         #     3rd. rest of users (the priority for this group is not too important)
-
-        # 1st: Users that share the same workspace
         memberships = WorkspaceMembership.objects.filter(
-            user__id=OuterRef("pk"), workspace__id=workspace_id
+            user_id=OuterRef("pk"), workspace_id=workspace_id
+        )
+        projects_memberships = ProjectMembership.objects.filter(
+            user_id=OuterRef("pk"), project__workspace_id=workspace_id
         )
         pending_invitations = WorkspaceInvitation.objects.filter(
-            user__id=OuterRef("pk"),
-            workspace__id=workspace_id,
+            user_id=OuterRef("pk"),
+            workspace_id=workspace_id,
             status=InvitationStatus.PENDING,
         )
-        workspace_users_qs = (
-            users_qs.filter(workspaces__id=workspace_id)
-            .annotate(user_is_member=Exists(memberships))
-            .annotate(user_has_pending_invitation=Exists(pending_invitations))
-        )
-        sorted_workspace_users_qs = _sort_queryset_if_unsorted(
-            workspace_users_qs, text_search
+        users_qs = _annotate_proximity_tier(
+            users_qs,
+            memberships=memberships,
+            closer_memberships=projects_memberships,
+            pending_invitations=pending_invitations,
         )
 
-        # # 2nd: Users that are members of the workspace's projects but are NOT workspace members
-        ws_projects_users_qs = (
-            users_qs.filter(projects__workspace_id=workspace_id)
-            .exclude(workspaces__id=workspace_id)
-            .annotate(user_is_member=Value(False, output_field=BooleanField()))
-            .annotate(user_has_pending_invitation=Exists(pending_invitations))
-            .distinct()
-        )
-        sorted_ws_projects_users_qs = _sort_queryset_if_unsorted(
-            ws_projects_users_qs, text_search
-        )
-
-        # 3rd: Users that are neither a workspace member nor a member of the workspace's projects
-        other_users_qs = (
-            users_qs.exclude(workspaces__id=workspace_id)
-            .exclude(projects__workspace_id=workspace_id)
-            .annotate(user_is_member=Value(False, output_field=BooleanField()))
-            .annotate(user_has_pending_invitation=Exists(pending_invitations))
-        )
-        sorted_other_users_qs = _sort_queryset_if_unsorted(other_users_qs, text_search)
+    return _sort_and_paginate_queryset(
+        users_qs, text_search=text_search, by_tier=bool(workspace_id), after=after
+    )
 
-        # NOTE: `Union all` are important to keep the individual ordering when combining the different search criteria.
-        users_qs = sorted_workspace_users_qs.union(
-            sorted_ws_projects_users_qs.union(sorted_other_users_qs, all=True), all=True
-        )
-        return users_qs
 
-    return _sort_queryset_if_unsorted(users_qs, text_search)
+def _annotate_proximity_tier(
+    users_qs: QuerySet[User],
+    memberships: QuerySet,
+    closer_memberships: QuerySet,
+    pending_invitations: QuerySet,
+) -> QuerySet[User]:
+    """
+    Annotate the proximity `tier` of each user in a single query (instead of one query per tier):
+    1 for the members, 2 for the users with one of the `closer_memberships` and 3 for the rest.
+    """
+    return users_qs.annotate(
+        user_is_member=Exists(memberships),
+        user_has_pending_invitation=Exists(pending_invitations),
+        tier=Case(
+            When(Exists(memberships), then=Value(1)),
+            When(Exists(closer_memberships), then=Value(2)),
+            default=Value(3),
+            output_field=IntegerField(),
+        ),
+    )
 
 
-def _sort_queryset_if_unsorted(
-    users_qs: QuerySet[User], text_search: str
+def _sort_and_paginate_queryset(
+    users_qs: QuerySet[User],
+    text_search: str,
+    by_tier: bool,
+    after: UserSearchCursor | None,
 ) -> QuerySet[User]:
+    # (field, descending) from the closest to the farthest user; username is unique so it closes any tie
+    keys = [
+        ("tier", False),
+        ("rank", True),
+        ("first_match", False),
+        ("full_name", False),
+        ("username", False),
+    ]
+    if not by_tier:
+        keys = [key for key in keys if key[0] != "tier"]
     if not text_search:
-        return users_qs.order_by("full_name", "username")
-
-    # the queryset has already been sorted by the "Full Text Search" and its annotated 'rank' field
-    return users_qs
+        # not text-searched, so not ranked
+        keys = [key for key in keys if key[0] not in ("rank", "first_match")]
+
+    if after:
+        # keyset pagination: (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ..., with < for the descending keys
+        after_q = Q(pk__in=[])
+        equal_q = Q()
+        for field, descending in keys:
+            lookup = "lt" if descending else "gt"
+            after_q |= equal_q & Q(**{f"{field}__{lookup}": after[field]})
+            equal_q &= Q(**{field: after[field]})
+        users_qs = users_qs.filter(after_q)
+
+    return users_qs.order_by(
+        *(f"-{field}" if descending else field for field, descending in keys)
+    )
 
 
 def _list_users_by_fullname_or_username(
@@ -342,30 +371,32 @@ def _list_users_by_fullname_or_username(
 ) -> QuerySet[User]:
     """
     This method searches for users matching a text in their full names and usernames (being accent and case
-    insensitive) and order the results according to:
-        1st. Order by full text search rank according to the specified matrix weights (0.5 to both full_name/username)
-        2nd. Order by literal matches in full names detected closer to the left, or close to start with that text
-        3rd. Order by full name alphabetically
-        4th. Order by username alphabetically
+    insensitive) and annotates the values used to order the results:
+        - `rank`: full text search rank according to the specified matrix weights (0.5 to both full_name/username)
+        - `first_match`: position of the literal match in the full name (closer to the left first)
     :param text_search: The text to search for (in user full names and usernames)
     :param user_qs: The base user queryset to which apply the filters to
-    :return: A filtered queryset that will return an ordered list of users matching the text when executed
+    :return: A filtered queryset with the users matching the text
     """
     # Prepares the SearchQuery text by escaping it and fixing spaces for searches over several words
     parsed_text_search = repr(text_search.strip()).replace(" ", " & ")
     search_query = SearchQuery(
         f"{parsed_text_search}:*", search_type="raw", config="simple_unaccent"
     )
-    search_vector = SearchVector(
-        "full_name", weight="A", config="simple_unaccent"
-    ) + SearchVector("username", weight="B", config="simple_unaccent")
     # By default values: [0.1, 0.2, 0.4, 1.0]
     # [D-weight, C-weight, B-weight, A-weight]
     rank_weights = [0.0, 0.0, 0.5, 0.5]
 
+    # `search_vector` (full_name with weight A, username with weight B) is stored and indexed, so only the users
+    # matching the query are ranked
     full_text_matching_users = (
-        user_qs.annotate(
-            rank=SearchRank(search_vector, search_query, weights=rank_weights)
+        user_qs.filter(search_vector=search_query)
+        .annotate(
+            # ts_rank returns a real: cast it so it round-trips exactly through the pagination cursors
+            rank=Cast(
+                SearchRank(F("search_vector"), search_query, weights=rank_weights),
+                output_field=FloatField(),
+            )
         )
         .annotate(
             first_match=StrIndex(
@@ -373,7 +404,6 @@ def _list_users_by_fullname_or_username(
             )
         )
         .filter(rank__gte=0.2)
-        .order_by("-rank", "first_match", "full_name", "username")
     )
 
     return full_text_matching_users
@@ -405,6 +435,14 @@ async def update_user(user: User, values: dict[str, Any] = {}) -> User:
             setattr(user, attr, value)
 
     await user.asave()
+    await delete_cached_user(user.id)
+    return user
+
+
+async def deactivate_user(user: User) -> User:
+    user.is_active = False
+    await user.asave(update_fields=["is_active"])
+    await delete_cached_user(user.id)
     return user
 
 
@@ -416,9 +454,38 @@ async def update_user(user: User, values: dict[str, Any] = {}) -> User:
 async def delete_user(user: User) -> int:
     # don't call user.adelete directly since it will set id to None and we might need it for events
     count, _ = await User.objects.filter(id=user.id).adelete()
+    await delete_cached_user(user.id)
     return count
 
 
+##########################################################
+# user - cache
+##########################################################
+
+
+def _user_cache_key(user_id: UUID) -> str:
+    return f"users.user.{user_id}"
+
+
+async def get_cached_user(user_id: UUID) -> User | None:
+    # a user deactivated by another process would keep authenticating with a local memory cache
+    if not settings.CACHE.is_shared:
+        return None
+    return await cache.aget(_user_cache_key(user_id))
+
+
+async def set_cached_user(user: User) -> None:
+    if not settings.CACHE.is_shared:
+        return
+    await cache.aset(
+        _user_cache_key(user.id), user, timeout=settings.CACHE.USERS_TIMEOUT
+    )
+
+
+async def delete_cached_user(user_id: UUID) -> None:
+    await cache.adelete(_user_cache_key(user_id))
+
+
 ##########################################################
 # queries invitation
 ##########################################################
@@ -440,6 +507,7 @@ async def check_password(user: User, password: str) -> bool:
 async def change_password(user: User, password: str) -> None:
     user.set_password(password)
     await user.asave()
+    await delete_cached_user(user.id)
 
 
 @sync_to_async
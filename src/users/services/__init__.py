@@ -17,6 +17,7 @@
 #
 # You can contact BIRU at ask@biru.sh
 import logging
+from itertools import batched
 from uuid import UUID
 
 from allauth.account.models import EmailAddress
@@ -29,6 +30,7 @@ from commons.colors import generate_random_color
 from commons.utils import transaction_atomic_async, transaction_on_commit_async
 from emails.emails import Emails
 from emails.tasks import send_email
+from events import events_manager
 from memberships.services import exceptions as invitations_ex
 from memberships.services.exceptions import MembershipIsTheOnlyOwnerError
 from ninja_jwt.exceptions import TokenError
@@ -44,7 +46,9 @@ from projects.projects import services as projects_services
 from projects.projects.models import Project
 from users import events as users_events
 from users import repositories as users_repositories
+from users import tasks as users_tasks
 from users.models import User
+from users.repositories import UserSearchCursor
 from users.serializers import UserDeleteInfoSerializer, VerificationInfoSerializer
 from users.services import exceptions as ex
 from users.tokens import ResetPasswordToken, VerifyUserToken
@@ -306,6 +310,7 @@ async def list_paginated_users_by_text(
     limit: int,
     workspace_id: UUID | None = None,
     project_id: UUID | None = None,
+    after: UserSearchCursor | None = None,
 ) -> tuple[Pagination, list[User]]:
     """
     List all the users matching the full-text search criteria in their usernames and/or full names. The response will be
@@ -314,14 +319,25 @@ async def list_paginated_users_by_text(
       - 1st ordering block: *<project / workspace>* members,
       - 2nd ordering block: *<members of the project's workspace / members of the workspace's projects>*
       - 3rd ordering block: rest of the users
+
+    Deep pages should be requested with `after` (the cursor of the last user of the previous page, see
+    `users_repositories.get_user_search_cursor`) rather than with a big `offset`.
     """
     if workspace_id:
         users = await users_repositories.list_workspace_users_by_text(
-            text_search=text, workspace_id=workspace_id, offset=offset, limit=limit
+            text_search=text,
+            workspace_id=workspace_id,
+            offset=offset,
+            limit=limit,
+            after=after,
         )
     else:
         users = await users_repositories.list_project_users_by_text(
-            text_search=text, project_id=project_id, offset=offset, limit=limit
+            text_search=text,
+            project_id=project_id,
+            offset=offset,
+            limit=limit,
+            after=after,
         )
 
     pagination = Pagination(offset=offset, limit=limit)
@@ -351,6 +367,10 @@ async def update_user(user: User, full_name: str, lang: str, password: str) -> U
 
 @transaction_atomic_async()
 async def delete_user(user: User) -> bool:
+    """
+    The user is only deactivated here, so they are logged out at once; their projects, workspaces, memberships and
+    invitations, and then the user itself, are removed by a background job (see `do_delete_user`).
+    """
     # Check that there is no workspace or project where the user is the only owner and there are other members
     if await ws_memberships_repositories.only_owner_queryset(
         Workspace, user, is_collective=True
@@ -365,83 +385,123 @@ async def delete_user(user: User) -> bool:
             "Can't delete a user when they are still the only owner of some projects"
         )
 
+    await users_repositories.deactivate_user(user)
+    await transaction_on_commit_async(users_tasks.delete_user.defer_async)(
+        user_id=user.b64id
+    )
+    return True
+
+
+async def do_delete_user(user_id: UUID) -> bool:
+    """
+    Run by the deletion job of a deactivated user. Projects and then workspaces where the user is the only member
+    are deleted by chunks of `DELETE_USER_CHUNK_SIZE`, each one in its own transaction, with the events of a chunk
+    published as a batch (a single message per channel).
+    """
+    try:
+        user = await users_repositories.get_user(filters={"id": user_id})
+    except User.DoesNotExist:
+        # already deleted (by another job for instance)
+        return False
+    if user.is_active:
+        # the user has been activated again (signed up and verified again before the job ran)
+        return False
+
     # delete projects where the user is the only pj member
-    # (all members, invitations, pj-roles, stories, comments, etc
-    # will be deleted in cascade)
+    # (they are marked as deleted, and their content removed by their own deletion job)
     # (We need to delete all projects before workspaces to emit all events)
-    async for pj in pj_memberships_repositories.only_project_member_queryset(
-        user
-    ).select_related("workspace"):
-        await projects_services.delete_project(project=pj, deleted_by=user)
+    projects = [
+        pj
+        async for pj in pj_memberships_repositories.only_project_member_queryset(
+            user
+        ).select_related("workspace")
+    ]
+    for chunk in batched(projects, settings.DELETE_USER_CHUNK_SIZE):
+        async with events_manager.batch(), transaction_atomic_async():
+            for pj in chunk:
+                await projects_services.delete_project(project=pj, deleted_by=user)
 
     # delete workspaces where the user is the only ws member
-    async for ws in ws_memberships_repositories.only_workspace_member_queryset(user):
-        # We do not need to delete associated projects: this has been handled by previous
-        # projects deletion since when user become project member they also become workspace member
-        ws_deleted = await workspaces_repositories.delete_workspace(workspace_id=ws.id)
-        if ws_deleted > 0:
+    workspaces = [
+        ws
+        async for ws in ws_memberships_repositories.only_workspace_member_queryset(user)
+    ]
+    for chunk in batched(workspaces, settings.DELETE_USER_CHUNK_SIZE):
+        async with events_manager.batch(), transaction_atomic_async():
+            for ws in chunk:
+                # We do not need to delete associated projects: this has been handled by previous
+                # projects deletion since when user become project member they also become workspace member
+                ws_deleted = await workspaces_repositories.delete_workspace(
+                    workspace_id=ws.id
+                )
+                if ws_deleted > 0:
+                    await transaction_on_commit_async(
+                        workspaces_repositories.delete_cached_workspaces_overviews
+                    )(workspace_ids=[ws.id])
+                    await transaction_on_commit_async(
+                        workspaces_events.emit_event_when_workspace_is_deleted
+                    )(workspace=ws, deleted_by=user)
+
+    async with events_manager.batch(), transaction_atomic_async():
+        # send event for related object deletion, actual deletion will be handled by CASCADE
+        # event for deletion of ws memberships
+        ws_memberships = await ws_memberships_repositories.list_memberships(
+            WorkspaceMembership,
+            filters={"user_id": user.id},
+            select_related=["user", "workspace"],
+        )
+        for ws_membership in ws_memberships:
             await transaction_on_commit_async(
-                workspaces_events.emit_event_when_workspace_is_deleted
-            )(workspace=ws, deleted_by=user)
-
-    # send event for related object deletion, actual deletion will be handled by CASCADE
-    # event for deletion of ws memberships
-    ws_memberships = await ws_memberships_repositories.list_memberships(
-        WorkspaceMembership,
-        filters={"user_id": user.id},
-        select_related=["user", "workspace"],
-    )
-    for ws_membership in ws_memberships:
-        await transaction_on_commit_async(
-            ws_memberships_events.emit_event_when_workspace_membership_is_deleted
-        )(membership=ws_membership)
-
-    # event for deletion of ws invitations
-    ws_invitations = await ws_invitations_repositories.list_invitations(
-        WorkspaceInvitation,
-        filters={"user": user},
-        select_related=["workspace"],
-    )
-    for ws_invitation in ws_invitations:
-        await transaction_on_commit_async(
-            ws_invitations_events.emit_event_when_workspace_invitation_is_deleted
-        )(invitation_or_membership=ws_invitation)
-
-    # event for deletion of pj memberships
-    pj_memberships = await pj_memberships_repositories.list_memberships(
-        ProjectMembership,
-        filters={"user_id": user.id},
-        select_related=["user", "project"],
-    )
-    for pj_membership in pj_memberships:
-        await transaction_on_commit_async(
-            pj_memberships_events.emit_event_when_project_membership_is_deleted
-        )(membership=pj_membership, workspace_id=pj_membership.project.workspace_id)
-
-    # event for deletion of pj invitations
-    pj_invitations = await pj_invitations_repositories.list_invitations(
-        ProjectInvitation,
-        filters={"user": user},
-        select_related=["project"],
-    )
-    for pj_invitation in pj_invitations:
-        await transaction_on_commit_async(
-            pj_invitations_events.emit_event_when_project_invitation_is_deleted
-        )(
-            invitation_or_membership=pj_invitation,
-            workspace_id=pj_invitation.project.workspace_id,
+                ws_memberships_events.emit_event_when_workspace_membership_is_deleted
+            )(membership=ws_membership)
+
+        # event for deletion of ws invitations
+        ws_invitations = await ws_invitations_repositories.list_invitations(
+            WorkspaceInvitation,
+            filters={"user": user},
+            select_related=["workspace"],
         )
+        for ws_invitation in ws_invitations:
+            await transaction_on_commit_async(
+                ws_invitations_events.emit_event_when_workspace_invitation_is_deleted
+            )(invitation_or_membership=ws_invitation)
+
+        # event for deletion of pj memberships
+        pj_memberships = await pj_memberships_repositories.list_memberships(
+            ProjectMembership,
+            filters={"user_id": user.id},
+            select_related=["user", "project"],
+        )
+        for pj_membership in pj_memberships:
+            await transaction_on_commit_async(
+                pj_memberships_events.emit_event_when_project_membership_is_deleted
+            )(
+                membership=pj_membership,
+                workspace_id=pj_membership.project.workspace_id,
+            )
 
-    # delete user
-    deleted_user = await users_repositories.delete_user(user)
-
-    if deleted_user > 0:
-        await transaction_on_commit_async(users_events.emit_event_when_user_is_deleted)(
-            user=user
+        # event for deletion of pj invitations
+        pj_invitations = await pj_invitations_repositories.list_invitations(
+            ProjectInvitation,
+            filters={"user": user},
+            select_related=["project"],
         )
-        return True
+        for pj_invitation in pj_invitations:
+            await transaction_on_commit_async(
+                pj_invitations_events.emit_event_when_project_invitation_is_deleted
+            )(
+                invitation_or_membership=pj_invitation,
+                workspace_id=pj_invitation.project.workspace_id,
+            )
+
+        # delete user
+        deleted_user = await users_repositories.delete_user(user)
+        if deleted_user > 0:
+            await transaction_on_commit_async(
+                users_events.emit_event_when_user_is_deleted
+            )(user=user)
 
-    return False
+    return deleted_user > 0
 
 
 async def get_user_delete_info(user: User) -> UserDeleteInfoSerializer:
@@ -20,6 +20,7 @@
 from django.conf import settings
 from procrastinate.contrib.django import app
 
+from base.utils.uuid import decode_b64str_to_uuid
 from users import services as users_services
 
 
@@ -27,3 +28,8 @@ from users import services as users_services
 @app.task
 def clean_expired_users(timestamp: int) -> None:
     users_services.clean_expired_users()
+
+
+@app.task
+async def delete_user(user_id: str) -> None:
+    await users_services.do_delete_user(user_id=decode_b64str_to_uuid(user_id))
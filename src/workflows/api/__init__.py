@@ -38,6 +38,7 @@ from workflows.api.validators import (
     CreateWorkflowValidator,
     DeleteWorkflowQuery,
     DeleteWorkflowStatusQuery,
+    GetWorkflowQuery,
     ReorderWorkflowStatusesValidator,
     UpdateWorkflowStatusValidator,
     UpdateWorkflowValidator,
@@ -45,6 +46,7 @@ from workflows.api.validators import (
 from workflows.models import Workflow, WorkflowStatus
 from workflows.permissions import WorkflowPermissionsCheck
 from workflows.serializers import (
+    DeleteWorkflowJobSerializer,
     WorkflowSerializer,
     WorkflowStatusSerializer,
 )
@@ -110,15 +112,22 @@ async def create_workflow(
 async def list_workflows(
     request,
     project_id: Path[B64UUID],
-) -> list[Workflow]:
+    query_params: Query[GetWorkflowQuery],
+) -> list[WorkflowSerializer]:
     """
     List the workflows of a project
+
+    Query params:
+
+    * **with_stories_count:** if true, each status will include its number of stories
     """
     project = await get_project_or_404(project_id)
     await check_permissions(
         permissions=WorkflowPermissionsCheck.VIEW.value, user=request.user, obj=project
     )
-    return await workflows_services.list_workflows(project_id=project_id)
+    return await workflows_services.list_serialized_workflows(
+        project_id=project_id, with_stories_count=query_params.with_stories_count
+    )
 
 
 ################################################
@@ -142,12 +151,19 @@ async def get_workflow_by_slug(
     request,
     project_id: Path[B64UUID],
     workflow_slug: str,
+    query_params: Query[GetWorkflowQuery],
 ) -> Workflow:
     """
     Get the details of a workflow by slug
+
+    Query params:
+
+    * **with_stories_count:** if true, each status will include its number of stories
     """
     workflow = await get_workflow_by_slug_or_404(
-        project_id=project_id, workflow_slug=workflow_slug
+        project_id=project_id,
+        workflow_slug=workflow_slug,
+        with_stories_count=query_params.with_stories_count,
     )
     await check_permissions(
         permissions=WorkflowPermissionsCheck.VIEW.value,
@@ -234,7 +250,7 @@ async def update_workflow(
     url_name="project.workflow.delete",
     summary="Delete workflow",
     response={
-        204: None,
+        202: BaseDataSchema[DeleteWorkflowJobSerializer],
         403: ERROR_RESPONSE_403,
         404: ERROR_RESPONSE_404,
         422: ERROR_RESPONSE_422,
@@ -245,7 +261,7 @@ async def delete_workflow(
     request,
     workflow_id: Path[B64UUID],
     query_params: Query[DeleteWorkflowQuery],
-) -> Status[None]:
+) -> Status[DeleteWorkflowJobSerializer]:
     """
     Deletes a workflow in the given project, providing the option to move all the statuses and their stories to another
     workflow.
@@ -256,6 +272,9 @@ async def delete_workflow(
         - if not received, the workflow, statuses and its contained stories will be deleted
         - if received, the workflow will be deleted but its statuses and stories won't (they will be appended to the
          last status of the specified workflow).
+
+    The deletion runs in the background: the response contains the id of the deletion job, and the progress of the
+    stories migration is notified on the project channel.
     """
     workflow = await get_workflow_or_404(workflow_id=workflow_id)
     await check_permissions(
@@ -264,12 +283,12 @@ async def delete_workflow(
         obj=workflow.project,
     )
 
-    await workflows_services.delete_workflow(
+    job_id = await workflows_services.delete_workflow(
         workflow=workflow,
         deleted_by=request.user,
         target_workflow_id=query_params.move_to,
     )
-    return Status(204, None)
+    return Status(202, DeleteWorkflowJobSerializer(job_id=job_id))
 
 
 ################################################
@@ -277,10 +296,14 @@ async def delete_workflow(
 ################################################
 
 
-async def get_workflow_by_slug_or_404(project_id: UUID, workflow_slug: str) -> Workflow:
+async def get_workflow_by_slug_or_404(
+    project_id: UUID, workflow_slug: str, with_stories_count: bool = False
+) -> Workflow:
     try:
         workflow = await workflows_services.get_workflow_by_slug(
-            project_id=project_id, workflow_slug=workflow_slug
+            project_id=project_id,
+            workflow_slug=workflow_slug,
+            with_stories_count=with_stories_count,
         )
     except Workflow.DoesNotExist as e:
         raise ex.NotFoundError(f"Workflow {workflow_slug} does not exist") from e
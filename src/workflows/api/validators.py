@@ -38,6 +38,10 @@ class CreateWorkflowValidator(BaseValidatorSchema):
     name: WorkflowName
 
 
+class GetWorkflowQuery(BaseValidatorSchema):
+    with_stories_count: bool = False
+
+
 class DeleteWorkflowQuery(BaseValidatorSchema):
     move_to: B64UUID | None = None
 
@@ -19,10 +19,12 @@
 
 from events import events_manager
 from projects.projects.models import Project
+from workflows import repositories as workflows_repositories
 from workflows.events.content import (
     CreateWorkflowContent,
     CreateWorkflowStatusContent,
     DeleteWorkflowContent,
+    DeleteWorkflowProgressContent,
     DeleteWorkflowStatusContent,
     ReorderWorkflowStatusesContent,
     UpdateWorkflowContent,
@@ -38,6 +40,7 @@ from workflows.serializers import (
 CREATE_WORKFLOW = "workflows.create"
 UPDATE_WORKFLOW = "workflows.update"
 DELETE_WORKFLOW = "workflows.delete"
+DELETE_WORKFLOW_PROGRESS = "workflows.delete.progress"
 CREATE_WORKFLOW_STATUS = "workflowstatuses.create"
 UPDATE_WORKFLOW_STATUS = "workflowstatuses.update"
 REORDER_WORKFLOW_STATUS = "workflowstatuses.reorder"
@@ -47,6 +50,7 @@ DELETE_WORKFLOW_STATUS = "workflowstatuses.delete"
 async def emit_event_when_workflow_is_created(
     project: Project, workflow: WorkflowSerializer
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=CREATE_WORKFLOW,
@@ -57,6 +61,7 @@ async def emit_event_when_workflow_is_created(
 async def emit_event_when_workflow_is_updated(
     project: Project, workflow: WorkflowSerializer
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=UPDATE_WORKFLOW,
@@ -71,6 +76,7 @@ async def emit_event_when_workflow_is_deleted(
     workflow: WorkflowNestedSerializer,
     target_workflow: WorkflowNestedSerializer | None,
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=DELETE_WORKFLOW,
@@ -81,9 +87,31 @@ async def emit_event_when_workflow_is_deleted(
     )
 
 
+async def emit_event_when_workflow_deletion_progresses(
+    project: Project,
+    workflow: WorkflowNestedSerializer,
+    target_workflow: WorkflowNestedSerializer | None,
+    progress_percentage: int,
+) -> None:
+    """
+    This event is emitted while the stories of a workflow being deleted are moved to another workflow
+    """
+    await workflows_repositories.delete_cached_project_workflows(project.id)
+    await events_manager.publish_on_project_channel(
+        project=project,
+        type=DELETE_WORKFLOW_PROGRESS,
+        content=DeleteWorkflowProgressContent(
+            workflow=workflow,
+            target_workflow=target_workflow,
+            progress_percentage=progress_percentage,
+        ),
+    )
+
+
 async def emit_event_when_workflow_status_is_created(
     project: Project, workflow_status: WorkflowStatus
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=CREATE_WORKFLOW_STATUS,
@@ -94,6 +122,7 @@ async def emit_event_when_workflow_status_is_created(
 async def emit_event_when_workflow_status_is_updated(
     project: Project, workflow_status: WorkflowStatus
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=UPDATE_WORKFLOW_STATUS,
@@ -104,6 +133,7 @@ async def emit_event_when_workflow_status_is_updated(
 async def emit_event_when_workflow_statuses_are_reordered(
     project: Project, reorder: ReorderWorkflowStatusesSerializer
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=REORDER_WORKFLOW_STATUS,
@@ -116,6 +146,7 @@ async def emit_event_when_workflow_status_is_deleted(
     workflow_status: WorkflowStatus,
     target_status: WorkflowStatus | None,
 ) -> None:
+    await workflows_repositories.delete_cached_project_workflows(project.id)
     await events_manager.publish_on_project_channel(
         project=project,
         type=DELETE_WORKFLOW_STATUS,
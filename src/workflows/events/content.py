@@ -39,6 +39,12 @@ class DeleteWorkflowContent(BaseSchema):
     target_workflow: WorkflowNestedSerializer | None = None
 
 
+class DeleteWorkflowProgressContent(BaseSchema):
+    workflow: WorkflowNestedSerializer
+    target_workflow: WorkflowNestedSerializer | None = None
+    progress_percentage: int
+
+
 class CreateWorkflowStatusContent(BaseSchema):
     workflow_status: WorkflowStatusSerializer
 
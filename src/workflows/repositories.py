@@ -18,10 +18,12 @@
 # You can contact BIRU at ask@biru.sh
 
 
-from typing import Any, Literal, TypedDict
+from typing import TYPE_CHECKING, Any, Literal, TypedDict
 from uuid import UUID
 
-from django.db.models import Count, QuerySet
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Prefetch, QuerySet
 from django.db.models.functions import Coalesce
 
 from base.repositories import neighbors as neighbors_repositories
@@ -30,6 +32,9 @@ from commons.ordering import DEFAULT_ORDER_OFFSET
 from projects.projects.models import Project, ProjectTemplate
 from workflows.models import Workflow, WorkflowStatus
 
+if TYPE_CHECKING:
+    from workflows.serializers import WorkflowSerializer
+
 ##########################################################
 # Workflow - filters and querysets
 ##########################################################
@@ -39,12 +44,20 @@ class WorkflowFilters(TypedDict, total=False):
     id: UUID
     slug: str
     project_id: UUID
+    project__deleted_at__isnull: bool
 
 
 WorkflowSelectRelated = list[Literal["project", "project__workspace"] | None]
 
 
-WorkflowPrefetchRelated = list[Literal["statuses",]]
+# annotate each status with its number of stories, with a single grouped query for all the statuses
+STATUSES_WITH_STORIES_COUNT_PREFETCH = Prefetch(
+    "statuses",
+    queryset=WorkflowStatus.objects.annotate(stories_count=Count("stories")),
+)
+
+
+WorkflowPrefetchRelated = list[Literal["statuses",] | Prefetch]
 
 
 WorkflowOrderBy = list[Literal["order", "-order"]]
@@ -135,6 +148,50 @@ async def delete_workflow(filters: WorkflowFilters = {}) -> int:
     return count
 
 
+##########################################################
+# Workflow - cache
+##########################################################
+
+
+def _project_workflows_cache_key(project_id: UUID, with_stories_count: bool) -> str:
+    variant = "stories_count" if with_stories_count else "base"
+    return f"workflows.project.{project_id}.{variant}"
+
+
+async def get_cached_project_workflows(
+    project_id: UUID, with_stories_count: bool = False
+) -> list["WorkflowSerializer"] | None:
+    # the invalidations made by the worker wouldn't reach the local memory of the other processes
+    if not settings.CACHE.is_shared:
+        return None
+    return await cache.aget(
+        _project_workflows_cache_key(project_id, with_stories_count)
+    )
+
+
+async def set_cached_project_workflows(
+    project_id: UUID,
+    workflows: list["WorkflowSerializer"],
+    with_stories_count: bool = False,
+) -> None:
+    if not settings.CACHE.is_shared:
+        return
+    await cache.aset(
+        _project_workflows_cache_key(project_id, with_stories_count),
+        workflows,
+        timeout=settings.CACHE.WORKFLOWS_TIMEOUT,
+    )
+
+
+async def delete_cached_project_workflows(project_id: UUID) -> None:
+    await cache.adelete_many(
+        [
+            _project_workflows_cache_key(project_id, with_stories_count)
+            for with_stories_count in (False, True)
+        ]
+    )
+
+
 ##########################################################
 # WorkflowStatus - filters and querysets
 ##########################################################
@@ -144,6 +201,7 @@ class WorkflowStatusFilters(TypedDict, total=False):
     workflow_id: UUID
     workflow__slug: str
     workflow__project_id: UUID
+    workflow__project__deleted_at__isnull: bool
     order__gt: int
     id__in: list[UUID]
 
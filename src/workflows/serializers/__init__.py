@@ -25,15 +25,24 @@ from workflows.serializers.nested import (
 )
 
 
+class WorkflowStatusWithStoriesCountSerializer(WorkflowStatusNestedSerializer):
+    # only set when the statuses were annotated with their number of stories
+    stories_count: int | None = None
+
+
 class WorkflowSerializer(WorkflowNestedSerializer):
     order: int
-    statuses: list[WorkflowStatusNestedSerializer]
+    statuses: list[WorkflowStatusWithStoriesCountSerializer]
 
 
 class WorkflowStatusSerializer(WorkflowStatusNestedSerializer):
     workflow: WorkflowNestedSerializer
 
 
+class DeleteWorkflowJobSerializer(BaseSchema):
+    job_id: int
+
+
 class _ReorderSerializer(BaseSchema):
     place: Literal["before", "after"]
     status_id: UUIDB64
@@ -23,6 +23,7 @@ from uuid import UUID
 
 from django.conf import settings
 
+from base.utils.uuid import encode_uuid_to_b64str
 from commons.ordering import DEFAULT_ORDER_OFFSET, calculate_offset
 from commons.utils import transaction_atomic_async, transaction_on_commit_async
 from projects.projects import repositories as projects_repositories
@@ -112,34 +113,75 @@ async def create_workflow(project: Project, name: str) -> WorkflowSerializer:
 ##########################################################
 
 
-async def list_workflows(project_id: UUID) -> list[Workflow]:
+async def list_workflows(
+    project_id: UUID, with_stories_count: bool = False
+) -> list[Workflow]:
     workflows = [
         w
         async for w in workflows_repositories.list_workflows_qs(
             filters={
                 "project_id": project_id,
             },
-            prefetch_related=["statuses"],
+            prefetch_related=[
+                workflows_repositories.STATUSES_WITH_STORIES_COUNT_PREFETCH
+                if with_stories_count
+                else "statuses"
+            ],
         )
     ]
 
     return workflows
 
 
+async def list_serialized_workflows(
+    project_id: UUID, with_stories_count: bool = False
+) -> list[WorkflowSerializer]:
+    """
+    Same as list_workflows but returns the serialized payload, which is cached per project.
+    The cache is invalidated by the workflows events and by the stories events that may change
+    the stories count of a status.
+    """
+    workflows = await workflows_repositories.get_cached_project_workflows(
+        project_id=project_id, with_stories_count=with_stories_count
+    )
+    if workflows is None:
+        workflows = [
+            WorkflowSerializer.model_validate(workflow)
+            for workflow in await list_workflows(
+                project_id=project_id, with_stories_count=with_stories_count
+            )
+        ]
+        await workflows_repositories.set_cached_project_workflows(
+            project_id=project_id,
+            workflows=workflows,
+            with_stories_count=with_stories_count,
+        )
+
+    return workflows
+
+
 ##########################################################
 # get workflow
 ##########################################################
 
 
-async def get_workflow_by_slug(project_id: UUID, workflow_slug: str) -> Workflow | None:
+async def get_workflow_by_slug(
+    project_id: UUID, workflow_slug: str, with_stories_count: bool = False
+) -> Workflow | None:
     return await workflows_repositories.get_workflow(
         filters={
             "project_id": project_id,
             "slug": workflow_slug,
+            "project__deleted_at__isnull": True,
         },
         select_related=[
             "project",
         ],
+        prefetch_related=[
+            workflows_repositories.STATUSES_WITH_STORIES_COUNT_PREFETCH
+            if with_stories_count
+            else "statuses"
+        ],
     )
 
 
@@ -147,6 +189,7 @@ async def get_workflow_by_id(workflow_id: UUID) -> Workflow | None:
     return await workflows_repositories.get_workflow(
         filters={
             "id": workflow_id,
+            "project__deleted_at__isnull": True,
         },
         select_related=[
             "project",
@@ -192,42 +235,60 @@ async def update_workflow(
 ##########################################################
 
 
-@transaction_atomic_async()
 async def delete_workflow(
     workflow: Workflow, deleted_by: User, target_workflow_id: UUID | None = None
-) -> bool:
+) -> int:
     """
-    This method deletes a workflow, providing the option to first migrate its workflow statuses to another workflow
-    in the same project.
+    This method launches the deletion of a workflow in the task queue, providing the option to first migrate its
+    workflow statuses to another workflow in the same project.
+    The target workflow is validated beforehand so errors can still be returned to the caller.
 
     :param workflow: the workflow to delete
     :param deleted_by: the user which has deleted this workflow
-    :param target_workflow_id: the workflow slug to which move their statuses from the workflow being deleted
+    :param target_workflow_id: the workflow id to which move their statuses from the workflow being deleted
         - if not received, the workflow, statuses and its contained stories will be deleted
         - if received, the workflow will be deleted but its statuses and stories won't (they will be appended to the
          last status of the specified workflow).
+    :return: the id of the deletion job
+    """
+    from workflows.tasks import delete_workflow as delete_workflow_task
+
+    if target_workflow_id:
+        await _get_target_workflow(
+            workflow=workflow, target_workflow_id=target_workflow_id
+        )
+
+    return await delete_workflow_task.defer_async(
+        workflow_id=workflow.b64id,
+        deleted_by_id=deleted_by.b64id,
+        target_workflow_id=encode_uuid_to_b64str(target_workflow_id)
+        if target_workflow_id
+        else None,
+    )
+
+
+async def do_delete_workflow(
+    workflow_id: UUID, deleted_by: User, target_workflow_id: UUID | None = None
+) -> bool:
+    """
+    Run by the deletion job, see `delete_workflow` for the parameters.
+    The statuses are moved in a single transaction, then the stories are moved by chunks so no transaction
+    has to lock all the stories at once. The stories are moved by workflow (not by status), so a job re-run after a
+    partial move still moves the remaining ones; the workflow itself is only deleted once it has no story left.
+
     :return: bool
     """
+    try:
+        workflow = await get_workflow_by_id(workflow_id=workflow_id)
+    except Workflow.DoesNotExist:
+        # already deleted (by another job for instance)
+        return False
+
     target_workflow = None
     if target_workflow_id:
-        try:
-            target_workflow = await workflows_repositories.get_workflow(
-                filters={
-                    "project_id": workflow.project_id,
-                    "id": target_workflow_id,
-                },
-                select_related=[
-                    "project",
-                ],
-            )
-        except Workflow.DoesNotExist as e:
-            raise ex.NonExistingMoveToWorkflow(
-                f"The workflow '{target_workflow_id}' doesn't exist in project {workflow.project_id}"
-            ) from e
-        if target_workflow.id == workflow.id:
-            raise ex.SameMoveToWorkflow(
-                "The to-be-deleted workflow and the target-workflow cannot be the same"
-            )
+        target_workflow = await _get_target_workflow(
+            workflow=workflow, target_workflow_id=target_workflow_id
+        )
 
         statuses_to_move = await workflows_repositories.list_workflow_statuses(
             workflow_id=workflow.id,
@@ -236,26 +297,95 @@ async def delete_workflow(
         )
 
         if statuses_to_move:
+            status_ids = [status.id for status in statuses_to_move]
             target_workflow_statuses = list(target_workflow.statuses.all())
-            #  no statuses in the target_workflow (no valid anchor). The order of the statuses will be preserved
-            if not target_workflow_statuses:
-                await reorder_workflow_statuses(
-                    target_workflow=target_workflow,
-                    status_ids=[status.id for status in statuses_to_move],
-                    reorder=None,
-                    source_workflow=workflow,
-                )
-            # existing statuses in the target_workflow. The anchor status will be the last one
-            else:
-                await reorder_workflow_statuses(
-                    target_workflow=target_workflow,
-                    status_ids=[status.id for status in statuses_to_move],
-                    reorder={
-                        "place": "after",
-                        "status_id": target_workflow_statuses[-1].id,
-                    },
-                    source_workflow=workflow,
-                )
+            await reorder_workflow_statuses(
+                target_workflow=target_workflow,
+                status_ids=status_ids,
+                #  no statuses in the target_workflow (no valid anchor). The order of the statuses will be preserved
+                #  otherwise, the anchor status will be the last one of the target_workflow
+                reorder={
+                    "place": "after",
+                    "status_id": target_workflow_statuses[-1].id,
+                }
+                if target_workflow_statuses
+                else None,
+                source_workflow=workflow,
+                move_stories=False,
+            )
+
+        await _move_stories_to_workflow(
+            workflow=workflow, target_workflow=target_workflow
+        )
+
+    return await _delete_workflow(
+        workflow=workflow, deleted_by=deleted_by, target_workflow=target_workflow
+    )
+
+
+async def _get_target_workflow(
+    workflow: Workflow, target_workflow_id: UUID
+) -> Workflow:
+    try:
+        target_workflow = await workflows_repositories.get_workflow(
+            filters={
+                "project_id": workflow.project_id,
+                "id": target_workflow_id,
+            },
+            select_related=[
+                "project",
+            ],
+        )
+    except Workflow.DoesNotExist as e:
+        raise ex.NonExistingMoveToWorkflow(
+            f"The workflow '{target_workflow_id}' doesn't exist in project {workflow.project_id}"
+        ) from e
+    if target_workflow.id == workflow.id:
+        raise ex.SameMoveToWorkflow(
+            "The to-be-deleted workflow and the target-workflow cannot be the same"
+        )
+    return target_workflow
+
+
+async def _move_stories_to_workflow(
+    workflow: Workflow, target_workflow: Workflow
+) -> None:
+    total_stories = await stories_repositories.list_stories_qs(
+        filters={"workflow_id": workflow.id}
+    ).acount()
+    moved_stories = 0
+    while moved_stories < total_stories:
+        # each chunk is committed on its own
+        updated = await stories_repositories.bulk_update_workflow_to_stories(
+            old_workflow_id=workflow.id,
+            new_workflow_id=target_workflow.id,
+            limit=settings.DELETE_WORKFLOW_STORIES_CHUNK_SIZE,
+        )
+        if not updated:
+            break
+        moved_stories += updated
+        await workflows_events.emit_event_when_workflow_deletion_progresses(
+            project=workflow.project,
+            workflow=WorkflowNestedSerializer.model_validate(workflow),
+            target_workflow=WorkflowNestedSerializer.model_validate(target_workflow),
+            progress_percentage=min(100, moved_stories * 100 // total_stories),
+        )
+
+
+@transaction_atomic_async()
+async def _delete_workflow(
+    workflow: Workflow, deleted_by: User, target_workflow: Workflow | None
+) -> bool:
+    if (
+        target_workflow is not None
+        and await stories_repositories.list_stories_qs(
+            filters={"workflow_id": workflow.id}
+        ).aexists()
+    ):
+        # the stories would be deleted in cascade: the job fails, to be run again
+        raise RuntimeError(
+            f"The workflow {workflow.id} still has stories to move to the workflow {target_workflow.id}"
+        )
 
     deleted = await workflows_repositories.delete_workflow(filters={"id": workflow.id})
 
@@ -311,6 +441,7 @@ async def create_workflow_status(
 async def get_workflow_status(status_id: UUID) -> WorkflowStatus | None:
     return await workflows_repositories.get_workflow_status(
         status_id=status_id,
+        filters={"workflow__project__deleted_at__isnull": True},
         select_related=[
             "workflow",
             "workflow__project",
@@ -376,6 +507,7 @@ async def reorder_workflow_statuses(
     status_ids: list[UUID],
     reorder: dict[str, Any] | None,
     source_workflow: Workflow | None = None,
+    move_stories: bool = True,
 ) -> None:
     """
     Reorder the statuses from a workflow to another (can be the same), before or after an existing status
@@ -386,6 +518,8 @@ async def reorder_workflow_statuses(
         None will mean there's no anchor status preserving their original order
     :param source_workflow: Workflow containing the statuses to reorder.
         None will mean the "source_workflow" and the "target_workflow" are the same
+    :param move_stories: whether the stories of the statuses should be moved along to the "target_workflow".
+        False means the caller is responsible for moving them
     :return:
     """
     if not source_workflow:
@@ -471,7 +605,7 @@ async def reorder_workflow_statuses(
         objs_to_update=statuses_to_update, fields_to_update=["order", "workflow"]
     )
 
-    if source_workflow != target_workflow and statuses_to_reorder:
+    if move_stories and source_workflow != target_workflow and statuses_to_reorder:
         # update the workflow to the moved stories
         await stories_repositories.bulk_update_workflow_to_stories(
             statuses_ids=status_ids,
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2024 BIRU
+#
+# This file is part of Tenzu.
+#
+# Tenzu is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# You can contact BIRU at ask@biru.sh
+
+from procrastinate.contrib.django import app
+
+from base.utils.uuid import decode_b64str_to_uuid
+from users import repositories as users_repositories
+
+
+@app.task
+async def delete_workflow(
+    workflow_id: str, deleted_by_id: str, target_workflow_id: str | None = None
+) -> None:
+    from workflows import services as workflows_services
+
+    deleted_by = await users_repositories.get_user(
+        filters={"id": decode_b64str_to_uuid(deleted_by_id)}
+    )
+    await workflows_services.do_delete_workflow(
+        workflow_id=decode_b64str_to_uuid(workflow_id),
+        deleted_by=deleted_by,
+        target_workflow_id=decode_b64str_to_uuid(target_workflow_id)
+        if target_workflow_id
+        else None,
+    )
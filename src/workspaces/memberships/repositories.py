@@ -83,6 +83,7 @@ async def workspace_member_projects_list(
         .filter(
             memberships__user_id=membership.user_id,
             workspace_id=membership.workspace_id,
+            deleted_at__isnull=True,
         )
         .values_list("name", flat=True)
     ]
@@ -39,6 +39,7 @@ from workspaces.memberships import events as memberships_events
 from workspaces.memberships import repositories as memberships_repositories
 from workspaces.memberships.models import WorkspaceMembership, WorkspaceRole
 from workspaces.memberships.serializers import WorkspaceMembershipDeleteInfoSerializer
+from workspaces.workspaces import repositories as workspaces_repositories
 from workspaces.workspaces.models import Workspace
 
 _DEFAULT_WORKSPACE_MEMBERSHIP_ROLE_SLUG = "readonly-member"
@@ -97,6 +98,10 @@ async def update_workspace_membership(
         membership=membership, role_id=role_id, user_role=user_role
     )
 
+    await memberships_services.invalidate_roles_cache(membership)
+    await workspaces_repositories.delete_cached_users_workspaces_overview(
+        user_ids=[membership.user_id]
+    )
     await memberships_events.emit_event_when_workspace_membership_is_updated(
         membership=updated_membership
     )
@@ -173,8 +178,14 @@ async def _handle_membership_projects_succession(
         select_related=["project", "role"],
         order_by=[],
     )
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_users_workspaces_overview
+    )(user_ids=[user.id])
     for pj_membership in owner_project_memberships:
         pj_membership.project.user_is_invited = False
+        await transaction_on_commit_async(memberships_services.invalidate_roles_cache)(
+            pj_membership
+        )
         await transaction_on_commit_async(
             pj_memberships_events.emit_event_when_project_membership_is_updated
         )(membership=pj_membership, user=user, project=pj_membership.project)
@@ -211,6 +222,9 @@ async def _delete_inner_projects_membership(membership: WorkspaceMembership) ->
             ),
         )
         for pj_membership in pj_memberships:
+            await transaction_on_commit_async(
+                memberships_services.invalidate_roles_cache
+            )(pj_membership)
             await transaction_on_commit_async(
                 pj_memberships_events.emit_event_when_project_membership_is_deleted
             )(
@@ -266,6 +280,12 @@ async def delete_workspace_membership(
                 membership.user.email
             ),
         )
+        await transaction_on_commit_async(memberships_services.invalidate_roles_cache)(
+            membership
+        )
+        await transaction_on_commit_async(
+            workspaces_repositories.delete_cached_users_workspaces_overview
+        )(user_ids=[membership.user_id])
         await transaction_on_commit_async(
             memberships_events.emit_event_when_workspace_membership_is_deleted
         )(membership=membership)
@@ -309,9 +329,16 @@ async def create_default_workspace_membership(
     role = await get_workspace_role(
         workspace_id, _DEFAULT_WORKSPACE_MEMBERSHIP_ROLE_SLUG
     )
-    return await memberships_repositories.create_workspace_membership(
+    membership = await memberships_repositories.create_workspace_membership(
         workspace=role.workspace, role=role, user=user
     )
+    await transaction_on_commit_async(memberships_services.invalidate_roles_cache)(
+        membership
+    )
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_users_workspaces_overview
+    )(user_ids=[user.id])
+    return membership
 
 
 ##########################################################
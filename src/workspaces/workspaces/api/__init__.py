@@ -93,7 +93,7 @@ async def create_workspace(
     },
     by_alias=True,
 )
-async def list_my_workspaces(request) -> list[Workspace]:
+async def list_my_workspaces(request) -> list[WorkspaceSummarySerializer]:
     """
     List the workspaces overviews of the logged user.
     """
@@ -101,7 +101,7 @@ async def list_my_workspaces(request) -> list[Workspace]:
         permissions=WorkspacePermissionsCheck.VIEW_SELF.value,
         user=request.user,
     )
-    return await workspaces_services.list_user_workspaces(user=request.user)
+    return await workspaces_services.list_serialized_user_workspaces(user=request.user)
 
 
 ##########################################################
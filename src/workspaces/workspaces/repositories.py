@@ -17,10 +17,13 @@
 #
 # You can contact BIRU at ask@biru.sh
 
-from typing import Any, Literal
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Literal
 from uuid import UUID
 
+from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
+from django.core.cache import cache
 from django.db import models
 from django.db.models import (
     Exists,
@@ -41,12 +44,16 @@ from users.models import User
 from workspaces.memberships.models import WorkspaceMembership
 from workspaces.workspaces.models import Workspace
 
+if TYPE_CHECKING:
+    from workspaces.workspaces.serializers import WorkspaceSummarySerializer
+
 ##########################################################
 # filters and querysets
 ##########################################################
 
 PROJECT_PREFETCH = Prefetch(
-    "projects", queryset=Project.objects.order_by("-created_at")
+    "projects",
+    queryset=Project.objects.filter(deleted_at__isnull=True).order_by("-created_at"),
 )
 
 
@@ -147,13 +154,16 @@ async def list_user_workspaces_overview(user: User) -> list[Workspace]:
     member_projects_qs = (
         Project.objects.filter(
             memberships__user_id=user.id,
+            deleted_at__isnull=True,
         )
         .distinct()
         .order_by("-created_at")
     )
     # queryset for projects where user is invited
     invited_projects_qs = (
-        Project.objects.filter(user_invited_query).distinct().order_by("-created_at")
+        Project.objects.filter(user_invited_query, deleted_at__isnull=True)
+        .distinct()
+        .order_by("-created_at")
     )
     #####
     ws_qs_invited = _make_ws_query(
@@ -214,6 +224,106 @@ async def list_user_workspaces_overview(user: User) -> list[Workspace]:
     ]
 
 
+##########################################################
+# list user workspaces overview - cache
+##########################################################
+
+# The overview of a user is cached with the value of a shared counter read before it was computed. Invalidating a
+# user, or a workspace (for all the users having it in their overview), increments the counter and stores its new
+# value in a version key, and a cached overview older than any of the versions of its user and its workspaces is
+# ignored. So invalidating a workspace doesn't need to know which users have it in their overview, and an invalidation
+# while the overview is computed is not lost (the counter is atomic, unlike the clocks of the processes).
+
+
+_WORKSPACES_OVERVIEW_COUNTER_KEY = "workspaces.overview.counter"
+
+
+def _user_workspaces_overview_cache_key(user_id: UUID) -> str:
+    return f"workspaces.overview.{user_id}"
+
+
+def _workspaces_overview_version_cache_key(kind: str, obj_id: UUID) -> str:
+    return f"workspaces.overview.version.{kind}.{obj_id}"
+
+
+async def get_workspaces_overview_time() -> int:
+    """
+    Counter value to pass to `set_cached_user_workspaces_overview`, to be taken *before* computing the overview.
+    """
+    return await cache.aget(_WORKSPACES_OVERVIEW_COUNTER_KEY, 0)
+
+
+async def get_cached_user_workspaces_overview(
+    user_id: UUID,
+) -> list["WorkspaceSummarySerializer"] | None:
+    # the invalidations made by the worker (e.g. an importation) wouldn't reach the local memory of the other processes
+    if not settings.CACHE.is_shared:
+        return None
+    cached = await cache.aget(_user_workspaces_overview_cache_key(user_id))
+    if cached is None:
+        return None
+
+    computed_at, workspaces = cached
+    versions = await cache.aget_many(
+        [
+            _workspaces_overview_version_cache_key("user", user_id),
+            *(
+                _workspaces_overview_version_cache_key("workspace", ws.id)
+                for ws in workspaces
+            ),
+        ]
+    )
+    if any(version > computed_at for version in versions.values()):
+        return None
+
+    return workspaces
+
+
+async def set_cached_user_workspaces_overview(
+    user_id: UUID,
+    workspaces: list["WorkspaceSummarySerializer"],
+    computed_at: int,
+) -> None:
+    if not settings.CACHE.is_shared:
+        return
+    await cache.aset(
+        _user_workspaces_overview_cache_key(user_id),
+        (computed_at, workspaces),
+        timeout=settings.CACHE.WORKSPACES_OVERVIEW_TIMEOUT,
+    )
+
+
+async def delete_cached_users_workspaces_overview(user_ids: Iterable[UUID]) -> None:
+    """
+    Invalidate the overview of some users (e.g. when a workspace or a project is added to or removed from it).
+    """
+    await _bump_workspaces_overview_versions("user", user_ids)
+
+
+async def delete_cached_workspaces_overviews(workspace_ids: Iterable[UUID]) -> None:
+    """
+    Invalidate the overview of all the users having these workspaces in it (e.g. when the workspace or one of its
+    projects changes).
+    """
+    await _bump_workspaces_overview_versions("workspace", workspace_ids)
+
+
+async def _bump_workspaces_overview_versions(
+    kind: str, obj_ids: Iterable[UUID]
+) -> None:
+    await cache.aadd(_WORKSPACES_OVERVIEW_COUNTER_KEY, 0, timeout=None)
+    version = await cache.aincr(_WORKSPACES_OVERVIEW_COUNTER_KEY)
+    # the versions must outlive the overviews computed before them
+    await cache.aset_many(
+        {
+            _workspaces_overview_version_cache_key(kind, obj_id): version
+            for obj_id in obj_ids
+            if obj_id is not None
+        },
+        timeout=settings.CACHE.WORKSPACES_OVERVIEW_TIMEOUT,
+    )
+
+
 ##########################################################
 #  get workspace
 ##########################################################
@@ -222,7 +332,11 @@ async def list_user_workspaces_overview(user: User) -> list[Workspace]:
 async def get_workspace(workspace_id: UUID, get_total_project=False) -> Workspace:
     qs = Workspace.objects.all()
     if get_total_project:
-        qs = qs.annotate(total_projects=Count("projects"))
+        qs = qs.annotate(
+            total_projects=Count(
+                "projects", filter=Q(projects__deleted_at__isnull=True)
+            )
+        )
     return await qs.aget(id=workspace_id)
 
 
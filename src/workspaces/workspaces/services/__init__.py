@@ -29,7 +29,10 @@ from workspaces.memberships.models import WorkspaceRole
 from workspaces.workspaces import events as workspaces_events
 from workspaces.workspaces import repositories as workspaces_repositories
 from workspaces.workspaces.models import Workspace
-from workspaces.workspaces.serializers import WorkspaceDetailSerializer
+from workspaces.workspaces.serializers import (
+    WorkspaceDetailSerializer,
+    WorkspaceSummarySerializer,
+)
 from workspaces.workspaces.services import exceptions as ex
 
 ##########################################################
@@ -54,6 +57,9 @@ async def create_workspace(
         user_can_create_projects=True,
         total_projects=0,
     )
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_users_workspaces_overview
+    )(user_ids=[created_by.id])
     await transaction_on_commit_async(
         workspaces_events.emit_event_when_workspace_is_created
     )(workspace_detail=workspace_detail, created_by=created_by)
@@ -85,6 +91,30 @@ async def list_user_workspaces(user: User) -> list[Workspace]:
     return await workspaces_repositories.list_user_workspaces_overview(user=user)
 
 
+async def list_serialized_user_workspaces(
+    user: User,
+) -> list[WorkspaceSummarySerializer]:
+    """
+    Same as list_user_workspaces but returns the serialized payload, which is cached per user.
+    The cache is invalidated for a user when a workspace or a project is added to or removed from their overview
+    (memberships, invitations, importations), and for a workspace when it or one of its projects changes.
+    """
+    workspaces = await workspaces_repositories.get_cached_user_workspaces_overview(
+        user_id=user.id
+    )
+    if workspaces is None:
+        computed_at = await workspaces_repositories.get_workspaces_overview_time()
+        workspaces = [
+            WorkspaceSummarySerializer.model_validate(workspace)
+            for workspace in await list_user_workspaces(user=user)
+        ]
+        await workspaces_repositories.set_cached_user_workspaces_overview(
+            user_id=user.id, workspaces=workspaces, computed_at=computed_at
+        )
+
+    return workspaces
+
+
 ##########################################################
 # get workspace
 ##########################################################
@@ -127,6 +157,9 @@ async def update_workspace(
     workspace: Workspace, user: User, values: dict[str, Any] = {}
 ) -> WorkspaceDetailSerializer:
     workspace = await _update_workspace(workspace=workspace, values=values)
+    await transaction_on_commit_async(
+        workspaces_repositories.delete_cached_workspaces_overviews
+    )(workspace_ids=[workspace.id])
     workspace_detail = WorkspaceDetailSerializer(
         id=workspace.id,
         name=workspace.name,
@@ -181,6 +214,9 @@ async def delete_workspace(workspace: Workspace, deleted_by: User) -> bool:
 
     deleted = await workspaces_repositories.delete_workspace(workspace_id=workspace.id)
     if deleted > 0:
+        await workspaces_repositories.delete_cached_workspaces_overviews(
+            workspace_ids=[workspace.id]
+        )
         await workspaces_events.emit_event_when_workspace_is_deleted(
             workspace=workspace, deleted_by=deleted_by
         )